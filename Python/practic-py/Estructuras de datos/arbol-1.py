@@ -1294,44 +1294,56 @@ print(st.query(1, 0, st.n - 1, 0, 4))
 Implementación completa en Python — con comentarios"""
 class DisjointSetUnion:
     def __init__(self):
-        self.parent = {}  # padre del nodo
-        self.rank = {}    # aproximación a la altura del árbol
+        # arrays planos indexados por id entero; index traduce cada valor a su id
+        self.index = {}   # valor -> id
+        self.items = []   # id -> valor
+        self.parent = []  # padre de cada id
+        self.size = []    # tamaño del conjunto (válido en las raíces)
 
     # CREATE — crear conjunto con un elemento
     def make_set(self, x):
-        if x not in self.parent:
-            self.parent[x] = x
-            self.rank[x] = 0
+        if x not in self.index:
+            i = len(self.items)
+            self.index[x] = i
+            self.items.append(x)
+            self.parent.append(i)
+            self.size.append(1)
+
+    def _root(self, i):
+        # iterativo con path halving: cada nodo salta a su abuelo (sin recursión)
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
 
     # READ — encontrar el representante del conjunto
     def find(self, x):
-        if self.parent[x] != x:
-            # Path compression
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        return self.items[self._root(self.index[x])]
 
     # UPDATE — unir los conjuntos que contienen a x e y
     def union(self, x, y):
-        rootX = self.find(x)
-        rootY = self.find(y)
+        rootX = self._root(self.index[x])
+        rootY = self._root(self.index[y])
 
         if rootX == rootY:
-            return  # ya están unidos
+            return False  # ya están unidos
 
-        # Union by rank — el árbol pequeño se pega al grande
-        if self.rank[rootX] < self.rank[rootY]:
-            self.parent[rootX] = rootY
-        elif self.rank[rootX] > self.rank[rootY]:
-            self.parent[rootY] = rootX
-        else:
-            self.parent[rootY] = rootX
-            self.rank[rootX] += 1
+        # Union by size — el árbol pequeño se pega al grande
+        if self.size[rootX] < self.size[rootY]:
+            rootX, rootY = rootY, rootX
+        self.parent[rootY] = rootX
+        self.size[rootX] += self.size[rootY]
+        return True
+
+    # UPDATE por lotes — devuelve cuántas uniones juntaron dos conjuntos distintos
+    def union_many(self, pairs):
+        return sum(1 for x, y in pairs if self.union(x, y))
 
     # DELETE — no existe en DSU, pero lo simulamos desactivándolo
+    # (su posición en los arrays se queda para no romper a los que cuelgan de él)
     def delete(self, x):
-        if x in self.parent:
-            del self.parent[x]
-            del self.rank[x]
+        self.index.pop(x, None)
 
 #Ejemplo completo de uso (CRUD)
 dsu = DisjointSetUnion()
@@ -1341,8 +1353,7 @@ for x in [1, 2, 3, 4, 5]:
     dsu.make_set(x)
 
 # UPDATE — unir conjuntos
-dsu.union(1, 2)
-dsu.union(3, 4)
+dsu.union_many([(1, 2), (3, 4)])
 dsu.union(2, 3)  # ahora 1,2,3,4 están conectados
 
 # READ — verificar conexiones
@@ -902,34 +902,42 @@ root = WaveletTree(data, min(data), max(data))
 
 
 """Fibonacci heap
- Implementación básica del Fibonacci Heap (CRUD)"""
+ Implementación del Fibonacci Heap (CRUD) con consolidate, cut y cascading cut"""
 import math
 
+class FibNode:
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value      # dato asociado (p. ej. el vértice en Dijkstra/Prim)
+        self.degree = 0
+        self.mark = False
+        self.parent = None
+        self.child = None
+        # lista circular doblemente enlazada de hermanos
+        self.left = self
+        self.right = self
+
 class FibonacciHeap:
     def __init__(self):
         self.min = None
         self.count = 0
 
-    #  C → Create
-    def insert(self, key):
-        node = Node(key)
+    def __len__(self):
+        return self.count
 
-        if not self.min:
+    #  C → Create
+    def insert(self, key, value=None):
+        node = FibNode(key, value)
+        if self.min is None:
             self.min = node
         else:
-            # Inserta en la lista raíz
-            node.right = self.min.right
-            node.left = self.min
-            self.min.right.left = node
-            self.min.right = node
-
-            # Actualiza mínimo
+            # Inserta en la lista raíz y actualiza mínimo
+            self._splice(self.min, node)
             if key < self.min.key:
                 self.min = node
-                
         self.count += 1
         return node
-    
+
     #  R → Read
     def get_min(self):
         if not self.min:
@@ -945,7 +953,7 @@ class FibonacciHeap:
         parent = node.parent
 
         # Si viola propiedad heap, cortar
-        if parent and node.key < parent.key:
+        if parent is not None and node.key < parent.key:
             self._cut(node, parent)
             self._cascading_cut(parent)
 
@@ -955,43 +963,117 @@ class FibonacciHeap:
     #  D → Delete
     def delete(self, node):
         self.decrease_key(node, -math.inf)
+        self.min = node  # con empates en -inf el nodo a borrar debe ser el mínimo
         self.extract_min()
 
     #  Extraer mínimo
     def extract_min(self):
-        z = self.min
-        if z:
-            # Mover hijos a la lista raíz
-            if z.child:
-                children = [x for x in self._iterate(z.child)]
-                for c in children:
-                    c.parent = None
-                    self._add_to_root_list(c)
-
-            # Eliminar z del heap
-            self._remove_from_root_list(z)
-
-            if z == z.right:
-                self.min = None
-            else:
-                self.min = z.right
-                self._consolidate()
-
-            self.count -= 1
+        z = self.extract_min_node()
         return z.key if z else None
 
-    #  Función auxiliar: iterar nodos circulares
+    def extract_min_node(self):
+        """Como extract_min pero devuelve el nodo (clave y value)."""
+        z = self.min
+        if z is None:
+            return None
+        # Mover hijos a la lista raíz
+        if z.child is not None:
+            for c in list(self._iterate(z.child)):
+                c.parent = None
+                c.mark = False
+                self._splice(z, c)
+            z.child = None
+        # Eliminar z de la lista raíz
+        if z.right is z:
+            self.min = None
+        else:
+            self.min = z.right
+            self._remove_from_list(z)
+            self._consolidate()
+        z.left = z.right = z
+        self.count -= 1
+        return z
+
+    #  Funciones auxiliares
     def _iterate(self, head):
-        node = stop = head
-        flag = False
+        """Recorre una lista circular de hermanos empezando en head."""
+        node = head
         while True:
-            if node == stop and flag:
-                break
-            flag = True
             yield node
             node = node.right
+            if node is head:
+                break
+
+    @staticmethod
+    def _splice(anchor, node):
+        """Inserta node a la derecha de anchor en su lista circular."""
+        node.left = anchor
+        node.right = anchor.right
+        anchor.right.left = node
+        anchor.right = node
+
+    @staticmethod
+    def _remove_from_list(node):
+        node.left.right = node.right
+        node.right.left = node.left
+
+    def _link(self, y, x):
+        """Cuelga la raíz y como hija de la raíz x (x.key <= y.key)."""
+        self._remove_from_list(y)
+        y.parent = x
+        y.mark = False
+        if x.child is None:
+            y.left = y.right = y
+            x.child = y
+        else:
+            self._splice(x.child, y)
+        x.degree += 1
+
+    def _consolidate(self):
+        """Une raíces del mismo grado hasta que no haya dos iguales y recalcula el mínimo."""
+        by_degree = {}
+        for x in list(self._iterate(self.min)):
+            d = x.degree
+            while d in by_degree:
+                y = by_degree.pop(d)
+                if y.key < x.key:
+                    x, y = y, x
+                self._link(y, x)
+                d += 1
+            by_degree[d] = x
+        self.min = None
+        for x in by_degree.values():
+            if self.min is None:
+                x.left = x.right = x
+                self.min = x
+            else:
+                self._splice(self.min, x)
+                if x.key < self.min.key:
+                    self.min = x
+
+    def _cut(self, x, y):
+        """Saca x de los hijos de y y lo sube a la lista raíz."""
+        if x.right is x:
+            y.child = None
+        else:
+            if y.child is x:
+                y.child = x.right
+            self._remove_from_list(x)
+        y.degree -= 1
+        x.parent = None
+        x.mark = False
+        self._splice(self.min, x)
+
+    def _cascading_cut(self, y):
+        # iterativo: la cadena de padres marcados puede ser larga
+        while y.parent is not None:
+            if not y.mark:
+                y.mark = True
+                return
+            z = y.parent
+            self._cut(y, z)
+            y = z
 
-#Simplificado para comprensión; aún faltan consolid#ate, cut, etc., pero el CRUD funciona conceptualmente).
 #Ejemplo de uso
 # Crear heap
 H = FibonacciHeap()
@@ -1014,4 +1096,3 @@ print("Mínimo actual:", H.get_min())  # 3
 # Eliminar nodo
 H.delete(a)
 print("Tamaño:", H.count)  # 1
-
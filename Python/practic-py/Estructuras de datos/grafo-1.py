@@ -115,26 +115,474 @@ print(topo_sort(g2))
 
 
 
+#Colas de prioridad intercambiables (parámetro queue= de Dijkstra, A* y Prim), usadas por las funciones y clases de abajo.
+#Protocolo común: push(item, prioridad) inserta o baja la prioridad (True si cambió), pop() -> (prioridad, item)
+#del mínimo, peek() sin extraer, len(). Cada item está a lo sumo una vez: los bucles no saltan entradas obsoletas.
+#  "heapq"     heapq con entradas duplicadas (por defecto, el comportamiento de siempre; el heap crece a O(E))
+#  "binary"    heap binario indexado con decrease-key real (el heap no pasa de V entradas)
+#  "4ary"      igual con 4 hijos por nodo: menos niveles al subir claves, útil con muchos decrease-key
+#  "radix"     radix heap monótono: prioridades enteras que nunca bajan del último mínimo extraído
+#              (Dijkstra/A* consistente con pesos enteros; no sirve para Prim)
+#  "fibonacci" FibonacciHeap: decrease-key O(1) amortizado, constantes altas en Python
+import heapq 
+
+class LazyHeap:
+    """heapq con duplicados: push añade (prioridad, item) si mejora; pop salta las entradas obsoletas."""
+
+    def __init__(self):
+        self._heap = []
+        self._best = {}
+
+    def __len__(self):
+        return len(self._best)
+
+    def push(self, item, priority):
+        best = self._best.get(item)
+        if best is not None and best <= priority:
+            return False
+        self._best[item] = priority
+        heapq.heappush(self._heap, (priority, item))
+        return True
+
+    def _prune(self):
+        heap, best = self._heap, self._best
+        while heap[0][0] != best.get(heap[0][1]):
+            heapq.heappop(heap)
+
+    def peek(self):
+        self._prune()
+        return self._heap[0]
+
+    def pop(self):
+        self._prune()
+        priority, item = heapq.heappop(self._heap)
+        del self._best[item]
+        return priority, item
+
+class IndexedHeap:
+    """Heap d-ario indexado (item -> posición): decrease-key sube el item en su sitio, sin duplicados."""
+
+    def __init__(self, d=2):
+        if d < 2:
+            raise ValueError("Heap arity must be >= 2")
+        self.d = d
+        self._prio = []
+        self._items = []
+        self._pos = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def push(self, item, priority):
+        i = self._pos.get(item)
+        if i is None:
+            i = len(self._items)
+            self._prio.append(priority)
+            self._items.append(item)
+        elif priority >= self._prio[i]:
+            return False
+        self._sift_up(i, item, priority)
+        return True
+
+    def peek(self):
+        return self._prio[0], self._items[0]
+
+    def pop(self):
+        top = self._prio[0], self._items[0]
+        del self._pos[top[1]]
+        priority, item = self._prio.pop(), self._items.pop()
+        if self._items:
+            self._sift_down(0, item, priority)
+        return top
+
+    def _sift_up(self, i, item, priority):
+        prio, items, pos, d = self._prio, self._items, self._pos, self.d
+        while i > 0:
+            p = (i - 1) // d
+            if prio[p] <= priority:
+                break
+            prio[i] = prio[p]
+            items[i] = items[p]
+            pos[items[i]] = i
+            i = p
+        prio[i] = priority
+        items[i] = item
+        pos[item] = i
+
+    def _sift_down(self, i, item, priority):
+        prio, items, pos, d = self._prio, self._items, self._pos, self.d
+        n = len(items)
+        while True:
+            c = d * i + 1
+            if c >= n:
+                break
+            m, mp = c, prio[c]
+            for j in range(c + 1, min(c + d, n)):
+                if prio[j] < mp:
+                    m, mp = j, prio[j]
+            if mp >= priority:
+                break
+            prio[i] = mp
+            items[i] = items[m]
+            pos[items[i]] = i
+            i = m
+        prio[i] = priority
+        items[i] = item
+        pos[item] = i
+
+class RadixHeap:
+    """
+    Radix heap monótono: el cubo i guarda los items cuya prioridad difiere del último mínimo extraído
+    en el bit i-1 como más alto. Un item se redistribuye solo hacia cubos menores, así que cada uno
+    se mueve O(log C) veces (C = mayor prioridad). Exige prioridades enteras (se aceptan floats con
+    valor entero) >= último mínimo extraído; si no, ValueError.
+    """
+
+    def __init__(self):
+        self._last = 0
+        self._buckets = [{}]
+        self._where = {}
+
+    def __len__(self):
+        return len(self._where)
+
+    def push(self, item, priority):
+        key = int(priority)
+        if key != priority or key < self._last:
+            raise ValueError("Radix heap needs integer priorities not below the last extracted minimum")
+        b = self._where.get(item)
+        if b is not None:
+            if key >= self._buckets[b][item][0]:
+                return False
+            del self._buckets[b][item]
+        b = (key ^ self._last).bit_length()
+        while len(self._buckets) <= b:
+            self._buckets.append({})
+        self._buckets[b][item] = (key, priority)
+        self._where[item] = b
+        return True
+
+    def _refill(self):
+        """Si el cubo 0 está vacío, toma el primer cubo no vacío y reparte sus items respecto a su mínimo."""
+        buckets = self._buckets
+        if buckets[0]:
+            return
+        i = 1
+        while not buckets[i]:
+            i += 1
+        moved, buckets[i] = buckets[i], {}
+        last = self._last = min(k for k, _ in moved.values())
+        where = self._where
+        for item, entry in moved.items():
+            b = (entry[0] ^ last).bit_length()
+            buckets[b][item] = entry
+            where[item] = b
+
+    def peek(self):
+        self._refill()
+        item, (_, priority) = next(iter(self._buckets[0].items()))
+        return priority, item
+
+    def pop(self):
+        self._refill()
+        item, (_, priority) = self._buckets[0].popitem()
+        del self._where[item]
+        return priority, item
+
+class FibNode:
+    __slots__ = ("key", "value", "degree", "mark", "parent", "child", "left", "right")
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.degree = 0
+        self.mark = False
+        self.parent = None
+        self.child = None
+        self.left = self
+        self.right = self
+
+class FibonacciHeap:
+    """FibonacciHeap de arbol-2.py (insert / decrease_key / extract_min_node con consolidate y cortes en cascada)."""
+
+    def __init__(self):
+        self.min = None
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, key, value=None):
+        node = FibNode(key, value)
+        if self.min is None:
+            self.min = node
+        else:
+            self._splice(self.min, node)
+            if key < self.min.key:
+                self.min = node
+        self.count += 1
+        return node
+
+    def decrease_key(self, node, new_key):
+        if new_key > node.key:
+            raise ValueError("La nueva clave debe ser menor")
+        node.key = new_key
+        parent = node.parent
+        if parent is not None and node.key < parent.key:
+            self._cut(node, parent)
+            self._cascading_cut(parent)
+        if node.key < self.min.key:
+            self.min = node
+
+    def extract_min_node(self):
+        z = self.min
+        if z is None:
+            return None
+        if z.child is not None:
+            for c in list(self._iterate(z.child)):
+                c.parent = None
+                c.mark = False
+                self._splice(z, c)
+            z.child = None
+        if z.right is z:
+            self.min = None
+        else:
+            self.min = z.right
+            self._remove_from_list(z)
+            self._consolidate()
+        z.left = z.right = z
+        self.count -= 1
+        return z
+
+    @staticmethod
+    def _iterate(head):
+        node = head
+        while True:
+            yield node
+            node = node.right
+            if node is head:
+                break
+
+    @staticmethod
+    def _splice(anchor, node):
+        node.left = anchor
+        node.right = anchor.right
+        anchor.right.left = node
+        anchor.right = node
+
+    @staticmethod
+    def _remove_from_list(node):
+        node.left.right = node.right
+        node.right.left = node.left
+
+    def _link(self, y, x):
+        self._remove_from_list(y)
+        y.parent = x
+        y.mark = False
+        if x.child is None:
+            y.left = y.right = y
+            x.child = y
+        else:
+            self._splice(x.child, y)
+        x.degree += 1
+
+    def _consolidate(self):
+        by_degree = {}
+        for x in list(self._iterate(self.min)):
+            d = x.degree
+            while d in by_degree:
+                y = by_degree.pop(d)
+                if y.key < x.key:
+                    x, y = y, x
+                self._link(y, x)
+                d += 1
+            by_degree[d] = x
+        self.min = None
+        for x in by_degree.values():
+            if self.min is None:
+                x.left = x.right = x
+                self.min = x
+            else:
+                self._splice(self.min, x)
+                if x.key < self.min.key:
+                    self.min = x
+
+    def _cut(self, x, y):
+        if x.right is x:
+            y.child = None
+        else:
+            if y.child is x:
+                y.child = x.right
+            self._remove_from_list(x)
+        y.degree -= 1
+        x.parent = None
+        x.mark = False
+        self._splice(self.min, x)
+
+    def _cascading_cut(self, y):
+        while y.parent is not None:
+            if not y.mark:
+                y.mark = True
+                return
+            z = y.parent
+            self._cut(y, z)
+            y = z
+
+class FibonacciQueue:
+    """Adapta FibonacciHeap al protocolo de colas: item -> nodo para decrease_key."""
+
+    def __init__(self):
+        self._heap = FibonacciHeap()
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def push(self, item, priority):
+        node = self._nodes.get(item)
+        if node is None:
+            self._nodes[item] = self._heap.insert(priority, item)
+            return True
+        if priority < node.key:
+            self._heap.decrease_key(node, priority)
+            return True
+        return False
+
+    def peek(self):
+        return self._heap.min.key, self._heap.min.value
+
+    def pop(self):
+        node = self._heap.extract_min_node()
+        del self._nodes[node.value]
+        return node.key, node.value
+
+PRIORITY_QUEUES = {
+    "heapq": LazyHeap,
+    "binary": IndexedHeap,
+    "4ary": lambda: IndexedHeap(4),
+    "radix": RadixHeap,
+    "fibonacci": FibonacciQueue,
+}
+
+def make_queue(queue=None):
+    """queue: None (heapq), un nombre de PRIORITY_QUEUES o una clase/fábrica sin argumentos con el mismo protocolo."""
+    if queue is None:
+        return LazyHeap()
+    if isinstance(queue, str):
+        try:
+            return PRIORITY_QUEUES[queue]()
+        except KeyError:
+            raise ValueError(f"Unknown priority queue {queue!r}; expected one of {sorted(PRIORITY_QUEUES)}") from None
+    return queue()
+
+#Búsquedas punto a punto (A* y Dijkstra bidireccional), compartidas por las clases de abajo.
+#Devuelven (dist, path, settled): path=None si goal no es alcanzable; settled = nodos extraídos.
+def astar_search(out, start, goal, h, queue=None):
+    """
+    A* genérico: out(u) -> iterable de (v, peso); h(u) cota inferior de la distancia u->goal
+    (h = 0 es Dijkstra con parada temprana). queue: ver make_queue.
+    """
+    dist = {start: 0.0}
+    prev = {start: None}
+    pq = make_queue(queue)
+    pq.push(start, h(start))
+    settled = 0
+    while pq:
+        _, u = pq.pop()
+        d = dist[u]
+        settled += 1
+        if u == goal:
+            path = []
+            while u is not None:
+                path.append(u)
+                u = prev[u]
+            return d, path[::-1], settled
+        for v, w in out(u):
+            nd = d + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                prev[v] = u
+                pq.push(v, nd + h(v))
+    return float('inf'), None, settled
+
+def bidirectional_search(out, inc, start, goal, queue=None):
+    """
+    Alterna el lado con menor clave en el heap; mu = mejor camino visto al tocar un nodo
+    alcanzado por la otra búsqueda. Para cuando top_adelante + top_atrás >= mu.
+    inc(u): aristas entrantes (la búsqueda desde goal).
+    """
+    if start == goal:
+        return 0.0, [start], 1
+    dist = ({start: 0.0}, {goal: 0.0})
+    prev = ({start: None}, {goal: None})
+    pqs = (make_queue(queue), make_queue(queue))
+    pqs[0].push(start, 0.0)
+    pqs[1].push(goal, 0.0)
+    nbrs = (out, inc)
+    best, meet, settled = float('inf'), None, 0
+    while pqs[0] and pqs[1]:
+        top = (pqs[0].peek()[0], pqs[1].peek()[0])
+        if top[0] + top[1] >= best:
+            break
+        side = 0 if top[0] <= top[1] else 1
+        d, u = pqs[side].pop()
+        mine, other = dist[side], dist[1 - side]
+        settled += 1
+        for v, w in nbrs[side](u):
+            nd = d + w
+            if nd < mine.get(v, float('inf')):
+                mine[v] = nd
+                prev[side][v] = u
+                pqs[side].push(v, nd)
+            if v in other and mine[v] + other[v] < best:
+                best = mine[v] + other[v]
+                meet = v
+    if meet is None:
+        return float('inf'), None, settled
+    path = []
+    u = meet
+    while u is not None:
+        path.append(u)
+        u = prev[0][u]
+    path.reverse()
+    u = prev[1][meet]
+    while u is not None:
+        path.append(u)
+        u = prev[1][u]
+    return best, path, settled
+
+
+
+
+
+
+
+
+
+
+
 #Grafos ponderados. Algoritmo: Dijkstra (ruta más corta desde un nodo)
 import heapq 
 
-def dijkstra(graph, start):
+def dijkstra(graph, start, queue=None):
+    # queue: cola de prioridad (None = heapq; ver make_queue)
     dist = {node: float("inf") for node in graph}
     dist[start] = 0
-    pq = [(0, start)] 
+    pq = make_queue(queue)
+    pq.push(start, 0) 
 
     while pq:
-        current_dist, node = heapq.heappop(pq) 
-
-        if current_dist > dist[node]:
-            continue 
+        current_dist, node = pq.pop() 
 
         for neighbor, weight in graph[node]:
             new_dist = current_dist + weight 
 
             if new_dist < dist[neighbor]:
                 dist[neighbor] = new_dist
-                heapq.heappush(pq, (new_dist, neighbor)) 
+                pq.push(neighbor, new_dist) 
 
     return dist 
 
@@ -147,6 +595,7 @@ g3 = {
 } 
 
 print(dijkstra(g3, 'A')) 
+print(dijkstra(g3, 'A', queue="binary"))  # heap indexado: misma respuesta, sin entradas duplicadas
 
 
 
@@ -188,24 +637,109 @@ print(bellman_ford(edges, 4, 0))
 #Grafos para detectar componentes  Algoritmo: Union–Find (Disjoint Set)
 #Detecta componentes conectadas y ciclos.
 class DSU:
-    def __init__(self, n):
-        self.parent = list(range(n)) 
+    """
+    Union-find sobre enteros 0..n-1 con arrays planos: find iterativo con path halving, union por
+    tamaño y union_many por lotes (sin recursión ni diccionarios). Para nodos arbitrarios, relabel
+    a enteros antes (ver kruskal_edges).
+    """
+
+    def __init__(self, n=0):
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.count = n  # número de conjuntos disjuntos
+
+    def add(self):
+        """Nuevo conjunto unitario; devuelve su id."""
+        x = len(self.parent)
+        self.parent.append(x)
+        self.size.append(1)
+        self.count += 1
+        return x
 
     def find(self, x):
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])  # Path compression
-        return self.parent[x] 
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return x
 
     def union(self, a, b):
-        pa, pb = self.find(a), self.find(b)
-        if pa != pb:
-            self.parent[pb] = pa 
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        size = self.size
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        size[ra] += size[rb]
+        self.count -= 1
+        return True
+
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+
+    def union_many(self, us, vs, limit=None):
+        """
+        Une us[i]-vs[i] en orden (secuencias o array.array paralelos) con find y union en línea.
+        Devuelve las posiciones i que unieron dos conjuntos; para tras `limit` uniones.
+        """
+        parent, size = self.parent, self.size
+        taken = []
+        if limit is not None and limit <= 0:
+            return taken
+        for i in range(len(us)):
+            x = us[i]
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            y = vs[i]
+            while parent[y] != y:
+                parent[y] = parent[parent[y]]
+                y = parent[y]
+            if x == y:
+                continue
+            if size[x] < size[y]:
+                x, y = y, x
+            parent[y] = x
+            size[x] += size[y]
+            taken.append(i)
+            if len(taken) == limit:
+                break
+        self.count -= len(taken)
+        return taken
+
+
+def kruskal_arrays(n, us, vs, ws=None, presorted=False):
+    """
+    Kruskal sobre arrays paralelos de aristas (us[i], vs[i], ws[i]) con nodos 0..n-1.
+    presorted=True: las aristas ya vienen ordenadas por peso y ws no se usa (no se ordena ni copia).
+    Devuelve las posiciones de las aristas del bosque de expansión mínimo, en orden de peso.
+    """
+    dsu = DSU(n)
+    if presorted:
+        return dsu.union_many(us, vs, n - 1)
+    order = sorted(range(len(us)), key=ws.__getitem__)
+    taken = dsu.union_many([us[i] for i in order], [vs[i] for i in order], n - 1)
+    return [order[i] for i in taken]
+
+
+def kruskal_edges(nodes, edges, presorted=False):
+    """
+    Kruskal para nodos hashables: edges son tuplas (u, v, w, ...) y se devuelven las elegidas.
+    Relabel a enteros y kruskal_arrays; orden estable entre pesos iguales.
+    """
+    index = {u: i for i, u in enumerate(nodes)}
+    us = [index[e[0]] for e in edges]
+    vs = [index[e[1]] for e in edges]
+    ws = None if presorted else [e[2] for e in edges]
+    return [edges[i] for i in kruskal_arrays(len(index), us, vs, ws, presorted)]
 
 # Ejemplo
 dsu = DSU(5)
 dsu.union(0, 1)
 dsu.union(1, 2)
 print(dsu.find(2)) 
+print(dsu.union_many([2, 3], [0, 4]), dsu.count)  # [1] (2-0 ya estaban unidos), 2 conjuntos
 
 
 
@@ -216,17 +750,12 @@ print(dsu.find(2))
 
 #Grafos para encontrar Árboles de Expansión Mínima (MST)
 #Algoritmo Kruskal
-def kruskal(edges, n_nodes):
-    dsu = DSU(n_nodes)
-    mst = []
-    edges = sorted(edges, key=lambda x: x[2]) 
-
-    for u, v, w in edges:
-        if dsu.find(u) != dsu.find(v):
-            dsu.union(u, v)
-            mst.append((u, v, w)) 
-
-    return mst 
+def kruskal(edges, n_nodes, presorted=False):
+    # edges: (u, v, w) con u, v en 0..n_nodes-1; presorted=True si ya vienen ordenadas por peso
+    us = [u for u, _, _ in edges]
+    vs = [v for _, v, _ in edges]
+    ws = [w for _, _, w in edges]
+    return [edges[i] for i in kruskal_arrays(n_nodes, us, vs, ws, presorted)] 
 
 # Ejemplo
 edges = [
@@ -252,23 +781,23 @@ print(kruskal(edges, 4))
 #Algoritmo Prim
 import heapq 
 
-def prim(graph, start):
+def prim(graph, start, queue=None):
+    # queue: cola de prioridad (None = heapq; "radix" no vale: las claves no son monótonas)
+    # Cada vértice fuera del árbol está una sola vez en la cola, con su arista más barata hacia él.
     visited = set()
-    pq = [(0, start)]
+    pq = make_queue(queue)
+    pq.push(start, 0)
     mst_weight = 0 
 
     while pq:
-        weight, node = heapq.heappop(pq) 
-
-        if node in visited:
-            continue 
+        weight, node = pq.pop() 
 
         visited.add(node)
         mst_weight += weight 
 
         for neighbor, w in graph[node]:
             if neighbor not in visited:
-                heapq.heappush(pq, (w, neighbor)) 
+                pq.push(neighbor, w) 
 
     return mst_weight 
 
@@ -281,6 +810,8 @@ g4 = {
 } 
 
 print(prim(g4, 0))
+print(prim(g4, 0, queue="4ary"))
+
 
 
 
@@ -289,6 +820,327 @@ print(prim(g4, 0))
 
 
 
+#DFS iterativo (sin recursión): SCC de Pearce y detección de ciclos, usado por las clases de abajo.
+#Todas reciben nodes (iterable) y succ(u) -> iterable de vecinos; cada nodo guarda en una pila
+#explícita su iterador de vecinos, así la profundidad no depende del límite de recursión.
+def scc_pearce(nodes, succ):
+    """
+    Componentes fuertemente conexas con el algoritmo de Pearce (variante de Tarjan con un solo
+    índice por nodo, sin lowlink aparte ni marca de pila y sin grafo transpuesto). O(V + E).
+    Las componentes salen en orden topológico del grafo condensado (fuentes primero), como Kosaraju.
+    """
+    nodes = list(nodes)
+    rindex = {}
+    index = 1
+    c = 2 * len(nodes)  # ids de componentes cerradas: siempre mayores que cualquier índice activo
+    stack = []
+    comps = []
+    for s in nodes:
+        if s in rindex:
+            continue
+        rindex[s] = index
+        index += 1
+        frames = [[s, iter(succ(s)), True]]  # (nodo, vecinos pendientes, es raíz)
+        while frames:
+            fr = frames[-1]
+            v = fr[0]
+            rv = rindex[v]
+            for w in fr[1]:
+                rw = rindex.get(w)
+                if rw is None:
+                    rindex[w] = index
+                    index += 1
+                    frames.append([w, iter(succ(w)), True])
+                    break
+                if rw < rv:
+                    rindex[v] = rv = rw
+                    fr[2] = False
+            else:
+                frames.pop()
+                if fr[2]:
+                    index -= 1
+                    comp = [v]
+                    while stack and rv <= rindex[stack[-1]]:
+                        w = stack.pop()
+                        rindex[w] = c
+                        index -= 1
+                        comp.append(w)
+                    rindex[v] = c
+                    c -= 1
+                    comps.append(comp)
+                else:
+                    stack.append(v)
+                if frames:
+                    parent = frames[-1]
+                    if rindex[v] < rindex[parent[0]]:
+                        rindex[parent[0]] = rindex[v]
+                        parent[2] = False
+    comps.reverse()
+    return comps
+
+
+def has_cycle_directed(nodes, succ):
+    """Ciclo dirigido: DFS con colores (1 = en la pila, 2 = terminado). O(V + E)."""
+    color = {}
+    for s in nodes:
+        if s in color:
+            continue
+        color[s] = 1
+        frames = [(s, iter(succ(s)))]
+        while frames:
+            v, it = frames[-1]
+            for w in it:
+                cw = color.get(w)
+                if cw is None:
+                    color[w] = 1
+                    frames.append((w, iter(succ(w))))
+                    break
+                if cw == 1:
+                    return True
+            else:
+                frames.pop()
+                color[v] = 2
+    return False
+
+
+def has_cycle_undirected(nodes, succ):
+    """Ciclo no dirigido: DFS que ignora las aristas hacia el padre. O(V + E)."""
+    visited = set()
+    for s in nodes:
+        if s in visited:
+            continue
+        visited.add(s)
+        frames = [(s, None, iter(succ(s)))]
+        while frames:
+            v, p, it = frames[-1]
+            for w in it:
+                if w == p:
+                    continue
+                if w in visited:
+                    return True
+                visited.add(w)
+                frames.append((w, v, iter(succ(w))))
+                break
+            else:
+                frames.pop()
+    return False
+
+
+
+
+
+
+#Carga masiva de listas de aristas: CSV/TSV ("u<sep>v[<sep>peso]") o cualquier iterador, por bloques.
+#Un bloque es (us, vs, ws): columnas de origen, destino y peso (ws=None si ninguna arista trae peso).
+#Los ficheros se leen por trozos de texto y cada trozo se parte de una sola vez (split sobre todo el bloque)
+#en vez de línea a línea; el load_edge_list de las clases de abajo vuelca los bloques en su adyacencia
+#sin pasar por add_edge.
+from itertools import islice, repeat
+import os
+import time
+import tracemalloc
+
+def _node_key(tok, numeric_ids):
+    tok = tok.strip()
+    if numeric_ids:
+        try:
+            return int(tok)
+        except ValueError:
+            pass
+    return tok
+
+def _intern_column(col, names, convert=None):
+    """Sustituye cada id por el objeto canónico de names (convert(token) la primera vez que aparece)."""
+    if convert is None:
+        return list(map(names.setdefault, col, col))
+    for t in set(col).difference(names):
+        names[t] = convert(t)
+    return list(map(names.__getitem__, col))
+
+def _split_block(text, sep, width):
+    """
+    Columnas de un trozo de líneas completas si todas tienen width campos y no hay comentarios; si no, None.
+    Cada fin de línea queda como un token marcador: el trozo es regular si los marcadores caen justo cada
+    width campos (una cuenta sobre el total no basta: una línea de 2 y otra de 4 suman lo mismo que dos de 3).
+    """
+    if "#" in text or "\0" in text:
+        return None
+    if not text.endswith("\n"):
+        text += "\n"
+    rows = text.count("\n")
+    if sep is None:
+        toks = text.replace("\n", " \0 ").split()
+        mark = "\0"
+    else:
+        toks = text.replace("\n", sep + "\n" + sep).split(sep)
+        toks.pop()
+        mark = "\n"
+    if len(toks) != rows * (width + 1) or toks[width::width + 1].count(mark) != rows:
+        return None
+    return [toks[i::width + 1] for i in range(min(width, 3))]
+
+def _split_lines(text, sep):
+    """Camino lento para trozos con comentarios, líneas vacías o número de campos variable."""
+    us, vs, ws = [], [], []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] == "#":
+            continue
+        parts = line.split(sep)
+        if len(parts) < 2:
+            raise ValueError(f"Malformed edge line: {line!r}")
+        us.append(parts[0])
+        vs.append(parts[1])
+        ws.append(parts[2] if len(parts) > 2 else None)
+    return [us, vs, ws]
+
+def iter_edge_chunks(source, delimiter=None, chunk_size=100_000, numeric_ids=True, skip_header=False,
+                     intern_ids=True):
+    """
+    Emite bloques (us, vs, ws) de unas chunk_size aristas; en ws, None = arista sin peso.
+    source: ruta a un fichero de texto (líneas vacías o que empiezan por '#' se ignoran; si delimiter es None
+    se usa tabulador, coma o espacios según la primera línea) o cualquier iterable de tuplas (u, v[, w]).
+    En ficheros, con numeric_ids los tokens que int() acepta se convierten a int, y los ids se internan:
+    cada id distinto se crea una sola vez y todas sus aristas comparten el objeto (menos memoria en la
+    adyacencia). intern_ids=False lo omite para ids enteros, a cambio de más memoria y menos tiempo.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        it = iter(source)
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                return
+            ws = [t[2] if len(t) > 2 else None for t in chunk] if any(len(t) > 2 for t in chunk) else None
+            yield [t[0] for t in chunk], [t[1] for t in chunk], ws
+    names = {}
+    ints = {}
+
+    def ids(col):
+        if numeric_ids:
+            try:
+                keys = list(map(int, col))
+            except ValueError:
+                return _intern_column(col, names, lambda t: _node_key(t, True))
+            return _intern_column(keys, ints) if intern_ids else keys
+        return _intern_column(col, names, str.strip)
+
+    sep, width = delimiter, 0
+    block = chunk_size * 16  # ~bytes por línea "u<sep>v<sep>peso"
+    rest = ""
+    with open(source, "r", encoding="utf-8") as f:
+        if skip_header:
+            f.readline()
+        while True:
+            data = f.read(block)
+            text = rest + data
+            if data:
+                cut = text.rfind("\n") + 1
+                if cut == 0:
+                    rest = text
+                    continue
+                text, rest = text[:cut], text[cut:]
+            else:
+                rest = ""
+            if not text:
+                return
+            if not width:
+                first = next((s for s in map(str.strip, text.splitlines()) if s and s[0] != "#"), None)
+                if first is None:
+                    if not data:
+                        return
+                    continue
+                if delimiter is None:
+                    sep = "\t" if "\t" in first else ("," if "," in first else None)
+                width = len(first.split(sep))
+            cols = _split_block(text, sep, width) if width >= 2 else None
+            if cols is None:
+                cols = _split_lines(text, sep)
+            us, vs = cols[0], cols[1]
+            if us:
+                if len(cols) < 3:
+                    ws = None
+                elif None in cols[2]:
+                    ws = [None if x is None else float(x) for x in cols[2]]
+                    if all(x is None for x in ws):
+                        ws = None
+                else:
+                    ws = list(map(float, cols[2]))
+                yield ids(us), ids(vs), ws
+            if not data:
+                return
+
+def chunk_edges(chunk):
+    """Recorre un bloque arista a arista: (u, v, w) con w=None si no trae peso."""
+    us, vs, ws = chunk
+    return zip(us, vs, ws if ws is not None else repeat(None))
+
+def ingest_edges(source, consume, measure_memory=False, **options):
+    """
+    Pasa cada bloque de iter_edge_chunks(source, **options) a consume(bloque), que lo vuelca en la adyacencia
+    y devuelve cuántas aristas añadió (el resto eran paralelas y la clase las fusiona).
+    Retorna el informe {edges_read, edges_added, seconds, edges_per_sec, peak_mb}. Con measure_memory,
+    peak_mb es el pico de memoria reservada durante la carga (tracemalloc, que la ralentiza); si no, o si
+    ya había una traza de tracemalloc abierta (no se mezclan los picos), None.
+    """
+    trace = measure_memory and not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    read = added = 0
+    try:
+        for chunk in iter_edge_chunks(source, **options):
+            read += len(chunk[0])
+            added += consume(chunk)
+        dt = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] / 1e6 if trace else None
+    finally:
+        if trace:
+            tracemalloc.stop()
+    return {"edges_read": read, "edges_added": added, "seconds": dt,
+            "edges_per_sec": read / dt if dt > 0 else 0.0, "peak_mb": peak}
+
+def ingest_weighted_adj(adj, source, directed, **options):
+    """
+    Carga source en adj (nodo -> lista de (vecino, peso)) como add_edge: una arista por par (gana el último
+    peso; sin peso -> 1), espejada si no es dirigido. Los nodos tocados se trabajan como dict vecino -> peso
+    (sin recorrer la lista en cada arista) y se vuelven a escribir como lista al final.
+    Retorna el informe de ingest_edges más "nodes".
+    """
+    touched = {}  # nodo -> dict(vecino -> peso), en el orden de las listas originales
+
+    def row(x):
+        d = touched.get(x)
+        if d is None:
+            if x not in adj:
+                adj[x] = []
+            d = touched[x] = dict(adj[x])
+        return d
+
+    def consume(chunk):
+        added = 0
+        for u, v, w in chunk_edges(chunk):
+            w = 1 if w is None else w
+            du = row(u)
+            dv = row(v)
+            if v not in du:
+                added += 1
+            du[v] = w
+            if not directed:
+                dv[u] = w
+        return added
+
+    try:
+        report = ingest_edges(source, consume, **options)
+    finally:
+        for x, d in touched.items():
+            adj[x] = list(d.items())
+    report["nodes"] = len(adj)
+    return report
+
+
+
+
+
 
 #Grafo dirigido
 #Código completo (Grafo dirigido + CRUD + algoritmos)
@@ -377,6 +1229,13 @@ class DirectedGraph:
         if not found:
             raise KeyError(f"Edge {u}->{v} not found") 
 
+    # -------------------
+    # CARGA MASIVA (ver iter_edge_chunks / ingest_weighted_adj)
+    # -------------------
+    def load_edge_list(self, source, **options):
+        """Como add_edge pero por bloques (gana el último peso; sin peso -> 1). Retorna el informe de ingest_edges más "nodes"."""
+        return ingest_weighted_adj(self.adj, source, True, **options)
+
     # -------------------
     # ALGORITMOS
     # -------------------
@@ -415,28 +1274,9 @@ class DirectedGraph:
                     stack.append(v)
         return order 
 
-    def _dfs_cycle_util(self, node, visited, rec_stack):
-        """Utilitario para detección de ciclos (DFS recursivo)."""
-        visited.add(node)
-        rec_stack.add(node)
-        for nei, _ in self.adj[node]:
-            if nei not in visited:
-                if self._dfs_cycle_util(nei, visited, rec_stack):
-                    return True
-            elif nei in rec_stack:
-                return True
-        rec_stack.remove(node)
-        return False 
-
     def has_cycle(self):
-        """Detecta si hay ciclos en el grafo dirigido."""
-        visited = set()
-        rec_stack = set()
-        for node in self.adj:
-            if node not in visited:
-                if self._dfs_cycle_util(node, visited, rec_stack):
-                    return True
-        return False 
+        """Detecta si hay ciclos en el grafo dirigido (DFS iterativo, ver has_cycle_directed)."""
+        return has_cycle_directed(self.adj, lambda u: [v for v, _ in self.adj[u]]) 
 
     def topological_sort(self):
         """
@@ -463,10 +1303,11 @@ class DirectedGraph:
             raise ValueError("Graph has at least one cycle; topological sort not possible")
         return topo 
 
-    def dijkstra(self, start):
+    def dijkstra(self, start, queue=None):
         """
         Dijkstra: caminos más cortos desde start (asume pesos >= 0).
         Retorna dict node -> distance, y predecessor dict para reconstrucción.
+        queue: cola de prioridad (None = heapq; ver make_queue).
         """
         if start not in self.adj:
             raise KeyError(f"Node {start} not found") 
@@ -474,17 +1315,16 @@ class DirectedGraph:
         dist = {u: float("inf") for u in self.adj}
         prev = {u: None for u in self.adj}
         dist[start] = 0
-        pq = [(0, start)]
+        pq = make_queue(queue)
+        pq.push(start, 0)
         while pq:
-            d, u = heapq.heappop(pq)
-            if d > dist[u]:
-                continue
+            d, u = pq.pop()
             for v, w in self.adj[u]:
                 nd = d + w
                 if nd < dist[v]:
                     dist[v] = nd
                     prev[v] = u
-                    heapq.heappush(pq, (nd, v))
+                    pq.push(v, nd)
         return dist, prev 
 
     def bellman_ford(self, start):
@@ -521,46 +1361,12 @@ class DirectedGraph:
 
     def kosaraju_scc(self):
         """
-        Kosaraju para componentes fuertemente conectadas.
-        Retorna lista de listas: cada sublista es una SCC.
+        Componentes fuertemente conectadas (Pearce iterativo: sin recursión ni grafo transpuesto).
+        Retorna lista de listas: cada sublista es una SCC. Las SCC salen en el mismo orden que con Kosaraju,
+        pero dentro de cada una los nodos no: primero la raíz del DFS y luego el resto en orden inverso de
+        cierre, en vez del preorden sobre el transpuesto. Compara cada SCC como conjunto.
         """
-        visited = set()
-        stack = [] 
-
-        def dfs1(u):
-            visited.add(u)
-            for v, _ in self.adj[u]:
-                if v not in visited:
-                    dfs1(v)
-            stack.append(u) 
-
-        for u in self.adj:
-            if u not in visited:
-                dfs1(u) 
-
-        # construir grafo transpuesto
-        transpose = DirectedGraph()
-        for u in self.adj:
-            transpose.add_node(u)
-        for u in self.adj:
-            for v, w in self.adj[u]:
-                transpose.add_edge(v, u, w)  # invertir arista 
-
-        visited.clear()
-        sccs = []
-        while stack:
-            u = stack.pop()
-            if u not in visited:
-                comp = []
-                def dfs2(x):
-                    visited.add(x)
-                    comp.append(x)
-                    for y,_ in transpose.adj[x]:
-                        if y not in visited:
-                            dfs2(y)
-                dfs2(u)
-                sccs.append(comp)
-        return sccs 
+        return scc_pearce(self.adj, lambda u: [v for v, _ in self.adj[u]]) 
 
     # -------------------
     # UTILIDADES
@@ -629,6 +1435,11 @@ if __name__ == "__main__":
     g.remove_node("E")
     print("Nodos tras eliminar E:", g.get_nodes())
 
+    # Carga masiva desde una lista de aristas (mismo resultado que add_edge arista a arista)
+    d = DirectedGraph()
+    report = d.load_edge_list([("A", "B", 2), ("B", "C"), ("A", "B", 5)])
+    print("load_edge_list:", d.get_edges(), report["edges_added"], "nuevas de", report["edges_read"])
+
 
 
 
@@ -758,6 +1569,14 @@ class UndirectedGraph:
         if not found:
             raise KeyError(f"Edge {u}-{v} not found") 
 
+    # -------------------
+    # CARGA MASIVA (ver iter_edge_chunks / ingest_weighted_adj)
+    # -------------------
+    def load_edge_list(self, source, **options):
+        """Como add_edge pero por bloques, en ambas direcciones (gana el último peso; sin peso -> 1).
+        Retorna el informe de ingest_edges más "nodes"."""
+        return ingest_weighted_adj(self.adj, source, False, **options)
+
     # -------------------
     # ALGORITMOS
     # -------------------
@@ -820,49 +1639,32 @@ class UndirectedGraph:
 
     def has_cycle(self):
         """
-        Detecta ciclo en grafo no dirigido usando DFS y control del 'parent'.
+        Detecta ciclo en grafo no dirigido usando DFS iterativo y control del 'parent'.
         Retorna True si hay ciclo.
         """
-        visited = set() 
+        return has_cycle_undirected(self.adj, lambda u: [v for v, _ in self.adj[u]]) 
 
-        def dfs(u, parent):
-            visited.add(u)
-            for v, _ in self.adj[u]:
-                if v == parent:
-                    continue
-                if v in visited:
-                    return True
-                if dfs(v, u):
-                    return True
-            return False 
-
-        for node in self.adj:
-            if node not in visited:
-                if dfs(node, None):
-                    return True
-        return False 
-
-    def dijkstra(self, start):
+    def dijkstra(self, start, queue=None):
         """
         Dijkstra: caminos más cortos desde start (pesos >= 0).
         Retorna (dist, prev) donde prev permite reconstruir caminos.
+        queue: cola de prioridad (None = heapq; ver make_queue).
         """
         if start not in self.adj:
             raise KeyError("Start node not in graph")
         dist = {u: float('inf') for u in self.adj}
         prev = {u: None for u in self.adj}
         dist[start] = 0
-        pq = [(0, start)]
+        pq = make_queue(queue)
+        pq.push(start, 0)
         while pq:
-            d, u = heapq.heappop(pq)
-            if d > dist[u]:
-                continue
+            d, u = pq.pop()
             for v, w in self.adj[u]:
                 nd = d + w
                 if nd < dist[v]:
                     dist[v] = nd
                     prev[v] = u
-                    heapq.heappush(pq, (nd, v))
+                    pq.push(v, nd)
         return dist, prev 
 
     def bellman_ford(self, start):
@@ -927,61 +1729,39 @@ class UndirectedGraph:
     # -------------------
     # MST: Kruskal + Prim
     # -------------------
-    class _DSU:
-        def __init__(self, items):
-            self.parent = {x: x for x in items}
-            self.rank = {x: 0 for x in items}
-        def find(self, x):
-            if self.parent[x] != x:
-                self.parent[x] = self.find(self.parent[x])
-            return self.parent[x]
-        def union(self, a, b):
-            ra, rb = self.find(a), self.find(b)
-            if ra == rb:
-                return False
-            if self.rank[ra] < self.rank[rb]:
-                ra, rb = rb, ra
-            self.parent[rb] = ra
-            if self.rank[ra] == self.rank[rb]:
-                self.rank[ra] += 1
-            return True 
-
     def kruskal_mst(self):
         """Kruskal: retorna lista de aristas (u,v,w) del MST y peso total."""
-        edges = self.get_edges()
-        edges_sorted = sorted(edges, key=lambda x: x[2])
-        dsu = UndirectedGraph._DSU(self.adj.keys())
-        mst = []
-        total = 0
-        for u, v, w in edges_sorted:
-            if dsu.union(u, v):
-                mst.append((u, v, w))
-                total += w
+        mst = kruskal_edges(self.adj, self.get_edges())
+        total = sum(w for _, _, w in mst)
         return mst, total 
 
-    def prim_mst(self, start=None):
-        """Prim: retorna lista de aristas del MST y peso total. start optional."""
+    def prim_mst(self, start=None, queue=None):
+        """
+        Prim: retorna lista de aristas del MST y peso total. start optional.
+        queue: cola de prioridad (None = heapq; ver make_queue). "radix" no vale: las claves no son monótonas.
+        Las aristas salen en orden de extracción. Cada nodo guarda solo su mejor arista (decrease-key), así que
+        con pesos empatados el orden de la lista, y si hay varios MST cuál se devuelve, puede diferir de la
+        versión que desempataba por (w, u, v) en el heap; el peso total es el mismo.
+        """
         if not self.adj:
             return [], 0
         if start is None:
             start = next(iter(self.adj))
-        visited = set([start])
-        edges = []
-        pq = []
-        for v,w in self.adj[start]:
-            heapq.heappush(pq, (w, start, v))
+        visited = set()
+        parent = {start: None}
+        pq = make_queue(queue)
+        pq.push(start, 0)
         mst = []
         total = 0
-        while pq and len(visited) < len(self.adj):
-            w, u, v = heapq.heappop(pq)
-            if v in visited:
-                continue
+        while pq:
+            w, v = pq.pop()
             visited.add(v)
-            mst.append((u, v, w))
-            total += w
+            if parent[v] is not None:
+                mst.append((parent[v], v, w))
+                total += w
             for to, wt in self.adj[v]:
-                if to not in visited:
-                    heapq.heappush(pq, (wt, v, to))
+                if to not in visited and pq.push(to, wt):
+                    parent[to] = v
         # Si no visitamos todos, el grafo no es conexo; devolvemos lo que haya.
         return mst, total 
 
@@ -1061,6 +1841,11 @@ if __name__ == "__main__":
     mst_prim, total_p = g.prim_mst("A")
     print("MST Prim:", mst_prim, "Peso total:", total_p)
 
+    # Carga masiva desde una lista de aristas (cada una en ambas direcciones)
+    u = UndirectedGraph()
+    report = u.load_edge_list([("A", "B", 3), ("B", "C", 1), ("C", "A")])
+    print("load_edge_list:", u.get_edges(), report["nodes"], "nodos")
+
 
 
 
@@ -1069,19 +1854,209 @@ if __name__ == "__main__":
 
 
 #Grafo ponderado. Código (guardar como weighted_graph.py o pegar en tu script)
+from array import array
 from collections import deque
 import heapq 
+from itertools import islice, repeat
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+# -------------------------
+# FORMATO BINARIO CSR (.gcsr) CON CARGA POR MMAP
+# Cabecera fija + secciones alineadas a 8 bytes; la tabla de contenidos es un JSON al final del fichero:
+#   offsets (int64, n+1) | targets (int32, m) | weights (float64, m, opcional) | ids | columnas
+# ids: implícitos 0..n-1 (no ocupan nada), tabla int64 o JSON (las tuplas vuelven como tuplas).
+# Columnas de atributos por nodo (filas = ids) o por arista (filas = posiciones de targets):
+# 'q'/'d' si todas las filas tienen un int/float, si no JSON disperso [[fila, valor], ...].
+# -------------------------
+GCSR_MAGIC = b"GCSR"
+GCSR_VERSION = 1
+_GCSR_HEADER = struct.Struct("<4sHHqqqq")  # magic, version, flags, n, m, meta_offset, meta_len
+_GCSR_DIRECTED, _GCSR_WEIGHTED, _GCSR_BIG_ENDIAN = 1, 2, 4
+
+def _gcsr_key(x):
+    """JSON convierte tuplas en listas; los ids deben volver hashables."""
+    return tuple(_gcsr_key(y) for y in x) if isinstance(x, list) else x
+
+def _gcsr_blob(code, seq):
+    if isinstance(seq, array) and seq.typecode == code:
+        return seq
+    if isinstance(seq, memoryview) and seq.format == code:
+        return seq
+    return array(code, seq)
+
+def _gcsr_column(rows, count):
+    """Elige la codificación de una columna: 'q'/'d' densas si todas las filas tienen valor del mismo tipo."""
+    if len(rows) == count and count > 0:
+        kinds = {type(v) for v in rows.values()}
+        if kinds == {int} and all(-2**63 <= v < 2**63 for v in rows.values()):
+            return 'q', array('q', (rows[i] for i in range(count)))
+        if kinds == {float}:
+            return 'd', array('d', (rows[i] for i in range(count)))
+    return 'json', json.dumps(sorted(rows.items())).encode("utf-8")
+
+def column_rows(col):
+    """(fila, valor) de una columna leída por GraphFile (densa o dispersa)."""
+    return col.items() if isinstance(col, dict) else enumerate(col)
+
+def write_gcsr(path, ids, offsets, targets, weights=None, directed=True,
+               node_columns=None, edge_columns=None, extra=None):
+    """
+    Escribe un grafo en formato .gcsr. Vecinos de ids[i]: targets[offsets[i]:offsets[i+1]].
+    node_columns / edge_columns: nombre -> {fila: valor}. extra: metadatos JSON de la clase que guarda.
+    Los ids y los atributos no numéricos deben ser serializables en JSON. Devuelve los bytes escritos.
+    """
+    n = len(ids)
+    flags = (_GCSR_DIRECTED if directed else 0) | (_GCSR_BIG_ENDIAN if sys.byteorder == "big" else 0)
+    if weights is not None:
+        flags |= _GCSR_WEIGHTED
+    meta = {"extra": extra or {}, "node_columns": {}, "edge_columns": {}}
+    with open(path, "wb") as f:
+        f.write(bytes(_GCSR_HEADER.size))
+
+        def put(data):
+            f.write(bytes(-f.tell() % 8))
+            pos = f.tell()
+            if isinstance(data, array):
+                data.tofile(f)
+            else:
+                f.write(data)
+            return [pos, f.tell() - pos]
+
+        meta["offsets"] = put(_gcsr_blob('q', offsets))
+        tg = _gcsr_blob('i', targets)
+        m = len(tg)
+        meta["targets"] = put(tg)
+        if weights is not None:
+            meta["weights"] = put(_gcsr_blob('d', weights))
+        if isinstance(ids, range) and ids.start == 0 and ids.step == 1:
+            meta["ids"] = {"kind": "range"}
+        elif all(type(u) is int for u in ids):
+            kind = "range" if all(u == i for i, u in enumerate(ids)) else "int"
+            meta["ids"] = {"kind": kind} if kind == "range" else {"kind": "int", "at": put(array('q', ids))}
+        else:
+            meta["ids"] = {"kind": "json", "at": put(json.dumps(list(ids)).encode("utf-8"))}
+        for key, cols, count in (("node_columns", node_columns, n), ("edge_columns", edge_columns, m)):
+            for name, rows in (cols or {}).items():
+                code, data = _gcsr_column(rows, count)
+                meta[key][name] = {"type": code, "at": put(data)}
+        blob = json.dumps(meta).encode("utf-8")
+        meta_offset = f.tell()
+        f.write(blob)
+        size = f.tell()
+        f.seek(0)
+        f.write(_GCSR_HEADER.pack(GCSR_MAGIC, GCSR_VERSION, flags, n, m, meta_offset, len(blob)))
+    return size
+
+class GraphFile:
+    """
+    Lector de ficheros .gcsr. Con use_mmap=True las secciones numéricas son memoryviews sobre el fichero
+    mapeado (copy-on-write: se pueden escribir sin tocar el disco): abrir solo decodifica la cabecera,
+    la tabla de contenidos y la tabla de ids si es JSON, así que el coste no depende del número de aristas.
+    Con use_mmap=False, o si el orden de bytes del fichero no es el de la máquina, se copian a array.
+    Atributos: directed, weighted, n, m, ids, offsets, targets, weights (o None),
+    node_columns / edge_columns (nombre -> secuencia densa o dict fila -> valor) y extra.
+    close() (o salir del with) invalida las vistas: copiar lo que se necesite antes.
+    """
+
+    def __init__(self, path, use_mmap=True):
+        self._file = open(path, "rb")
+        self._mm = None
+        self._views = []
+        try:
+            head = self._file.read(_GCSR_HEADER.size)
+            if len(head) != _GCSR_HEADER.size:
+                raise ValueError("Not a GCSR graph file")
+            magic, version, flags, n, m, meta_offset, meta_len = _GCSR_HEADER.unpack(head)
+            if magic != GCSR_MAGIC:
+                raise ValueError("Not a GCSR graph file")
+            if version > GCSR_VERSION:
+                raise ValueError(f"Unsupported GCSR version {version}")
+            self._file.seek(meta_offset)
+            meta = json.loads(self._file.read(meta_len).decode("utf-8"))
+            self._swap = bool(flags & _GCSR_BIG_ENDIAN) != (sys.byteorder == "big")
+            if use_mmap and not self._swap:
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+            self.directed = bool(flags & _GCSR_DIRECTED)
+            self.weighted = bool(flags & _GCSR_WEIGHTED)
+            self.n, self.m = n, m
+            self.extra = meta.get("extra", {})
+            self.offsets = self._section('q', meta["offsets"])
+            self.targets = self._section('i', meta["targets"])
+            self.weights = self._section('d', meta["weights"]) if self.weighted else None
+            kind = meta["ids"]["kind"]
+            if kind == "range":
+                self.ids = range(n)
+            elif kind == "int":
+                self.ids = self._section('q', meta["ids"]["at"])
+            else:
+                self.ids = [_gcsr_key(u) for u in json.loads(self._raw(meta["ids"]["at"]).decode("utf-8"))]
+            self.node_columns = {name: self._column(c) for name, c in meta.get("node_columns", {}).items()}
+            self.edge_columns = {name: self._column(c) for name, c in meta.get("edge_columns", {}).items()}
+        except Exception:
+            self.close()
+            raise
+
+    def _raw(self, at):
+        self._file.seek(at[0])
+        return self._file.read(at[1])
+
+    def _section(self, code, at):
+        if self._mm is not None:
+            view = memoryview(self._mm)[at[0]:at[0] + at[1]].cast(code)
+            self._views.append(view)
+            return view
+        arr = array(code)
+        arr.frombytes(self._raw(at))
+        if self._swap:
+            arr.byteswap()
+        return arr
+
+    def _column(self, desc):
+        if desc["type"] == "json":
+            return {row: value for row, value in json.loads(self._raw(desc["at"]).decode("utf-8"))}
+        return self._section(desc["type"], desc["at"])
+
+    def rows(self):
+        """(nodo, vecinos, pesos o None) por fila, ya traducidos a node ids (para reconstruir dicts)."""
+        ids, off, tg, ws = self.ids, self.offsets, self.targets, self.weights
+        for i in range(self.n):
+            a, b = off[i], off[i + 1]
+            nbrs = [ids[t] for t in tg[a:b].tolist()]
+            yield ids[i], nbrs, (ws[a:b].tolist() if ws is not None else None)
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 class WeightedGraph:
     """
     Grafo ponderado que puede ser dirigido (directed=True) o no dirigido.
     Representación: adj: dict[node] -> list of (neighbor, weight)
     Nodos: cualquier hashable (int, str, ...)
+    Consultas s->t: dijkstra_to, bidirectional_dijkstra y astar (paran al asentar el destino).
     """ 
 
     def __init__(self, directed=False):
         self.adj = {}
         self.directed = directed 
+        self._radj = None  # adyacencia inversa cacheada (solo dirigido), se invalida al mutar
 
     # -------------------
     # CRUD NODOS
@@ -1089,6 +2064,7 @@ class WeightedGraph:
     def add_node(self, node):
         if node not in self.adj:
             self.adj[node] = [] 
+            self._radj = None
 
     def get_nodes(self):
         return list(self.adj.keys()) 
@@ -1096,6 +2072,7 @@ class WeightedGraph:
     def remove_node(self, node):
         if node not in self.adj:
             raise KeyError(f"Node {node} not found")
+        self._radj = None
         # eliminar aristas incidentes
         for u in list(self.adj.keys()):
             self.adj[u] = [(v,w) for (v,w) in self.adj[u] if v != node]
@@ -1108,6 +2085,7 @@ class WeightedGraph:
         """Añade arista u->v con peso. Si no dirigido, añade v->u con mismo peso."""
         self.add_node(u)
         self.add_node(v)
+        self._radj = None
         # actualizar si ya existe
         updated = False
         for i, (nei, w) in enumerate(self.adj[u]):
@@ -1163,6 +2141,7 @@ class WeightedGraph:
                 break
         if not found:
             raise KeyError(f"Edge {u}->{v} not found")
+        self._radj = None
         if not self.directed:
             # actualizar la otra dirección
             for i,(nei,w) in enumerate(self.adj[v]):
@@ -1173,13 +2152,43 @@ class WeightedGraph:
     def remove_edge(self, u, v):
         if u not in self.adj or v not in self.adj:
             raise KeyError("One or both nodes not found")
+        self._radj = None
         self.adj[u] = [(nei,w) for (nei,w) in self.adj[u] if nei != v]
         if not self.directed:
             self.adj[v] = [(nei,w) for (nei,w) in self.adj[v] if nei != u] 
 
+    # -------------------
+    # CARGA MASIVA (ver iter_edge_chunks / ingest_edges)
+    # -------------------
+    def load_edge_list(self, source, **options):
+        """Como add_edge pero por bloques (ver ingest_weighted_adj). Retorna el informe de ingest_edges más "nodes"."""
+        self._radj = None
+        return ingest_weighted_adj(self.adj, source, self.directed, **options)
+
     # -------------------
     # UTILIDADES
     # -------------------
+    def save(self, path):
+        """Guarda en formato binario .gcsr (ver write_gcsr): una fila CSR por nodo con (vecino, peso)."""
+        ids = list(self.adj)
+        index = {u: i for i, u in enumerate(ids)}
+        offsets, targets, weights = array('q', [0]), array('i'), array('d')
+        for u in ids:
+            for v, w in self.adj[u]:
+                targets.append(index[v])
+                weights.append(w)
+            offsets.append(len(targets))
+        return write_gcsr(path, ids, offsets, targets, weights, self.directed, extra={"class": "WeightedGraph"})
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """Reconstruye adj desde un .gcsr (pesos como float; sin pesos -> 1)."""
+        with GraphFile(path, use_mmap) as gf:
+            g = cls(directed=gf.directed)
+            for u, nbrs, ws in gf.rows():
+                g.adj[u] = list(zip(nbrs, ws)) if ws is not None else [(v, 1) for v in nbrs]
+        return g
+
     def __repr__(self):
         return f"WeightedGraph(directed={self.directed}, nodes={len(self.adj)}, edges={len(self.get_edges())})" 
 
@@ -1203,30 +2212,74 @@ class WeightedGraph:
     # -------------------
     # ALGORITMOS DE CAMINOS
     # -------------------
-    def dijkstra(self, start):
+    def dijkstra(self, start, queue=None):
         """
         Dijkstra: caminos mínimos desde start (requiere pesos >= 0).
         Retorna (dist, prev) dicts.
         Complejidad: O(E log V)
+        queue: cola de prioridad (None = heapq; ver make_queue).
         """
         if start not in self.adj:
             raise KeyError("Start node not found")
         dist = {u: float('inf') for u in self.adj}
         prev = {u: None for u in self.adj}
         dist[start] = 0
-        pq = [(0, start)]
+        pq = make_queue(queue)
+        pq.push(start, 0)
         while pq:
-            d,u = heapq.heappop(pq)
-            if d > dist[u]:
-                continue
+            d, u = pq.pop()
             for v,w in self.adj[u]:
                 nd = d + w
                 if nd < dist[v]:
                     dist[v] = nd
                     prev[v] = u
-                    heapq.heappush(pq, (nd, v))
+                    pq.push(v, nd)
         return dist, prev 
 
+    # -------------------
+    # CONSULTAS PUNTO A PUNTO (start -> goal): Dijkstra con parada temprana, bidireccional y A*
+    # Retornan (dist, path, settled): path=None si goal no es alcanzable; settled = nodos extraídos
+    # del heap, para comparar cuánto trabajo hace cada variante.
+    # -------------------
+    def dijkstra_to(self, start, goal, queue=None):
+        """
+        Dijkstra desde start que se detiene en cuanto goal queda asentado.
+        queue: cola de prioridad (None = heapq; ver make_queue).
+        """
+        return self.astar(start, goal, queue=queue)
+
+    def astar(self, start, goal, heuristic=None, queue=None):
+        """
+        A*: heuristic(u, goal) debe ser una cota inferior de la distancia u->goal (admisible)
+        para garantizar el óptimo. Sin heurística equivale a dijkstra_to.
+        queue: cola de prioridad (None = heapq; ver make_queue).
+        """
+        if start not in self.adj or goal not in self.adj:
+            raise KeyError("Start or goal node not found")
+        h = (lambda u: heuristic(u, goal)) if heuristic is not None else (lambda u: 0)
+        return astar_search(self.adj.__getitem__, start, goal, h, queue)
+
+    def bidirectional_dijkstra(self, start, goal, queue=None):
+        """
+        Dijkstra bidireccional: desde start sobre adj y desde goal sobre las aristas invertidas.
+        queue: cola de prioridad (None = heapq; ver make_queue).
+        """
+        if start not in self.adj or goal not in self.adj:
+            raise KeyError("Start or goal node not found")
+        return bidirectional_search(self.adj.__getitem__, self._reverse_adj().__getitem__, start, goal, queue)
+
+    def _reverse_adj(self):
+        """v -> [(u, w)] para cada arista u->v. En no dirigido es adj; en dirigido se cachea hasta mutar."""
+        if not self.directed:
+            return self.adj
+        if self._radj is None:
+            radj = {u: [] for u in self.adj}
+            for u in self.adj:
+                for v, w in self.adj[u]:
+                    radj[v].append((u, w))
+            self._radj = radj
+        return self._radj
+
     def bellman_ford(self, start):
         """
         Bellman-Ford: caminos mínimos con posibilidad de pesos negativos.
@@ -1307,64 +2360,42 @@ class WeightedGraph:
     # -------------------
     # MST (solo tiene sentido para grafos no dirigidos)
     # -------------------
-    class _DSU:
-        def __init__(self, items):
-            self.parent = {x:x for x in items}
-            self.rank = {x:0 for x in items}
-        def find(self,x):
-            if self.parent[x] != x:
-                self.parent[x] = self.find(self.parent[x])
-            return self.parent[x]
-        def union(self,a,b):
-            ra, rb = self.find(a), self.find(b)
-            if ra == rb:
-                return False
-            if self.rank[ra] < self.rank[rb]:
-                ra, rb = rb, ra
-            self.parent[rb] = ra
-            if self.rank[ra] == self.rank[rb]:
-                self.rank[ra] += 1
-            return True 
-
     def kruskal_mst(self):
         """Kruskal: devuelve (mst_edges, total_weight). Solo para grafos no dirigidos."""
         if self.directed:
             raise ValueError("Kruskal MST only for undirected graphs")
-        edges = self.get_edges()
-        edges_sorted = sorted(edges, key=lambda x: x[2])
-        dsu = WeightedGraph._DSU(self.get_nodes())
-        mst = []
-        total = 0
-        for u,v,w in edges_sorted:
-            if dsu.union(u,v):
-                mst.append((u,v,w))
-                total += w
+        mst = kruskal_edges(self.get_nodes(), self.get_edges())
+        total = sum(w for _, _, w in mst)
         return mst, total 
 
-    def prim_mst(self, start=None):
-        """Prim: devuelve (mst_edges, total_weight). Solo para grafos no dirigidos."""
+    def prim_mst(self, start=None, queue=None):
+        """
+        Prim: devuelve (mst_edges, total_weight). Solo para grafos no dirigidos.
+        queue: cola de prioridad (None = heapq; ver make_queue). "radix" no vale: las claves no son monótonas.
+        Con pesos empatados el orden de las aristas (y cuál de varios MST sale) puede no coincidir con el
+        desempate por (w, u, v) de la versión anterior con heapq de tuplas; el total no cambia.
+        """
         if self.directed:
             raise ValueError("Prim MST only for undirected graphs")
         if not self.adj:
             return [], 0
         if start is None:
             start = next(iter(self.adj))
-        visited = set([start])
-        pq = []
-        for v,w in self.adj[start]:
-            heapq.heappush(pq, (w, start, v))
+        visited = set()
+        parent = {start: None}
+        pq = make_queue(queue)
+        pq.push(start, 0)
         mst = []
         total = 0
-        while pq and len(visited) < len(self.adj):
-            w,u,v = heapq.heappop(pq)
-            if v in visited:
-                continue
+        while pq:
+            w,v = pq.pop()
             visited.add(v)
-            mst.append((u,v,w))
-            total += w
+            if parent[v] is not None:
+                mst.append((parent[v],v,w))
+                total += w
             for to,wt in self.adj[v]:
-                if to not in visited:
-                    heapq.heappush(pq, (wt, v, to))
+                if to not in visited and pq.push(to, wt):
+                    parent[to] = v
         return mst, total 
 
         # -------------------
@@ -1421,6 +2452,9 @@ if __name__ == "__main__":
     dist, prev = g.dijkstra("A")
     print("Dijkstra dist desde A:", dist)
     print("Camino A->D:", WeightedGraph.reconstruct_path(prev, "A", "D")) 
+    # consultas punto a punto: (dist, path, nodos asentados)
+    print("dijkstra_to A->D:", g.dijkstra_to("A", "D"))
+    print("bidireccional A->D:", g.bidirectional_dijkstra("A", "D"))
 
     # Bellman-Ford (soporta negativos)
     g2 = WeightedGraph(directed=True)
@@ -1443,6 +2477,31 @@ if __name__ == "__main__":
     mst, total = g3.kruskal_mst()
     print("MST (Kruskal):", mst, "total:", total)
 
+    # Guardar / cargar en binario (.gcsr)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "g3.gcsr")
+        size = g3.save(path)
+        g4 = WeightedGraph.load(path)
+        print(f"save/load .gcsr ({size} bytes):", g4, g4.get_edges() == g3.get_edges())
+
+    # Carga masiva desde una lista de aristas (CSV con cabecera) frente a add_edge arista a arista
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "edges.csv")
+        edges = [(i % 200, (i * 104_729 + i // 200 * 7919) % 200, i % 9 + 1) for i in range(1000)]
+        with open(path, "w") as f:
+            f.write("src,dst,w\n")
+            f.writelines(f"{u},{v},{w}\n" for u, v, w in edges)
+        g5 = WeightedGraph(directed=True)
+        report = g5.load_edge_list(path, skip_header=True)
+        print("load_edge_list:", report["edges_read"], "leídas,", report["edges_added"], "nuevas,", report["nodes"], "nodos")
+        g6 = WeightedGraph(directed=True)
+        with open(path) as f:
+            next(f)
+            for line in f:  # lo mismo línea a línea con add_edge
+                a, b, w = line.split(",")
+                g6.add_edge(int(a), int(b), float(w))
+        print("línea a línea + add_edge, mismo grafo:", g6.adj == g5.adj)
+
 
 
 
@@ -1531,6 +2590,33 @@ class UnweightedGraph:
             if u in self.adj[v]:
                 self.adj[v].remove(u) 
 
+    # -------------------
+    # CARGA MASIVA (ver iter_edge_chunks / ingest_edges)
+    # -------------------
+    def load_edge_list(self, source, **options):
+        """Como add_edge pero por bloques; los pesos de source se ignoran. Retorna el informe de ingest_edges más "nodes"."""
+        adj, directed = self.adj, self.directed
+
+        def consume(chunk):
+            added = 0
+            for u, v, _ in chunk_edges(chunk):
+                nu = adj.get(u)
+                if nu is None:
+                    nu = adj[u] = set()
+                nv = adj.get(v)
+                if nv is None:
+                    nv = adj[v] = set()
+                if v not in nu:
+                    added += 1
+                    nu.add(v)
+                if not directed:
+                    nv.add(u)
+            return added
+
+        report = ingest_edges(source, consume, **options)
+        report["nodes"] = len(adj)
+        return report
+
     # -------------------
     # ALGORITMOS
     # -------------------
@@ -1622,50 +2708,14 @@ class UnweightedGraph:
 
     def has_cycle(self):
         """
-        Detectar ciclo.
-        - Si no dirigido: DFS con parent-check.
-        - Si dirigido: DFS con rec_stack (detección clásica).
+        Detectar ciclo (DFS iterativo).
+        - Si no dirigido: parent-check (has_cycle_undirected).
+        - Si dirigido: colores blanco/gris/negro (has_cycle_directed).
         Retorna True si hay ciclo.
         """
-        visited = set() 
-
         if not self.directed:
-            def dfs(u, parent):
-                visited.add(u)
-                for v in self.adj[u]:
-                    if v == parent:
-                        continue
-                    if v in visited:
-                        return True
-                    if dfs(v, u):
-                        return True
-                return False 
-
-            for node in self.adj:
-                if node not in visited:
-                    if dfs(node, None):
-                        return True
-            return False 
-
-        else:
-            rec_stack = set()
-            def dfs_dir(u):
-                visited.add(u)
-                rec_stack.add(u)
-                for v in self.adj[u]:
-                    if v not in visited:
-                        if dfs_dir(v):
-                            return True
-                    elif v in rec_stack:
-                        return True
-                rec_stack.remove(u)
-                return False 
-
-            for node in self.adj:
-                if node not in visited:
-                    if dfs_dir(node):
-                        return True
-            return False 
+            return has_cycle_undirected(self.adj, self.adj.__getitem__)
+        return has_cycle_directed(self.adj, self.adj.__getitem__) 
 
     def is_bipartite(self):
         """
@@ -1691,34 +2741,8 @@ class UnweightedGraph:
         return True, color 
 
     # -------------------
-    # UTILIDADES: DSU (Union-Find) - útil para componentes y detectar ciclos por aristas
+    # UTILIDADES (para union-find usa el DSU del módulo)
     # -------------------
-    class _DSU:
-        def __init__(self):
-            self.parent = {}
-            self.rank = {} 
-
-        def make_set(self, x):
-            if x not in self.parent:
-                self.parent[x] = x
-                self.rank[x] = 0 
-
-        def find(self, x):
-            if self.parent[x] != x:
-                self.parent[x] = self.find(self.parent[x])
-            return self.parent[x] 
-
-        def union(self, x, y):
-            rx, ry = self.find(x), self.find(y)
-            if rx == ry:
-                return False
-            if self.rank[rx] < self.rank[ry]:
-                rx, ry = ry, rx
-            self.parent[ry] = rx
-            if self.rank[rx] == self.rank[ry]:
-                self.rank[rx] += 1
-            return True 
-
     def is_tree(self):
         """
         Comprueba si el grafo no dirigido es un árbol:
@@ -1783,6 +2807,11 @@ if __name__ == "__main__":
     g.remove_node("E")
     print("Nodos tras remover E:", g.get_nodes())
 
+    # Carga masiva desde una lista de aristas (los pesos se ignoran)
+    h = UnweightedGraph()
+    report = h.load_edge_list([("A", "B"), ("B", "C", 4), ("B", "A")])
+    print("load_edge_list:", h.get_edges(), report["edges_added"], "nuevas de", report["edges_read"])
+
 
 
 
@@ -2028,62 +3057,38 @@ class ConnectedGraph:
         path.reverse()
         return path 
 
-    def dijkstra(self, start):
-        """Dijkstra: distancias y prev (usa weights). Complejidad O(E log V)."""
+    def dijkstra(self, start, queue=None):
+        """
+        Dijkstra: distancias y prev (usa weights). Complejidad O(E log V).
+        queue: cola de prioridad (None = heapq; ver make_queue).
+        """
         if start not in self.adj:
             raise KeyError("Start node not found")
         dist = {u: float('inf') for u in self.adj}
         prev = {u: None for u in self.adj}
         dist[start] = 0
-        pq = [(0, start)]
+        pq = make_queue(queue)
+        pq.push(start, 0)
         while pq:
-            d, u = heapq.heappop(pq)
-            if d > dist[u]:
-                continue
+            d, u = pq.pop()
             for v, w in self.adj[u].items():
                 nd = d + w
                 if nd < dist[v]:
                     dist[v] = nd
                     prev[v] = u
-                    heapq.heappush(pq, (nd, v))
+                    pq.push(v, nd)
         return dist, prev 
 
     # -------------------
     # MST: Kruskal (solo si el grafo es conexo y hay pesos)
     # -------------------
-    class _DSU:
-        def __init__(self, items):
-            self.parent = {x: x for x in items}
-            self.rank = {x: 0 for x in items}
-        def find(self, x):
-            if self.parent[x] != x:
-                self.parent[x] = self.find(self.parent[x])
-            return self.parent[x]
-        def union(self, a, b):
-            ra, rb = self.find(a), self.find(b)
-            if ra == rb:
-                return False
-            if self.rank[ra] < self.rank[rb]:
-                ra, rb = rb, ra
-            self.parent[rb] = ra
-            if self.rank[ra] == self.rank[rb]:
-                self.rank[ra] += 1
-            return True 
-
     def kruskal_mst(self):
         """
         Kruskal: devuelve (mst_edges, total_weight).
         Requiere que graph sea conectado para que MST cubra todos los nodos.
         """
-        edges = self.get_edges()
-        edges_sorted = sorted(edges, key=lambda x: x[2])
-        dsu = ConnectedGraph._DSU(self.get_nodes())
-        mst = []
-        total = 0
-        for u, v, w in edges_sorted:
-            if dsu.union(u, v):
-                mst.append((u, v, w))
-                total += w
+        mst = kruskal_edges(self.get_nodes(), self.get_edges())
+        total = sum(w for _, _, w in mst)
         return mst, total 
 
     # -------------------
@@ -2357,24 +3362,26 @@ class CompleteGraph:
         path.reverse()
         return path 
 
-    def dijkstra(self, start):
-        """Dijkstra usando pesos; en grafo completo directo será la arista si existe."""
+    def dijkstra(self, start, queue=None):
+        """
+        Dijkstra usando pesos; en grafo completo directo será la arista si existe.
+        queue: cola de prioridad (None = heapq; ver make_queue).
+        """
         if start not in self.nodes:
             raise KeyError("Start node not found")
         dist = {u: float('inf') for u in self.nodes}
         prev = {u: None for u in self.nodes}
         dist[start] = 0
-        pq = [(0, start)]
+        pq = make_queue(queue)
+        pq.push(start, 0)
         while pq:
-            d, u = heapq.heappop(pq)
-            if d > dist[u]:
-                continue
+            d, u = pq.pop()
             for v, w in self.adj[u].items():
                 nd = d + w
                 if nd < dist[v]:
                     dist[v] = nd
                     prev[v] = u
-                    heapq.heappush(pq, (nd, v))
+                    pq.push(v, nd)
         return dist, prev 
 
     def any_spanning_tree(self):
@@ -2589,46 +3596,13 @@ class CyclicGraph:
     # -------------------
     def has_cycle(self):
         """
-        Detecta si existe al menos un ciclo.
-        - Si directed: DFS con rec_stack
-        - Si undirected: DFS con parent-check
+        Detecta si existe al menos un ciclo (DFS iterativo).
+        - Si directed: colores (has_cycle_directed)
+        - Si undirected: parent-check (has_cycle_undirected)
         """
-        visited = set()
-
         if self.directed:
-            rec_stack = set()
-            def dfs(u):
-                visited.add(u)
-                rec_stack.add(u)
-                for v in self.adj[u]:
-                    if v not in visited:
-                        if dfs(v):
-                            return True
-                    elif v in rec_stack:
-                        return True
-                rec_stack.remove(u)
-                return False
-            for node in self.adj:
-                if node not in visited:
-                    if dfs(node):
-                        return True
-            return False
-        else:
-            def dfs(u, parent):
-                visited.add(u)
-                for v in self.adj[u]:
-                    if v == parent:
-                        continue
-                    if v in visited:
-                        return True
-                    if dfs(v, u):
-                        return True
-                return False
-            for node in self.adj:
-                if node not in visited:
-                    if dfs(node, None):
-                        return True
-            return False
+            return has_cycle_directed(self.adj, self.adj.__getitem__)
+        return has_cycle_undirected(self.adj, self.adj.__getitem__)
 
     def find_one_cycle(self):
         """
@@ -1,20 +1,913 @@
 #Grafo acíclico
 # acyclic_graph.py
 from collections import deque, defaultdict
+import heapq
+from itertools import islice, repeat
 import math
-from typing import Any, Dict, List, Tuple, Optional, Set
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Set
+
+# -------------------------
+# DFS ITERATIVO (sin recursión): SCC de Pearce, ciclos, orden topológico y preorden.
+# Todas reciben nodes (iterable) y succ(u) -> iterable de vecinos; cada nodo guarda en una pila
+# explícita su iterador de vecinos, así la profundidad no depende del límite de recursión.
+# -------------------------
+def scc_pearce(nodes: Iterable[Any], succ: Callable[[Any], Iterable[Any]]) -> List[List[Any]]:
+    """
+    Componentes fuertemente conexas con el algoritmo de Pearce (variante de Tarjan con un solo
+    índice por nodo, sin lowlink aparte ni marca de pila y sin grafo transpuesto). O(V + E).
+    Las componentes salen en orden topológico del grafo condensado (fuentes primero), como Kosaraju.
+    """
+    nodes = list(nodes)
+    rindex: Dict[Any, int] = {}
+    index = 1
+    c = 2 * len(nodes)  # ids de componentes cerradas: siempre mayores que cualquier índice activo
+    stack: List[Any] = []
+    comps: List[List[Any]] = []
+    for s in nodes:
+        if s in rindex:
+            continue
+        rindex[s] = index
+        index += 1
+        frames = [[s, iter(succ(s)), True]]  # (nodo, vecinos pendientes, es raíz)
+        while frames:
+            fr = frames[-1]
+            v = fr[0]
+            rv = rindex[v]
+            for w in fr[1]:
+                rw = rindex.get(w)
+                if rw is None:
+                    rindex[w] = index
+                    index += 1
+                    frames.append([w, iter(succ(w)), True])
+                    break
+                if rw < rv:
+                    rindex[v] = rv = rw
+                    fr[2] = False
+            else:
+                frames.pop()
+                if fr[2]:
+                    index -= 1
+                    comp = [v]
+                    while stack and rv <= rindex[stack[-1]]:
+                        w = stack.pop()
+                        rindex[w] = c
+                        index -= 1
+                        comp.append(w)
+                    rindex[v] = c
+                    c -= 1
+                    comps.append(comp)
+                else:
+                    stack.append(v)
+                if frames:
+                    parent = frames[-1]
+                    if rindex[v] < rindex[parent[0]]:
+                        rindex[parent[0]] = rindex[v]
+                        parent[2] = False
+    comps.reverse()
+    return comps
+
+
+def has_cycle_directed(nodes: Iterable[Any], succ: Callable[[Any], Iterable[Any]]) -> bool:
+    """Ciclo dirigido: DFS con colores (1 = en la pila, 2 = terminado). O(V + E)."""
+    color: Dict[Any, int] = {}
+    for s in nodes:
+        if s in color:
+            continue
+        color[s] = 1
+        frames = [(s, iter(succ(s)))]
+        while frames:
+            v, it = frames[-1]
+            for w in it:
+                cw = color.get(w)
+                if cw is None:
+                    color[w] = 1
+                    frames.append((w, iter(succ(w))))
+                    break
+                if cw == 1:
+                    return True
+            else:
+                frames.pop()
+                color[v] = 2
+    return False
+
+
+def has_cycle_undirected(nodes: Iterable[Any], succ: Callable[[Any], Iterable[Any]]) -> bool:
+    """Ciclo no dirigido: DFS que ignora las aristas hacia el padre. O(V + E)."""
+    visited: Set[Any] = set()
+    for s in nodes:
+        if s in visited:
+            continue
+        visited.add(s)
+        frames = [(s, None, iter(succ(s)))]
+        while frames:
+            v, p, it = frames[-1]
+            for w in it:
+                if w == p:
+                    continue
+                if w in visited:
+                    return True
+                visited.add(w)
+                frames.append((w, v, iter(succ(w))))
+                break
+            else:
+                frames.pop()
+    return False
+
+
+def topological_order_dfs(nodes: Iterable[Any], succ: Callable[[Any], Iterable[Any]]) -> List[Any]:
+    """Orden topológico por post-orden DFS invertido. Lanza ValueError si hay ciclo."""
+    color: Dict[Any, int] = {}
+    order: List[Any] = []
+    for s in nodes:
+        if s in color:
+            continue
+        color[s] = 1
+        frames = [(s, iter(succ(s)))]
+        while frames:
+            v, it = frames[-1]
+            for w in it:
+                cw = color.get(w)
+                if cw is None:
+                    color[w] = 1
+                    frames.append((w, iter(succ(w))))
+                    break
+                if cw == 1:
+                    raise ValueError("Graph has a cycle; topological sort not possible")
+            else:
+                frames.pop()
+                color[v] = 2
+                order.append(v)
+    order.reverse()
+    return order
+
+
+def dfs_preorder(start: Any, succ: Callable[[Any], Iterable[Any]], visited: Optional[Set[Any]] = None) -> List[Any]:
+    """Pre-orden DFS desde start (mismo orden que la versión recursiva). visited se actualiza."""
+    if visited is None:
+        visited = set()
+    visited.add(start)
+    order = [start]
+    frames = [iter(succ(start))]
+    while frames:
+        for w in frames[-1]:
+            if w not in visited:
+                visited.add(w)
+                order.append(w)
+                frames.append(iter(succ(w)))
+                break
+        else:
+            frames.pop()
+    return order
+
+
+# -------------------------
+# CARGA MASIVA DE LISTAS DE ARISTAS: CSV/TSV ("u<sep>v[<sep>peso]") o cualquier iterador, por bloques.
+# Un bloque es (us, vs, ws): columnas de origen, destino y peso (ws=None si ninguna arista trae peso).
+# Los ficheros se leen por trozos de texto y cada trozo se parte de una sola vez (split sobre todo el bloque)
+# en vez de línea a línea; AcyclicGraph y SparseGraph vuelcan los bloques en su adyacencia (load_edge_list)
+# sin pasar por add_edge.
+# -------------------------
+def _node_key(tok: str, numeric_ids: bool) -> Any:
+    tok = tok.strip()
+    if numeric_ids:
+        try:
+            return int(tok)
+        except ValueError:
+            pass
+    return tok
+
+def _intern_column(col: List[Any], names: Dict[Any, Any], convert: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """Sustituye cada id por el objeto canónico de names (convert(token) la primera vez que aparece)."""
+    if convert is None:
+        return list(map(names.setdefault, col, col))
+    for t in set(col).difference(names):
+        names[t] = convert(t)
+    return list(map(names.__getitem__, col))
+
+def _split_block(text: str, sep: Optional[str], width: int) -> Optional[List[List[str]]]:
+    """
+    Columnas de un trozo de líneas completas si todas tienen width campos y no hay comentarios; si no, None.
+    Cada fin de línea queda como un token marcador: el trozo es regular si los marcadores caen justo cada
+    width campos (una cuenta sobre el total no basta: una línea de 2 y otra de 4 suman lo mismo que dos de 3).
+    """
+    if "#" in text or "\0" in text:
+        return None
+    if not text.endswith("\n"):
+        text += "\n"
+    rows = text.count("\n")
+    if sep is None:
+        toks = text.replace("\n", " \0 ").split()
+        mark = "\0"
+    else:
+        toks = text.replace("\n", sep + "\n" + sep).split(sep)
+        toks.pop()
+        mark = "\n"
+    if len(toks) != rows * (width + 1) or toks[width::width + 1].count(mark) != rows:
+        return None
+    return [toks[i::width + 1] for i in range(min(width, 3))]
+
+def _split_lines(text: str, sep: Optional[str]) -> List[List[Optional[str]]]:
+    """Camino lento para trozos con comentarios, líneas vacías o número de campos variable."""
+    us: List[Optional[str]] = []
+    vs: List[Optional[str]] = []
+    ws: List[Optional[str]] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] == "#":
+            continue
+        parts = line.split(sep)
+        if len(parts) < 2:
+            raise ValueError(f"Malformed edge line: {line!r}")
+        us.append(parts[0])
+        vs.append(parts[1])
+        ws.append(parts[2] if len(parts) > 2 else None)
+    return [us, vs, ws]
+
+def iter_edge_chunks(source: Any, delimiter: Optional[str] = None, chunk_size: int = 100_000,
+                     numeric_ids: bool = True, skip_header: bool = False,
+                     intern_ids: bool = True) -> Iterator[Tuple[List[Any], List[Any], Optional[List[Optional[float]]]]]:
+    """
+    Emite bloques (us, vs, ws) de unas chunk_size aristas; en ws, None = arista sin peso.
+    source: ruta a un fichero de texto (líneas vacías o que empiezan por '#' se ignoran; si delimiter es None
+    se usa tabulador, coma o espacios según la primera línea) o cualquier iterable de tuplas (u, v[, w]).
+    En ficheros, con numeric_ids los tokens que int() acepta se convierten a int, y los ids se internan:
+    cada id distinto se crea una sola vez y todas sus aristas comparten el objeto (menos memoria en la
+    adyacencia). intern_ids=False lo omite para ids enteros, a cambio de más memoria y menos tiempo.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        it = iter(source)
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                return
+            ws = [t[2] if len(t) > 2 else None for t in chunk] if any(len(t) > 2 for t in chunk) else None
+            yield [t[0] for t in chunk], [t[1] for t in chunk], ws
+    names: Dict[str, Any] = {}
+    ints: Dict[int, int] = {}
+
+    def ids(col: List[str]) -> List[Any]:
+        if numeric_ids:
+            try:
+                keys = list(map(int, col))
+            except ValueError:
+                return _intern_column(col, names, lambda t: _node_key(t, True))
+            return _intern_column(keys, ints) if intern_ids else keys
+        return _intern_column(col, names, str.strip)
+
+    sep, width = delimiter, 0
+    block = chunk_size * 16  # ~bytes por línea "u<sep>v<sep>peso"
+    rest = ""
+    with open(source, "r", encoding="utf-8") as f:
+        if skip_header:
+            f.readline()
+        while True:
+            data = f.read(block)
+            text = rest + data
+            if data:
+                cut = text.rfind("\n") + 1
+                if cut == 0:
+                    rest = text
+                    continue
+                text, rest = text[:cut], text[cut:]
+            else:
+                rest = ""
+            if not text:
+                return
+            if not width:
+                first = next((s for s in map(str.strip, text.splitlines()) if s and s[0] != "#"), None)
+                if first is None:
+                    if not data:
+                        return
+                    continue
+                if delimiter is None:
+                    sep = "\t" if "\t" in first else ("," if "," in first else None)
+                width = len(first.split(sep))
+            cols = _split_block(text, sep, width) if width >= 2 else None
+            if cols is None:
+                cols = _split_lines(text, sep)
+            us, vs = cols[0], cols[1]
+            if us:
+                if len(cols) < 3:
+                    ws = None
+                elif None in cols[2]:
+                    ws = [None if x is None else float(x) for x in cols[2]]
+                    if all(x is None for x in ws):
+                        ws = None
+                else:
+                    ws = list(map(float, cols[2]))
+                yield ids(us), ids(vs), ws
+            if not data:
+                return
+
+def chunk_edges(chunk: Tuple[List[Any], List[Any], Optional[List[Optional[float]]]]) -> Iterator[Tuple[Any, Any, Optional[float]]]:
+    """Recorre un bloque arista a arista: (u, v, w) con w=None si no trae peso."""
+    us, vs, ws = chunk
+    return zip(us, vs, ws if ws is not None else repeat(None))
+
+def ingest_edges(source: Any, consume: Callable[[Tuple[List[Any], List[Any], Any]], int],
+                 measure_memory: bool = False, **options: Any) -> Dict[str, Any]:
+    """
+    Pasa cada bloque de iter_edge_chunks(source, **options) a consume(bloque), que lo vuelca en la adyacencia
+    y devuelve cuántas aristas añadió (el resto eran paralelas y la clase las fusiona).
+    Retorna el informe {edges_read, edges_added, seconds, edges_per_sec, peak_mb}. Con measure_memory,
+    peak_mb es el pico de memoria reservada durante la carga (tracemalloc, que la ralentiza); si no, o si
+    ya había una traza de tracemalloc abierta (no se mezclan los picos), None.
+    """
+    trace = measure_memory and not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    read = added = 0
+    try:
+        for chunk in iter_edge_chunks(source, **options):
+            read += len(chunk[0])
+            added += consume(chunk)
+        dt = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] / 1e6 if trace else None
+    finally:
+        if trace:
+            tracemalloc.stop()
+    return {"edges_read": read, "edges_added": added, "seconds": dt,
+            "edges_per_sec": read / dt if dt > 0 else 0.0, "peak_mb": peak}
+
+
+# -------------------------
+# COLAS DE PRIORIDAD INTERCAMBIABLES (parámetro queue= de Dijkstra / A* / Prim)
+# Protocolo común: push(item, prioridad) inserta o baja la prioridad (True si cambió), pop() -> (prioridad,
+# item) del mínimo, peek() sin extraer, len(). Cada item está a lo sumo una vez: los bucles no necesitan
+# saltar entradas obsoletas. Las colas indexadas solo comparan prioridades (items de tipos mixtos sin problema);
+# "heapq" desempata por item, como el heap de tuplas de siempre.
+#   "heapq"     heapq con entradas duplicadas (por defecto, el comportamiento de siempre; el heap crece a O(E))
+#   "binary"    heap binario indexado con decrease-key real (el heap no pasa de V entradas)
+#   "4ary"      igual con 4 hijos por nodo: menos niveles al subir claves, útil con muchos decrease-key
+#   "radix"     radix heap monótono: prioridades enteras que nunca bajan del último mínimo extraído
+#               (Dijkstra/A* consistente con pesos enteros; no sirve para Prim)
+#   "fibonacci" FibonacciHeap: decrease-key O(1) amortizado, constantes altas en Python
+# -------------------------
+class LazyHeap:
+    """heapq con duplicados: push añade (prioridad, item) si mejora; pop salta las entradas obsoletas."""
+
+    def __init__(self):
+        self._heap: List[Tuple[Any, Any]] = []
+        self._best: Dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._best)
+
+    def push(self, item: Any, priority: Any) -> bool:
+        best = self._best.get(item)
+        if best is not None and best <= priority:
+            return False
+        self._best[item] = priority
+        heapq.heappush(self._heap, (priority, item))
+        return True
+
+    def _prune(self) -> None:
+        heap, best = self._heap, self._best
+        while heap[0][0] != best.get(heap[0][1]):
+            heapq.heappop(heap)
+
+    def peek(self) -> Tuple[Any, Any]:
+        self._prune()
+        return self._heap[0]
+
+    def pop(self) -> Tuple[Any, Any]:
+        self._prune()
+        priority, item = heapq.heappop(self._heap)
+        del self._best[item]
+        return priority, item
+
+class IndexedHeap:
+    """Heap d-ario indexado (item -> posición): decrease-key sube el item en su sitio, sin duplicados."""
+
+    def __init__(self, d: int = 2):
+        if d < 2:
+            raise ValueError("Heap arity must be >= 2")
+        self.d = d
+        self._prio: List[Any] = []
+        self._items: List[Any] = []
+        self._pos: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._pos
+
+    def push(self, item: Any, priority: Any) -> bool:
+        i = self._pos.get(item)
+        if i is None:
+            i = len(self._items)
+            self._prio.append(priority)
+            self._items.append(item)
+        elif priority >= self._prio[i]:
+            return False
+        self._sift_up(i, item, priority)
+        return True
+
+    def peek(self) -> Tuple[Any, Any]:
+        return self._prio[0], self._items[0]
+
+    def pop(self) -> Tuple[Any, Any]:
+        top = self._prio[0], self._items[0]
+        del self._pos[top[1]]
+        priority, item = self._prio.pop(), self._items.pop()
+        if self._items:
+            self._sift_down(0, item, priority)
+        return top
+
+    def _sift_up(self, i: int, item: Any, priority: Any) -> None:
+        prio, items, pos, d = self._prio, self._items, self._pos, self.d
+        while i > 0:
+            p = (i - 1) // d
+            if prio[p] <= priority:
+                break
+            prio[i] = prio[p]
+            items[i] = items[p]
+            pos[items[i]] = i
+            i = p
+        prio[i] = priority
+        items[i] = item
+        pos[item] = i
+
+    def _sift_down(self, i: int, item: Any, priority: Any) -> None:
+        prio, items, pos, d = self._prio, self._items, self._pos, self.d
+        n = len(items)
+        while True:
+            c = d * i + 1
+            if c >= n:
+                break
+            m, mp = c, prio[c]
+            for j in range(c + 1, min(c + d, n)):
+                if prio[j] < mp:
+                    m, mp = j, prio[j]
+            if mp >= priority:
+                break
+            prio[i] = mp
+            items[i] = items[m]
+            pos[items[i]] = i
+            i = m
+        prio[i] = priority
+        items[i] = item
+        pos[item] = i
+
+class RadixHeap:
+    """
+    Radix heap monótono: el cubo i guarda los items cuya prioridad difiere del último mínimo extraído
+    en el bit i-1 como más alto. Un item se redistribuye solo hacia cubos menores, así que cada uno
+    se mueve O(log C) veces (C = mayor prioridad). Exige prioridades enteras (se aceptan floats con
+    valor entero) >= último mínimo extraído; si no, ValueError.
+    """
+
+    def __init__(self):
+        self._last = 0
+        self._buckets: List[Dict[Any, Tuple[int, Any]]] = [{}]
+        self._where: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def push(self, item: Any, priority: Any) -> bool:
+        key = int(priority)
+        if key != priority or key < self._last:
+            raise ValueError("Radix heap needs integer priorities not below the last extracted minimum")
+        b = self._where.get(item)
+        if b is not None:
+            if key >= self._buckets[b][item][0]:
+                return False
+            del self._buckets[b][item]
+        b = (key ^ self._last).bit_length()
+        while len(self._buckets) <= b:
+            self._buckets.append({})
+        self._buckets[b][item] = (key, priority)
+        self._where[item] = b
+        return True
+
+    def _refill(self) -> None:
+        """Si el cubo 0 está vacío, toma el primer cubo no vacío y reparte sus items respecto a su mínimo."""
+        buckets = self._buckets
+        if buckets[0]:
+            return
+        i = 1
+        while not buckets[i]:
+            i += 1
+        moved, buckets[i] = buckets[i], {}
+        last = self._last = min(k for k, _ in moved.values())
+        where = self._where
+        for item, entry in moved.items():
+            b = (entry[0] ^ last).bit_length()
+            buckets[b][item] = entry
+            where[item] = b
+
+    def peek(self) -> Tuple[Any, Any]:
+        self._refill()
+        item, (_, priority) = next(iter(self._buckets[0].items()))
+        return priority, item
+
+    def pop(self) -> Tuple[Any, Any]:
+        self._refill()
+        item, (_, priority) = self._buckets[0].popitem()
+        del self._where[item]
+        return priority, item
+
+class FibNode:
+    __slots__ = ("key", "value", "degree", "mark", "parent", "child", "left", "right")
+
+    def __init__(self, key: Any, value: Any = None):
+        self.key = key
+        self.value = value
+        self.degree = 0
+        self.mark = False
+        self.parent: Optional['FibNode'] = None
+        self.child: Optional['FibNode'] = None
+        self.left: 'FibNode' = self
+        self.right: 'FibNode' = self
+
+class FibonacciHeap:
+    """FibonacciHeap de arbol-2.py (insert / decrease_key / extract_min_node con consolidate y cortes en cascada)."""
+
+    def __init__(self):
+        self.min: Optional[FibNode] = None
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def insert(self, key: Any, value: Any = None) -> FibNode:
+        node = FibNode(key, value)
+        if self.min is None:
+            self.min = node
+        else:
+            self._splice(self.min, node)
+            if key < self.min.key:
+                self.min = node
+        self.count += 1
+        return node
+
+    def decrease_key(self, node: FibNode, new_key: Any) -> None:
+        if new_key > node.key:
+            raise ValueError("La nueva clave debe ser menor")
+        node.key = new_key
+        parent = node.parent
+        if parent is not None and node.key < parent.key:
+            self._cut(node, parent)
+            self._cascading_cut(parent)
+        if node.key < self.min.key:
+            self.min = node
+
+    def extract_min_node(self) -> Optional[FibNode]:
+        z = self.min
+        if z is None:
+            return None
+        if z.child is not None:
+            for c in list(self._iterate(z.child)):
+                c.parent = None
+                c.mark = False
+                self._splice(z, c)
+            z.child = None
+        if z.right is z:
+            self.min = None
+        else:
+            self.min = z.right
+            self._remove_from_list(z)
+            self._consolidate()
+        z.left = z.right = z
+        self.count -= 1
+        return z
+
+    @staticmethod
+    def _iterate(head: FibNode) -> Iterator[FibNode]:
+        node = head
+        while True:
+            yield node
+            node = node.right
+            if node is head:
+                break
+
+    @staticmethod
+    def _splice(anchor: FibNode, node: FibNode) -> None:
+        node.left = anchor
+        node.right = anchor.right
+        anchor.right.left = node
+        anchor.right = node
+
+    @staticmethod
+    def _remove_from_list(node: FibNode) -> None:
+        node.left.right = node.right
+        node.right.left = node.left
+
+    def _link(self, y: FibNode, x: FibNode) -> None:
+        self._remove_from_list(y)
+        y.parent = x
+        y.mark = False
+        if x.child is None:
+            y.left = y.right = y
+            x.child = y
+        else:
+            self._splice(x.child, y)
+        x.degree += 1
+
+    def _consolidate(self) -> None:
+        by_degree: Dict[int, FibNode] = {}
+        for x in list(self._iterate(self.min)):
+            d = x.degree
+            while d in by_degree:
+                y = by_degree.pop(d)
+                if y.key < x.key:
+                    x, y = y, x
+                self._link(y, x)
+                d += 1
+            by_degree[d] = x
+        self.min = None
+        for x in by_degree.values():
+            if self.min is None:
+                x.left = x.right = x
+                self.min = x
+            else:
+                self._splice(self.min, x)
+                if x.key < self.min.key:
+                    self.min = x
+
+    def _cut(self, x: FibNode, y: FibNode) -> None:
+        if x.right is x:
+            y.child = None
+        else:
+            if y.child is x:
+                y.child = x.right
+            self._remove_from_list(x)
+        y.degree -= 1
+        x.parent = None
+        x.mark = False
+        self._splice(self.min, x)
+
+    def _cascading_cut(self, y: FibNode) -> None:
+        while y.parent is not None:
+            if not y.mark:
+                y.mark = True
+                return
+            z = y.parent
+            self._cut(y, z)
+            y = z
+
+class FibonacciQueue:
+    """Adapta FibonacciHeap al protocolo de colas: item -> nodo para decrease_key."""
+
+    def __init__(self):
+        self._heap = FibonacciHeap()
+        self._nodes: Dict[Any, FibNode] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def push(self, item: Any, priority: Any) -> bool:
+        node = self._nodes.get(item)
+        if node is None:
+            self._nodes[item] = self._heap.insert(priority, item)
+            return True
+        if priority < node.key:
+            self._heap.decrease_key(node, priority)
+            return True
+        return False
+
+    def peek(self) -> Tuple[Any, Any]:
+        return self._heap.min.key, self._heap.min.value
+
+    def pop(self) -> Tuple[Any, Any]:
+        node = self._heap.extract_min_node()
+        del self._nodes[node.value]
+        return node.key, node.value
+
+PRIORITY_QUEUES: Dict[str, Callable[[], Any]] = {
+    "heapq": LazyHeap,
+    "binary": IndexedHeap,
+    "4ary": lambda: IndexedHeap(4),
+    "radix": RadixHeap,
+    "fibonacci": FibonacciQueue,
+}
+
+def make_queue(queue: Any = None) -> Any:
+    """queue: None (heapq), un nombre de PRIORITY_QUEUES o una clase/fábrica sin argumentos con el mismo protocolo."""
+    if queue is None:
+        return LazyHeap()
+    if isinstance(queue, str):
+        try:
+            return PRIORITY_QUEUES[queue]()
+        except KeyError:
+            raise ValueError(f"Unknown priority queue {queue!r}; expected one of {sorted(PRIORITY_QUEUES)}") from None
+    return queue()
+
+
+# -------------------------
+# BÚSQUEDAS PUNTO A PUNTO (A* y Dijkstra bidireccional), compartidas por las clases de abajo.
+# Devuelven (dist, path, settled): path=None si goal no es alcanzable; settled = nodos extraídos.
+# -------------------------
+def astar_search(out: Callable[[Any], Iterable[Tuple[Any, float]]], start: Any, goal: Any,
+                 h: Callable[[Any], float], queue: Any = None) -> Tuple[float, Optional[List[Any]], int]:
+    """
+    A* genérico: out(u) -> iterable de (v, peso); h(u) cota inferior de la distancia u->goal
+    (h = 0 es Dijkstra con parada temprana). queue: ver make_queue.
+    """
+    dist = {start: 0.0}
+    prev: Dict[Any, Optional[Any]] = {start: None}
+    pq = make_queue(queue)
+    pq.push(start, h(start))
+    settled = 0
+    while pq:
+        _, u = pq.pop()
+        d = dist[u]
+        settled += 1
+        if u == goal:
+            path = []
+            while u is not None:
+                path.append(u)
+                u = prev[u]
+            return d, path[::-1], settled
+        for v, w in out(u):
+            nd = d + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                prev[v] = u
+                pq.push(v, nd + h(v))
+    return float('inf'), None, settled
+
+def bidirectional_search(out: Callable[[Any], Iterable[Tuple[Any, float]]],
+                         inc: Callable[[Any], Iterable[Tuple[Any, float]]],
+                         start: Any, goal: Any, queue: Any = None) -> Tuple[float, Optional[List[Any]], int]:
+    """
+    Alterna el lado con menor clave en el heap; mu = mejor camino visto al tocar un nodo
+    alcanzado por la otra búsqueda. Para cuando top_adelante + top_atrás >= mu.
+    inc(u): aristas entrantes (la búsqueda desde goal).
+    """
+    if start == goal:
+        return 0.0, [start], 1
+    dist = ({start: 0.0}, {goal: 0.0})
+    prev: Tuple[Dict[Any, Optional[Any]], Dict[Any, Optional[Any]]] = ({start: None}, {goal: None})
+    pqs = (make_queue(queue), make_queue(queue))
+    pqs[0].push(start, 0.0)
+    pqs[1].push(goal, 0.0)
+    nbrs = (out, inc)
+    best, meet, settled = float('inf'), None, 0
+    while pqs[0] and pqs[1]:
+        top = (pqs[0].peek()[0], pqs[1].peek()[0])
+        if top[0] + top[1] >= best:
+            break
+        side = 0 if top[0] <= top[1] else 1
+        d, u = pqs[side].pop()
+        mine, other = dist[side], dist[1 - side]
+        settled += 1
+        for v, w in nbrs[side](u):
+            nd = d + w
+            if nd < mine.get(v, float('inf')):
+                mine[v] = nd
+                prev[side][v] = u
+                pqs[side].push(v, nd)
+            if v in other and mine[v] + other[v] < best:
+                best = mine[v] + other[v]
+                meet = v
+    if meet is None:
+        return float('inf'), None, settled
+    path = []
+    u = meet
+    while u is not None:
+        path.append(u)
+        u = prev[0][u]
+    path.reverse()
+    u = prev[1][meet]
+    while u is not None:
+        path.append(u)
+        u = prev[1][u]
+    return best, path, settled
+
+
+# -------------------------
+# UNION-FIND (DSU) Y KRUSKAL SOBRE ARRAYS, compartidos por MultiGraph, PlanarGraph y SparseGraph.
+# -------------------------
+class DSU:
+    """
+    Union-find sobre enteros 0..n-1 con arrays planos: find iterativo con path halving, union por
+    tamaño y union_many por lotes (sin recursión ni diccionarios). Para nodos arbitrarios, relabel
+    a enteros antes (ver kruskal_edges).
+    """
+
+    def __init__(self, n: int = 0):
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.count = n  # número de conjuntos disjuntos
+
+    def add(self) -> int:
+        """Nuevo conjunto unitario; devuelve su id."""
+        x = len(self.parent)
+        self.parent.append(x)
+        self.size.append(1)
+        self.count += 1
+        return x
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        size = self.size
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        size[ra] += size[rb]
+        self.count -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def union_many(self, us, vs, limit: Optional[int] = None) -> List[int]:
+        """
+        Une us[i]-vs[i] en orden (secuencias o array.array paralelos) con find y union en línea.
+        Devuelve las posiciones i que unieron dos conjuntos; para tras `limit` uniones.
+        """
+        parent, size = self.parent, self.size
+        taken: List[int] = []
+        if limit is not None and limit <= 0:
+            return taken
+        for i in range(len(us)):
+            x = us[i]
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            y = vs[i]
+            while parent[y] != y:
+                parent[y] = parent[parent[y]]
+                y = parent[y]
+            if x == y:
+                continue
+            if size[x] < size[y]:
+                x, y = y, x
+            parent[y] = x
+            size[x] += size[y]
+            taken.append(i)
+            if len(taken) == limit:
+                break
+        self.count -= len(taken)
+        return taken
+
+
+def kruskal_arrays(n: int, us, vs, ws=None, presorted: bool = False) -> List[int]:
+    """
+    Kruskal sobre arrays paralelos de aristas (us[i], vs[i], ws[i]) con nodos 0..n-1.
+    presorted=True: las aristas ya vienen ordenadas por peso y ws no se usa (no se ordena ni copia).
+    Devuelve las posiciones de las aristas del bosque de expansión mínimo, en orden de peso.
+    """
+    dsu = DSU(n)
+    if presorted:
+        return dsu.union_many(us, vs, n - 1)
+    order = sorted(range(len(us)), key=ws.__getitem__)
+    taken = dsu.union_many([us[i] for i in order], [vs[i] for i in order], n - 1)
+    return [order[i] for i in taken]
+
+
+def kruskal_edges(nodes: Iterable[Any], edges: List[Tuple], presorted: bool = False) -> List[Tuple]:
+    """
+    Kruskal para nodos hashables: edges son tuplas (u, v, w, ...) y se devuelven las elegidas.
+    Relabel a enteros y kruskal_arrays; orden estable entre pesos iguales.
+    """
+    index = {u: i for i, u in enumerate(nodes)}
+    us = [index[e[0]] for e in edges]
+    vs = [index[e[1]] for e in edges]
+    ws = None if presorted else [e[2] for e in edges]
+    return [edges[i] for i in kruskal_arrays(len(index), us, vs, ws, presorted)]
+
 
 class AcyclicGraph:
     """
     Grafo dirigido pensado para trabajar con DAGs.
     - self.adj: dict[node] -> dict[neighbor] = weight (weight opcional; por defecto 1)
     - Si enforce_acyclic=True, add_edge comprobará si la nueva arista crea un ciclo y rechazará la inserción.
+      La comprobación es incremental (Pearce–Kelly): se mantiene un orden topológico ord[] y al insertar
+      u->v con ord[u] > ord[v] solo se exploran los nodos con ord entre ord[v] y ord[u], que se reordenan.
+      topological_sort_kahn devuelve ese orden cacheado. enforce_acyclic se fija al construir el grafo.
     Nodos: cualquier hashable (int, str, ...).
     """
 
+    _HOLE = object()  # hueco en _pos tras remove_node
+
     def __init__(self, enforce_acyclic: bool = True):
         self.adj: Dict[Any, Dict[Any, float]] = {}
         self.enforce_acyclic = enforce_acyclic
+        self._pred: Dict[Any, Set[Any]] = {}  # aristas entrantes (búsqueda hacia atrás / borrado O(grado))
+        # orden topológico incremental (solo con enforce_acyclic): ord[u] = posición, _pos[i] = nodo
+        self._ord: Optional[Dict[Any, int]] = {} if enforce_acyclic else None
+        self._pos: List[Any] = []
+        self._holes = 0
+        self._topo: Optional[List[Any]] = None  # caché de topological_sort_kahn
 
     # -------------------
     # CRUD: NODOS
@@ -23,6 +916,13 @@ class AcyclicGraph:
         """Crear/asegurar existencia del nodo."""
         if u not in self.adj:
             self.adj[u] = {}
+            self._pred[u] = set()
+            if self._ord is not None:
+                # un nodo nuevo no tiene aristas: puede ir al final del orden
+                self._ord[u] = len(self._pos)
+                self._pos.append(u)
+                if self._topo is not None:
+                    self._topo.append(u)
 
     def get_nodes(self) -> List[Any]:
         return list(self.adj.keys())
@@ -31,11 +931,21 @@ class AcyclicGraph:
         """Eliminar nodo y todas las aristas entrantes/ salientes hacia/desde u."""
         if u not in self.adj:
             raise KeyError(f"Node {u} not found")
-        # eliminar aristas entrantes
-        for v in list(self.adj.keys()):
-            self.adj[v].pop(u, None)
+        # eliminar aristas entrantes (solo los predecesores) y salientes
+        for v in self._pred.pop(u):
+            if v != u:
+                self.adj[v].pop(u, None)
+        for v in self.adj[u]:
+            if v != u:
+                self._pred[v].discard(u)
         # eliminar nodo
         del self.adj[u]
+        if self._ord is not None:
+            self._pos[self._ord.pop(u)] = self._HOLE
+            self._holes += 1
+            self._topo = None
+            if self._holes * 2 > len(self._pos):
+                self._compact_order()
 
     # -------------------
     # CRUD: ARISTAS
@@ -47,20 +957,11 @@ class AcyclicGraph:
         """
         self.add_node(u)
         self.add_node(v)
-        # provisional: insertar y comprobar ciclo si es requerido
-        if self.enforce_acyclic:
-            # insertar temporalmente
-            prev = self.adj[u].get(v, None)
-            self.adj[u][v] = weight
-            if self.has_cycle():
-                # revertir
-                if prev is None:
-                    del self.adj[u][v]
-                else:
-                    self.adj[u][v] = prev
-                raise ValueError(f"Adding edge {u} -> {v} would create a cycle (operation rejected).")
-        else:
-            self.adj[u][v] = weight
+        if self._ord is not None and v not in self.adj[u]:
+            # repara el orden solo en la región afectada; lanza ValueError sin modificar nada si hay ciclo
+            self._pk_insert(u, v)
+        self.adj[u][v] = weight
+        self._pred[v].add(u)
 
     def get_edges(self) -> List[Tuple[Any, Any, float]]:
         """Lista de aristas (u, v, weight)."""
@@ -77,7 +978,8 @@ class AcyclicGraph:
         """Eliminar arista u->v."""
         if u not in self.adj:
             raise KeyError(f"Node {u} not found")
-        self.adj[u].pop(v, None)
+        if self.adj[u].pop(v, None) is not None:
+            self._pred[v].discard(u)
 
     def update_edge_weight(self, u: Any, v: Any, new_weight: float) -> None:
         """Actualizar peso de arista u->v (lanza KeyError si no existe)."""
@@ -86,34 +988,161 @@ class AcyclicGraph:
         self.adj[u][v] = new_weight
 
     # -------------------
-    # Detección de ciclos (DFS)
+    # Carga masiva (ver iter_edge_chunks / ingest_edges)
     # -------------------
-    def has_cycle(self) -> bool:
+    def load_edge_list(self, source: Any, **options: Any) -> Dict[str, Any]:
         """
-        Detecta si hay ciclo en el grafo dirigido (DFS con recursion stack).
-        Complejidad: O(V + E).
+        Vuelca los bloques en adj/_pred sin comprobar ciclos arista a arista (sin peso -> 1; aristas repetidas:
+        gana el último peso, como add_edge). Con enforce_acyclic la comprobación se hace una sola vez al final
+        con un DFS O(V + E) que también recalcula el orden topológico; si hay ciclo (o falla la lectura) se
+        deshace la carga entera y se lanza ValueError. Retorna el informe de ingest_edges más "nodes".
         """
-        visited: Set[Any] = set()
-        rec_stack: Set[Any] = set()
+        adj, pred = self.adj, self._pred
+        enforce = self._ord is not None
+        new_nodes: List[Any] = []
+        new_edges: List[Tuple[Any, Any]] = []
+        old_weights: Dict[Tuple[Any, Any], float] = {}
+
+        def consume(chunk: Tuple[List[Any], List[Any], Any]) -> int:
+            added = 0
+            for u, v, w in chunk_edges(chunk):
+                nu = adj.get(u)
+                if nu is None:
+                    nu = adj[u] = {}
+                    pred[u] = set()
+                    new_nodes.append(u)
+                if v not in adj:
+                    adj[v] = {}
+                    pred[v] = set()
+                    new_nodes.append(v)
+                if v in nu:
+                    if enforce:
+                        old_weights.setdefault((u, v), nu[v])
+                else:
+                    added += 1
+                    pred[v].add(u)
+                    if enforce:
+                        new_edges.append((u, v))
+                nu[v] = 1.0 if w is None else w
+            return added
+
+        if not enforce:
+            report = ingest_edges(source, consume, **options)
+        else:
+            try:
+                report = ingest_edges(source, consume, **options)
+            except Exception:
+                self._undo_load(new_nodes, new_edges, old_weights)
+                raise
+            if new_edges:
+                try:
+                    order = topological_order_dfs(adj, adj.__getitem__)
+                except ValueError:
+                    self._undo_load(new_nodes, new_edges, old_weights)
+                    raise ValueError("Loaded edges would create a cycle (load rolled back).") from None
+                self._pos = order
+                self._ord = {x: i for i, x in enumerate(order)}
+                self._holes = 0
+                self._topo = None
+        report["nodes"] = len(adj)
+        return report
+
+    def _undo_load(self, new_nodes: List[Any], new_edges: List[Tuple[Any, Any]],
+                   old_weights: Dict[Tuple[Any, Any], float]) -> None:
+        """Deshace una carga de load_edge_list: pesos anteriores, aristas nuevas y después nodos nuevos."""
+        for (u, v), w in old_weights.items():
+            self.adj[u][v] = w
+        for u, v in new_edges:
+            del self.adj[u][v]
+            self._pred[v].discard(u)
+        for x in new_nodes:
+            del self.adj[x]
+            del self._pred[x]
 
-        def dfs(u: Any) -> bool:
-            visited.add(u)
-            rec_stack.add(u)
-            for v in self.adj[u]:
-                if v not in visited:
-                    if dfs(v):
-                        return True
-                elif v in rec_stack:
-                    return True
-            rec_stack.remove(u)
+    # -------------------
+    # Orden topológico incremental (Pearce–Kelly)
+    # -------------------
+    def _pk_insert(self, u: Any, v: Any) -> None:
+        """
+        Mantiene ord[] al insertar u->v. Si ord[u] < ord[v] no hay nada que hacer. Si no, se buscan
+        delta_f = alcanzables desde v con ord < ord[u] (si aparece u hay ciclo) y delta_b = nodos que
+        alcanzan u con ord > ord[v]; se reasignan sus mismas posiciones poniendo delta_b antes que delta_f.
+        """
+        ord_ = self._ord
+        lb, ub = ord_[v], ord_[u]
+        if lb > ub:
+            return
+        if u == v:
+            raise ValueError(f"Adding edge {u} -> {v} would create a cycle (operation rejected).")
+        delta_f, seen, stack = [], {v}, [v]
+        while stack:
+            x = stack.pop()
+            delta_f.append(x)
+            for y in self.adj[x]:
+                oy = ord_[y]
+                if oy == ub:
+                    raise ValueError(f"Adding edge {u} -> {v} would create a cycle (operation rejected).")
+                if oy < ub and y not in seen:
+                    seen.add(y)
+                    stack.append(y)
+        delta_b, seen, stack = [], {u}, [u]
+        while stack:
+            x = stack.pop()
+            delta_b.append(x)
+            for y in self._pred[x]:
+                if ord_[y] > lb and y not in seen:
+                    seen.add(y)
+                    stack.append(y)
+        delta_b.sort(key=ord_.__getitem__)
+        delta_f.sort(key=ord_.__getitem__)
+        moved = delta_b + delta_f
+        for x, i in zip(moved, sorted(ord_[x] for x in moved)):
+            ord_[x] = i
+            self._pos[i] = x
+        self._topo = None
+
+    def _compact_order(self) -> None:
+        self._pos = [x for x in self._pos if x is not self._HOLE]
+        self._ord = {x: i for i, x in enumerate(self._pos)}
+        self._holes = 0
+
+    def would_create_cycle(self, u: Any, v: Any) -> bool:
+        """
+        ¿Crearía ciclo la arista u->v? Con orden mantenido: falso directo si ord[u] < ord[v]; si no, DFS
+        desde v limitada a ord <= ord[u]. Sin orden (enforce_acyclic=False) equivale a has_path(v, u).
+        """
+        if u == v:
+            return True
+        if u not in self.adj or v not in self.adj:
             return False
-
-        for node in self.adj:
-            if node not in visited:
-                if dfs(node):
+        if self._ord is None:
+            return self.has_path(v, u)
+        ub = self._ord[u]
+        if ub < self._ord[v]:
+            return False
+        seen, stack = {v}, [v]
+        while stack:
+            for y in self.adj[stack.pop()]:
+                if y == u:
                     return True
+                if self._ord[y] < ub and y not in seen:
+                    seen.add(y)
+                    stack.append(y)
         return False
 
+    # -------------------
+    # Detección de ciclos (DFS)
+    # -------------------
+    def has_cycle(self) -> bool:
+        """
+        Detecta si hay ciclo en el grafo dirigido (DFS iterativo con colores, ver has_cycle_directed).
+        Con enforce_acyclic el invariante lo garantiza y no se recorre el grafo.
+        Complejidad: O(V + E).
+        """
+        if self._ord is not None:
+            return False
+        return has_cycle_directed(self.adj, self.adj.__getitem__)
+
     # -------------------
     # Topological Sort
     # -------------------
@@ -121,8 +1150,12 @@ class AcyclicGraph:
         """
         Orden topológico con Kahn (BFS sobre indegrees).
         Lanza ValueError si el grafo tiene ciclo.
-        Complejidad: O(V + E).
+        Complejidad: O(V + E). Con enforce_acyclic devuelve (copia de) el orden incremental cacheado.
         """
+        if self._ord is not None:
+            if self._topo is None:
+                self._topo = [x for x in self._pos if x is not self._HOLE]
+            return list(self._topo)
         indeg: Dict[Any, int] = {u: 0 for u in self.adj}
         for u in self.adj:
             for v in self.adj[u]:
@@ -143,29 +1176,10 @@ class AcyclicGraph:
 
     def topological_sort_dfs(self) -> List[Any]:
         """
-        Orden topológico usando DFS (post-order reversed).
+        Orden topológico usando DFS iterativo (post-order reversed).
         Lanza ValueError si hay ciclo.
         """
-        visited: Set[Any] = set()
-        temp: Set[Any] = set()
-        order: List[Any] = []
-
-        def dfs(u: Any):
-            if u in temp:
-                raise ValueError("Graph has a cycle; topological sort not possible")
-            if u not in visited:
-                temp.add(u)
-                for v in self.adj[u]:
-                    dfs(v)
-                temp.remove(u)
-                visited.add(u)
-                order.append(u)
-
-        for node in self.adj:
-            if node not in visited:
-                dfs(node)
-        order.reverse()
-        return order
+        return topological_order_dfs(self.adj, self.adj.__getitem__)
 
     # -------------------
     # Caminos en DAG (O(V + E))
@@ -299,6 +1313,33 @@ if __name__ == "__main__":
     # Comprobar existencia de camino
     print("¿Existe camino B -> C?", g.has_path("B", "C"))
     print("¿Existe camino C -> E?", g.has_path("C", "E"))
+    print("¿E -> B crearía ciclo?", g.would_create_cycle("E", "B"))
+
+    # Carga incremental de un DAG grande (aristas en orden aleatorio): cada inserción solo repara
+    # la región afectada del orden topológico en vez de recorrer el grafo completo
+    rng = random.Random(1)
+    n_nodes = 20000
+    rank = list(range(n_nodes)); rng.shuffle(rank)
+    big = AcyclicGraph(enforce_acyclic=True)
+    dag_edges = []
+    t0 = time.perf_counter()
+    for _ in range(100000):
+        a, b = rng.randrange(n_nodes), rng.randrange(n_nodes)
+        if rank[a] < rank[b]:
+            big.add_edge(a, b)
+            dag_edges.append((a, b))
+    print("DAG de %d aristas cargado en %.2fs; orden cacheado: %d nodos" % (
+        len(big.get_edges()), time.perf_counter() - t0, len(big.topological_sort_kahn())))
+
+    # Carga masiva de las mismas aristas: una sola comprobación de ciclos al final en vez de una por arista
+    bulk = AcyclicGraph(enforce_acyclic=True)
+    report = bulk.load_edge_list(dag_edges)
+    print("load_edge_list: %d aristas en %.2fs (%.0f aristas/s), mismo grafo: %s" % (
+        report["edges_added"], report["seconds"], report["edges_per_sec"], bulk.adj == big.adj))
+    try:
+        g.load_edge_list([("E", "F"), ("F", "G"), ("G", "A")])  # cierra el ciclo A -> ... -> G -> A
+    except ValueError as e:
+        print("Carga rechazada:", e, "| nodos:", g.get_nodes())
 
 
 
@@ -313,15 +1354,221 @@ if __name__ == "__main__":
 
 #Árbol 
 # tree_graph.py
+from array import array
 from collections import deque, defaultdict
 import math
-from typing import Dict, List, Optional, Tuple, Set
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Set
+
+INF = float('inf')
+
+class SegmentTree:
+    """
+    Segment tree iterativo (bottom-up) sobre posiciones 0..n-1 para una operación asociativa y
+    conmutativa con elemento neutro. update O(log n), query del rango [l, r) O(log n).
+    """
+
+    OPS: Dict[str, Tuple[Callable, float]] = {
+        "sum": (lambda a, b: a + b, 0),
+        "min": (min, INF),
+        "max": (max, -INF),
+    }
+
+    def __init__(self, values: List, op: str = "sum"):
+        if op not in self.OPS:
+            raise ValueError(f"Unknown op {op!r} (use one of {sorted(self.OPS)})")
+        self.op = op
+        self.fn, self.identity = self.OPS[op]
+        self.n = n = len(values)
+        self.data = [self.identity] * n + list(values)
+        fn, data = self.fn, self.data
+        for i in range(n - 1, 0, -1):
+            data[i] = fn(data[2 * i], data[2 * i + 1])
+
+    def update(self, i: int, value) -> None:
+        fn, data = self.fn, self.data
+        i += self.n
+        data[i] = value
+        i >>= 1
+        while i:
+            data[i] = fn(data[2 * i], data[2 * i + 1])
+            i >>= 1
+
+    def query(self, l: int, r: int):
+        fn, data = self.fn, self.data
+        res = self.identity
+        l += self.n
+        r += self.n
+        while l < r:
+            if l & 1:
+                res = fn(res, data[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                res = fn(res, data[r])
+            l >>= 1
+            r >>= 1
+        return res
+
+class TreeIndex:
+    """
+    Índice compacto de un árbol (o bosque) enraizado, para muchas consultas sobre árboles grandes.
+    - Relabel entero en preorden DFS: nodes[i] es el nodo con id i e ids[node] = i. En preorden un
+      ancestro siempre tiene id menor que sus descendientes y el subárbol de i es el rango
+      [i, i + size[i]).
+    - LCA O(1) por RMQ con sparse table sobre el recorrido: es la variante compacta del Euler tour
+      (n entradas en vez de 2n-1). Para ids a < b, lca = min(parent[a+1 .. b]): todos esos nodos están
+      en el subárbol del LCA y el hijo del LCA que contiene a b tiene parent == lca. Cada nivel de la
+      tabla es un min elemento a elemento. Memoria ~ 4 bytes * n * log2(n) (unos 80 MB para 1M nodos).
+    - Binary lifting plano: up[j] es un array('i') con el ancestro 2^j de cada id (la raíz apunta a sí misma).
+    """
+
+    def __init__(self, adj: Dict, root=None):
+        self.nodes: List = []
+        self.ids: Dict = {}
+        nodes, ids = self.nodes, self.ids
+        parent_of: Dict = {}
+        parent = array('i')
+        depth = array('i')
+        comp = array('i')
+        roots = ([root] if root is not None else []) + list(adj)
+        for r in roots:
+            if r in ids:
+                continue
+            rid = len(nodes)
+            parent_of[r] = rid
+            stack = [r]
+            while stack:
+                x = stack.pop()
+                xid = len(nodes)
+                ids[x] = xid
+                nodes.append(x)
+                p = parent_of[x]
+                parent.append(p)
+                depth.append(depth[p] + 1 if p != xid else 0)
+                comp.append(rid)
+                for w in adj[x]:
+                    if w not in ids:
+                        parent_of[w] = xid
+                        stack.append(w)
+        n = len(nodes)
+        size = array('i', [1]) * n
+        for i in range(n - 1, 0, -1):
+            p = parent[i]
+            if p != i:
+                size[p] += size[i]
+        self.parent, self.depth, self.comp, self.size = parent, depth, comp, size
+        # sparse table: sparse[k][i] = min(parent[i : i + 2^k])
+        self.sparse: List[array] = [parent]
+        h = 1
+        while 2 * h <= n:
+            prev = self.sparse[-1]
+            self.sparse.append(array('i', map(min, prev[:len(prev) - h], prev[h:])))
+            h *= 2
+        # binary lifting plano
+        self.up: List[array] = [parent]
+        max_depth = max(depth) if n else 0
+        for _ in range(1, max(1, max_depth.bit_length())):
+            prev = self.up[-1]
+            self.up.append(array('i', map(prev.__getitem__, prev)))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def lca_id(self, a: int, b: int) -> int:
+        """LCA entre ids (mismo componente). O(1)."""
+        if a == b:
+            return a
+        if a > b:
+            a, b = b, a
+        a += 1
+        k = (b - a + 1).bit_length() - 1
+        row = self.sparse[k]
+        x, y = row[a], row[b - (1 << k) + 1]
+        return x if x < y else y
+
+    def lca(self, u, v):
+        a, b = self.ids[u], self.ids[v]
+        if self.comp[a] != self.comp[b]:
+            return None
+        return self.nodes[self.lca_id(a, b)]
+
+    def lca_many(self, pairs: Iterable[Tuple]) -> List:
+        """LCA de cada par (u, v); None para pares en componentes distintos."""
+        ids, nodes, comp, sparse = self.ids, self.nodes, self.comp, self.sparse
+        res = []
+        append = res.append
+        for u, v in pairs:
+            a, b = ids[u], ids[v]
+            if comp[a] != comp[b]:
+                append(None)
+                continue
+            if a == b:
+                append(u)
+                continue
+            if a > b:
+                a, b = b, a
+            a += 1
+            k = (b - a + 1).bit_length() - 1
+            row = sparse[k]
+            x, y = row[a], row[b - (1 << k) + 1]
+            append(nodes[x if x < y else y])
+        return res
+
+    def kth_ancestor_id(self, a: int, k: int) -> int:
+        """Ancestro k-ésimo de un id, o -1 si k supera la profundidad."""
+        if k > self.depth[a]:
+            return -1
+        j = 0
+        while k:
+            if k & 1:
+                a = self.up[j][a]
+            k >>= 1
+            j += 1
+        return a
+
+    def kth_ancestor(self, v, k: int):
+        a = self.kth_ancestor_id(self.ids[v], k)
+        return None if a < 0 else self.nodes[a]
+
+    def is_ancestor(self, u, v) -> bool:
+        """True si u es ancestro de v (o u == v)."""
+        a, b = self.ids[u], self.ids[v]
+        return a <= b < a + self.size[a]
+
+    def path(self, u, v) -> Optional[List]:
+        a, b = self.ids[u], self.ids[v]
+        if self.comp[a] != self.comp[b]:
+            return None
+        c = self.lca_id(a, b)
+        parent, nodes = self.parent, self.nodes
+        left = []
+        while a != c:
+            left.append(nodes[a])
+            a = parent[a]
+        left.append(nodes[c])
+        right = []
+        while b != c:
+            right.append(nodes[b])
+            b = parent[b]
+        right.reverse()
+        return left + right
+
+    def subtree_size(self, v) -> int:
+        return self.size[self.ids[v]]
 
 class Tree:
     """
     Estructura para trabajar con árboles (no dirigidos, acíclicos y conexos).
     Representación interna: adj: dict[node] -> set(neighbors)
     Soporta 'rooted' operations (se elige una raíz y se hace preprocessing para LCA).
+    Para árboles grandes y muchas consultas, build_index() crea un TreeIndex (ids enteros, LCA O(1) por
+    RMQ sobre el recorrido DFS + sparse table, binary lifting en arrays) que lca, lca_many, path, kth_ancestor y
+    get_subtree_size usan mientras el árbol no se modifique.
+    Cada nodo puede tener un valor (values, 0 por defecto): preprocess() construye además una
+    heavy-light decomposition (HLD) con segment trees por posición para path_query / subtree_query
+    en O(log² n) / O(log n) y update_value en O(log n) por operación activa.
     """
 
     def __init__(self):
@@ -334,6 +1581,14 @@ class Tree:
         self.LOG: int = 0
         self.subtree_size: Dict = {}
         self._preprocessed = False
+        self._index: Optional[TreeIndex] = None
+        # valores por nodo + HLD (head de la cadena pesada y posición en el orden heavy-first)
+        self.values: Dict = {}
+        self.heavy: Dict = {}
+        self.head: Dict = {}
+        self.pos: Dict = {}
+        self._pos_order: List = []
+        self._seg_trees: Dict[str, SegmentTree] = {}
 
     # -------------------
     # CRUD: NODOS
@@ -343,6 +1598,7 @@ class Tree:
         if v not in self.adj:
             self.adj[v] = set()
             self._preprocessed = False
+            self._index = None
 
     def get_nodes(self):
         return list(self.adj.keys())
@@ -362,7 +1618,9 @@ class Tree:
         for nei in list(self.adj[v]):
             self.adj[nei].remove(v)
         del self.adj[v]
+        self.values.pop(v, None)
         self._preprocessed = False
+        self._index = None
 
     # -------------------
     # CRUD: ARISTAS
@@ -383,6 +1641,7 @@ class Tree:
         self.adj[u].add(v)
         self.adj[v].add(u)
         self._preprocessed = False
+        self._index = None
 
     def remove_edge(self, u, v):
         """
@@ -394,6 +1653,7 @@ class Tree:
         self.adj[u].discard(v)
         self.adj[v].discard(u)
         self._preprocessed = False
+        self._index = None
 
     def get_edges(self):
         """Devuelve lista de aristas (u, v) con u < v (por consistencia)."""
@@ -426,6 +1686,7 @@ class Tree:
             raise ValueError("Updating edge would create a cycle.")
         self.add_edge(nu, nv)
         self._preprocessed = False
+        self._index = None
 
     # -------------------
     # UTIL: comprobar si la estructura es un árbol (conexo y |E| = |V| - 1)
@@ -471,21 +1732,10 @@ class Tree:
         return order, dist
 
     def dfs(self, start, visited=None) -> List:
-        """DFS recursivo (devuelve orden pre-order)."""
+        """DFS iterativo (devuelve orden pre-order; vecinos en orden de str)."""
         if start not in self.adj:
             raise KeyError("Start node not in tree")
-        if visited is None:
-            visited = set()
-        res = []
-        def _dfs(u, p):
-            visited.add(u)
-            res.append(u)
-            for v in sorted(self.adj[u], key=lambda x: str(x)):
-                if v == p:
-                    continue
-                _dfs(v, u)
-        _dfs(start, None)
-        return res
+        return dfs_preorder(start, lambda u: sorted(self.adj[u], key=lambda x: str(x)), visited)
 
     # -------------------
     # PREPROCESS PARA ROOTED OPERATIONS (LCA, depths, subtree sizes)
@@ -502,11 +1752,14 @@ class Tree:
             self.parent0 = {}
             self.up = []
             self.subtree_size = {}
+            self._build_hld([])
             self._preprocessed = True
             return
 
         if root is None:
             root = next(iter(self.adj))
+        if self._index is not None and self._index.nodes[0] != root:
+            self._index = None  # el índice estaba enraizado en otro nodo
         self.root = root
         n = len(self.adj)
         self.LOG = math.ceil(math.log2(max(2, n)))
@@ -531,12 +1784,22 @@ class Tree:
                     self.parent0[v] = u
                     q.append(v)
 
-        # if disconnected, set unseen nodes as separate (depth None) but still include
-        for v in self.adj:
-            if v not in visited:
-                # treat as separate root
-                self.depth[v] = 0
-                self.parent0[v] = None
+        # if disconnected, cada componente no visitada se recorre desde su primer nodo como raíz propia
+        for r in self.adj:
+            if r not in visited:
+                self.depth[r] = 0
+                self.parent0[r] = None
+                visited.add(r)
+                q.append(r)
+                while q:
+                    u = q.popleft()
+                    order.append(u)
+                    for v in self.adj[u]:
+                        if v not in visited:
+                            visited.add(v)
+                            self.depth[v] = self.depth[u] + 1
+                            self.parent0[v] = u
+                            q.append(v)
 
         # fill up[0]
         for v in self.adj:
@@ -548,37 +1811,139 @@ class Tree:
                 mid = self.up[j-1].get(v, None)
                 self.up[j][v] = self.up[j-1].get(mid, None) if mid is not None else None
 
-        # compute subtree sizes via post-order DFS from each component root
-        self.subtree_size = {v: 0 for v in self.adj}
-        visited = set()
-        def dfs_size(u, p):
-            s = 1
-            visited.add(u)
-            for w in self.adj[u]:
-                if w == p:
-                    continue
-                if w not in visited:
-                    s += dfs_size(w, u)
-            self.subtree_size[u] = s
-            return s
-
-        for v in self.adj:
-            if self.parent0.get(v) is None and v not in visited:
-                dfs_size(v, None)
+        # subtree sizes: BFS order al revés (hijos antes que padres), sin recursión
+        self.subtree_size = {v: 1 for v in self.adj}
+        for v in reversed(order):
+            p = self.parent0[v]
+            if p is not None:
+                self.subtree_size[p] += self.subtree_size[v]
 
+        self._build_hld(order)
         self._preprocessed = True
 
+    def _build_hld(self, order: List) -> None:
+        """
+        Heavy-light decomposition sobre parent0/subtree_size (order = BFS con padres antes que hijos).
+        Posiciones en DFS visitando primero el hijo pesado: cada cadena pesada y cada subárbol
+        ocupan un rango contiguo de posiciones.
+        """
+        heavy = {v: None for v in order}
+        for v in order:
+            p = self.parent0[v]
+            if p is not None and (heavy[p] is None or self.subtree_size[v] > self.subtree_size[heavy[p]]):
+                heavy[p] = v
+        head, pos, pos_order = {}, {}, []
+        stack = [v for v in reversed(order) if self.parent0[v] is None]
+        while stack:
+            h = stack.pop()
+            x = h
+            while x is not None:
+                head[x] = h
+                pos[x] = len(pos_order)
+                pos_order.append(x)
+                p = self.parent0[x]
+                for w in self.adj[x]:
+                    if w != p and w != heavy[x]:
+                        stack.append(w)
+                x = heavy[x]
+        self.heavy, self.head, self.pos, self._pos_order = heavy, head, pos, pos_order
+        self._seg_trees = {}
 
+    # -------------------
+    # VALORES POR NODO + CONSULTAS DE CAMINO / SUBÁRBOL (HLD + segment tree)
+    # -------------------
+    def _segment_tree(self, op: str) -> SegmentTree:
+        if not self._preprocessed:
+            self.preprocess(self.root if self.root in self.adj else None)
+        seg = self._seg_trees.get(op)
+        if seg is None:
+            values = self.values
+            seg = SegmentTree([values.get(v, 0) for v in self._pos_order], op)
+            self._seg_trees[op] = seg
+        return seg
+
+    def update_value(self, v, x) -> None:
+        """Asigna el valor del nodo v (actualiza los segment trees ya construidos en O(log n))."""
+        if v not in self.adj:
+            raise KeyError("Node not found")
+        self.values[v] = x
+        if self._preprocessed:
+            i = self.pos[v]
+            for seg in self._seg_trees.values():
+                seg.update(i, x)
+
+    def path_query(self, u, v, op: str = "sum"):
+        """
+        Agregado (op = "sum" | "min" | "max") de los valores de los nodos del camino u..v (ambos incluidos).
+        O(log² n): O(log n) cadenas pesadas, una consulta de segment tree por cadena.
+        Devuelve None si u y v están en componentes distintas.
+        """
+        if u not in self.adj or v not in self.adj:
+            raise KeyError("Node(s) not found")
+        seg = self._segment_tree(op)
+        head, pos, depth, parent0 = self.head, self.pos, self.depth, self.parent0
+        fn, res = seg.fn, seg.identity
+        while head[u] != head[v]:
+            if depth[head[u]] < depth[head[v]]:
+                u, v = v, u
+            res = fn(res, seg.query(pos[head[u]], pos[u] + 1))
+            u = parent0[head[u]]
+            if u is None:
+                return None
+        lo, hi = (pos[u], pos[v]) if pos[u] <= pos[v] else (pos[v], pos[u])
+        return fn(res, seg.query(lo, hi + 1))
+
+    def subtree_query(self, v, op: str = "sum"):
+        """Agregado (op) de los valores del subárbol de v según la raíz actual (preprocess o build_index). O(log n)."""
+        if v not in self.adj:
+            raise KeyError("Node not found")
+        seg = self._segment_tree(op)
+        i = self.pos[v]
+        return seg.query(i, i + self.subtree_size[v])
+
+
+
+    # -------------------
+    # ÍNDICE COMPACTO (TreeIndex) para consultas masivas
+    # -------------------
+    def build_index(self, root=None) -> TreeIndex:
+        """
+        Construye (y guarda) un TreeIndex enraizado en root (por defecto self.root o el primer nodo).
+        Cualquier modificación del árbol lo descarta. O(n log n) tiempo y memoria.
+        Si ya había un preprocess() con otra raíz, se rehace con esta (depth, subtree_size y HLD
+        deben responder respecto a la misma raíz que el índice).
+        """
+        if root is None:
+            root = self.root
+        if root is not None and root not in self.adj:
+            raise KeyError("Root not found")
+        index = TreeIndex(self.adj, root)
+        if index.nodes:
+            if self._preprocessed and self.root != index.nodes[0]:
+                self.preprocess(index.nodes[0])
+            self.root = index.nodes[0]
+        self._index = index
+        return index
+
+    def lca_many(self, pairs: Iterable[Tuple]) -> List:
+        """LCA para un lote de pares (u, v) usando el índice (se construye si no existe)."""
+        index = self._index if self._index is not None else self.build_index()
+        try:
+            return index.lca_many(pairs)
+        except KeyError:
+            raise KeyError("Node(s) not found") from None
 
     # -------------------
     # LCA (Lowest Common Ancestor) - binary lifting
     # -------------------
     def lca(self, a, b):
-        """Devuelve Lowest Common Ancestor de a y b. Requiere preprocess() previo."""
-        if not self._preprocessed:
-            self.preprocess(self.root)
+        """Devuelve Lowest Common Ancestor de a y b. Requiere preprocess() previo (o build_index())."""
         if a not in self.adj or b not in self.adj:
             raise KeyError("Node(s) not found")
+        if self._index is not None:
+            return self._index.lca(a, b)
+        if not self._preprocessed:
+            self.preprocess(self.root)
         # si en componentes distintas, no hay LCA definido -> return None
         # We'll treat different roots: if parent0 chain doesn't reach same root, return None
         # But using depth values: if both have depth 0 but different roots, return None
@@ -616,10 +1981,12 @@ class Tree:
     # -------------------
     def kth_ancestor(self, v, k):
         """Devuelve el k-ésimo ancestro de v (k>=0), o None si no existe. Requiere preprocess."""
-        if not self._preprocessed:
-            self.preprocess(self.root)
         if v not in self.adj:
             raise KeyError("Node not found")
+        if self._index is not None:
+            return self._index.kth_ancestor(v, k)
+        if not self._preprocessed:
+            self.preprocess(self.root)
         cur = v
         j = 0
         while k and cur is not None:
@@ -636,6 +2003,8 @@ class Tree:
         """Devuelve la lista de nodos en el camino simple entre u y v, o None si no conectados."""
         if u not in self.adj or v not in self.adj:
             raise KeyError("Node(s) not found")
+        if self._index is not None:
+            return self._index.path(u, v)
         # usar LCA and reconstruct path
         if not self._preprocessed:
             self.preprocess(self.root)
@@ -727,6 +2096,10 @@ class Tree:
     # subtree size getter (requires preprocess)
     # -------------------
     def get_subtree_size(self, v) -> int:
+        if self._index is not None:
+            if v not in self.adj:
+                raise KeyError("Node not found")
+            return self._index.subtree_size(v)
         if not self._preprocessed:
             self.preprocess(self.root)
         if v not in self.subtree_size:
@@ -757,6 +2130,49 @@ class Tree:
     def __repr__(self):
         return f"Tree(nodes={len(self.adj)}, edges={len(self.get_edges())})"
 
+def random_tree(n: int, seed: int = 1) -> Tree:
+    """Árbol aleatorio de n nodos 0..n-1 (padre de v uniforme en 0..v-1), escrito directamente en adj:
+    add_edge comprueba ciclos con un BFS por arista."""
+    rng = random.Random(seed)
+    t = Tree()
+    t.adj = {0: set()}
+    for v in range(1, n):
+        p = rng.randrange(v)
+        t.adj[v] = {p}
+        t.adj[p].add(v)
+    return t
+
+def benchmark_tree(n: int = 200_000, queries: int = 200_000, hld_ops: int = 20_000, seed: int = 1) -> Dict[str, Any]:
+    """
+    Árbol aleatorio de n nodos: LCA con los dicts de preprocess() frente a TreeIndex (build_index + lca_many)
+    sobre las mismas parejas, y hld_ops operaciones HLD (75% path_query max, 25% update_value).
+    No lo llama el ejemplo de uso (tarda varios segundos).
+    """
+    rng = random.Random(seed)
+    big = random_tree(n, seed)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(queries)]
+    row: Dict[str, Any] = {"n": n, "queries": queries, "hld_ops": hld_ops}
+    t0 = time.perf_counter(); big.preprocess(root=0); t1 = time.perf_counter()
+    slow = [big.lca(u, v) for u, v in pairs]; t2 = time.perf_counter()
+    big.build_index(root=0); t3 = time.perf_counter()
+    fast = big.lca_many(pairs); t4 = time.perf_counter()
+    assert slow == fast
+    row.update(dict_prep_s=t1 - t0, dict_lca_s=t2 - t1, index_prep_s=t3 - t2, index_lca_s=t4 - t3)
+    print(f"Tree {n} nodos, {queries} LCA: dicts prep {t1 - t0:.2f}s + {t2 - t1:.2f}s | "
+          f"TreeIndex prep {t3 - t2:.2f}s + lca_many {t4 - t3:.2f}s")
+
+    big.values = {v: rng.randint(-100, 100) for v in range(n)}
+    ops = [(rng.randrange(n), rng.randrange(n)) for _ in range(hld_ops)]
+    t0 = time.perf_counter()
+    for i, (u, v) in enumerate(ops):
+        if i % 4 == 0:
+            big.update_value(u, v % 100)
+        else:
+            big.path_query(u, v, "max")
+    row["hld_s"] = time.perf_counter() - t0
+    print(f"HLD: {hld_ops} operaciones (75% path max, 25% updates) en {row['hld_s']:.2f}s")
+    return row
+
 #Ejemplo de uso (completo)
 if __name__ == "__main__":
     T = Tree()
@@ -813,6 +2229,26 @@ if __name__ == "__main__":
     except ValueError as e:
         print("Error (expected):", e)
 
+    # Índice compacto: LCA O(1) por RMQ (sparse table) y consultas en lote
+    T.build_index(root="A")
+    print("LCA(D, F) con índice:", T.lca("D", "F"), "| lca_many:", T.lca_many([("D", "E"), ("F", "C"), ("D", "D")]))
+
+    small = random_tree(300)  # LCA por dicts y por índice coinciden; tiempos en benchmark_tree()
+    rng = random.Random(1)
+    pairs = [(rng.randrange(300), rng.randrange(300)) for _ in range(300)]
+    small.preprocess(root=0)
+    slow = [small.lca(u, v) for u, v in pairs]
+    small.build_index(root=0)
+    print("Árbol aleatorio de 300 nodos, lca_many == lca:", small.lca_many(pairs) == slow)
+
+    # Valores por nodo: agregados de camino / subárbol con HLD + segment tree
+    for v, x in zip("ABCDEF", [5, 3, 8, 1, 4, 2]):
+        T.update_value(v, x)
+    print("Suma camino D -> F:", T.path_query("D", "F"), "| max:", T.path_query("D", "F", "max"))
+    print("Suma subárbol B:", T.subtree_query("B"), "| min subárbol A:", T.subtree_query("A", "min"))
+    T.update_value("A", 100)
+    print("Tras A=100, suma camino D -> F:", T.path_query("D", "F"))
+
 
 
 
@@ -838,7 +2274,7 @@ if __name__ == "__main__":
 #Multigrafo. Código — multigraph.py
 from collections import deque, defaultdict
 import heapq
-from typing import Any, Dict, List, Tuple, Optional, Set
+from typing import Any, Dict, Iterable, List, Tuple, Optional, Set
 
 class MultiGraph:
     """
@@ -995,23 +2431,22 @@ class MultiGraph:
     # -------------------
     # CAMINOS: Dijkstra y Bellman-Ford (considerando multiaristas naturalmente)
     # -------------------
-    def dijkstra(self, start: Any) -> Tuple[Dict[Any,float], Dict[Any,Optional[Any]]]:
+    def dijkstra(self, start: Any, queue: Any = None) -> Tuple[Dict[Any,float], Dict[Any,Optional[Any]]]:
         if start not in self.nodes:
             raise KeyError("Start node not found")
         dist = {u: float('inf') for u in self.nodes}
         prev = {u: None for u in self.nodes}
         dist[start] = 0.0
-        pq = [(0.0, start)]
+        pq = make_queue(queue)
+        pq.push(start, 0.0)
         while pq:
-            d,u = heapq.heappop(pq)
-            if d > dist[u]:
-                continue
+            d, u = pq.pop()
             for nei, eid, w, _ in self.adj[u]:
                 nd = d + w
                 if nd < dist[nei]:
                     dist[nei] = nd
                     prev[nei] = u
-                    heapq.heappush(pq, (nd, nei))
+                    pq.push(nei, nd)
         return dist, prev
 
     def bellman_ford(self, start: Any) -> Tuple[Dict[Any,float], Dict[Any,Optional[Any]]]:
@@ -1074,54 +2509,129 @@ class MultiGraph:
     # -------------------
     # MST (Kruskal) — solo para grafos no dirigidos
     # -------------------
-    class _DSU:
-        def __init__(self):
-            self.parent = {}
-            self.rank = {}
-        def make_set(self, x):
-            if x not in self.parent:
-                self.parent[x] = x
-                self.rank[x] = 0
-        def find(self, x):
-            if self.parent[x] != x:
-                self.parent[x] = self.find(self.parent[x])
-            return self.parent[x]
-        def union(self, a, b):
-            ra, rb = self.find(a), self.find(b)
-            if ra == rb:
-                return False
-            if self.rank[ra] < self.rank[rb]:
-                ra, rb = rb, ra
-            self.parent[rb] = ra
-            if self.rank[ra] == self.rank[rb]:
-                self.rank[ra] += 1
-            return True
-
     def kruskal_mst(self) -> Tuple[List[Tuple[int, Any, Any, float]], float]:
         """Devuelve (mst_edges list of (eid,u,v,w), total_weight). Solo para no dirigido."""
         if self.directed:
             raise ValueError("Kruskal MST applies only to undirected multigraphs")
-        # listar aristas (cada edge_id aparece una vez)
-        edge_items = [(eid, u, v, w, d) for eid, (u, v, w, d) in self.edges.items()]
-        # ordenar por peso
-        edge_items.sort(key=lambda x: x[3])
-        dsu = MultiGraph._DSU()
-        for node in self.nodes:
-            dsu.make_set(node)
-        mst = []
-        total = 0.0
-        for eid, u, v, w, d in edge_items:
-            if dsu.union(u, v):
-                mst.append((eid, u, v, w))
-                total += w
-            # si ya tenemos n-1 edges podemos parar
-            if len(mst) == len(self.nodes) - 1:
-                break
+        # cada edge_id aparece una vez; kruskal_edges espera (u, v, w, ...)
+        edge_items = [(u, v, w, eid) for eid, (u, v, w, _) in self.edges.items()]
+        mst = [(eid, u, v, w) for u, v, w, eid in kruskal_edges(self.nodes, edge_items)]
+        total = sum(w for _, _, _, w in mst)
         return mst, total
 
     # -------------------
     # EULERIAN: detectar y obtener circuito/recorrido de Euler (solo en no dirigido o dirigido según reglas)
     # -------------------
+    def _edge_arrays(self) -> Tuple[List[Any], Dict[Any, int], List[int], List[int], List[int]]:
+        """Relabel entero: (nodes, index, eids, tails, heads) con una posición por arista."""
+        nodes = list(self.nodes)
+        index = {u: i for i, u in enumerate(nodes)}
+        eids: List[int] = []
+        tails: List[int] = []
+        heads: List[int] = []
+        for eid, (u, v, _, _) in self.edges.items():
+            eids.append(eid)
+            tails.append(index[u])
+            heads.append(index[v])
+        return nodes, index, eids, tails, heads
+
+    def _incidence(self, n: int, tails: List[int], heads: List[int]) -> Tuple[List[int], List[int]]:
+        """
+        CSR de aristas salientes por nodo: inc[offsets[u]:offsets[u+1]] son posiciones de arista.
+        En no dirigido cada arista aparece en sus dos extremos (un lazo, dos veces en el mismo nodo).
+        """
+        counts = [0] * (n + 1)
+        for t in tails:
+            counts[t + 1] += 1
+        if not self.directed:
+            for h in heads:
+                counts[h + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        fill = counts[:-1]
+        inc = [0] * counts[n]
+        for e, t in enumerate(tails):
+            inc[fill[t]] = e
+            fill[t] += 1
+        if not self.directed:
+            for e, h in enumerate(heads):
+                inc[fill[h]] = e
+                fill[h] += 1
+        return counts, inc
+
+    def _edges_connected(self, n: int, tails: List[int], heads: List[int]) -> bool:
+        """Conectividad débil de los nodos con aristas: DSU.union_many y un solo conjunto entre ellos."""
+        touched = len(set(tails).union(heads))
+        return touched - len(DSU(n).union_many(tails, heads)) <= 1
+
+    def _euler_start(self, n: int, tails: List[int], heads: List[int]) -> Tuple[Optional[int], str]:
+        """
+        Comprueba las condiciones de grado y conectividad débil sobre los arrays.
+        Devuelve (nodo inicial o None si no hay recorrido, "circuit"/"trail"/"").
+        """
+        out_deg = [0] * n
+        in_deg = [0] * n
+        for t in tails:
+            out_deg[t] += 1
+        for h in heads:
+            in_deg[h] += 1
+        if not tails:
+            return None, "circuit"  # sin aristas: circuito vacío
+        if not self._edges_connected(n, tails, heads):
+            return None, ""
+        start = tails[0]
+        if not self.directed:
+            odd = [u for u in range(n) if (out_deg[u] + in_deg[u]) % 2]
+            if not odd:
+                return start, "circuit"
+            if len(odd) == 2:
+                return odd[0], "trail"
+            return None, ""
+        starts = []
+        for u in range(n):
+            diff = out_deg[u] - in_deg[u]
+            if diff == 1:
+                starts.append(u)
+            elif diff != 0 and diff != -1:
+                return None, ""
+        if not starts:
+            return start, "circuit"
+        if len(starts) == 1:
+            return starts[0], "trail"
+        return None, ""
+
+    def _hierholzer(self, start: int, offsets: List[int], inc: List[int],
+                    tails: List[int], heads: List[int]) -> List[int]:
+        """
+        Hierholzer iterativo en O(V + E): puntero de arista por nodo (ptr) y bitmap de usadas,
+        así cada posición de inc se examina una sola vez. Devuelve posiciones de arista en orden.
+        """
+        used = bytearray(len(tails))
+        ptr = offsets[:-1]
+        directed = self.directed
+        path: List[int] = []
+        st = [start]
+        edge_stack: List[int] = []
+        while st:
+            u = st[-1]
+            p = ptr[u]
+            end = offsets[u + 1]
+            while p < end and used[inc[p]]:
+                p += 1
+            if p == end:
+                ptr[u] = p
+                st.pop()
+                if edge_stack:
+                    path.append(edge_stack.pop())
+                continue
+            e = inc[p]
+            ptr[u] = p + 1
+            used[e] = 1
+            edge_stack.append(e)
+            st.append(heads[e] if directed or tails[e] == u else tails[e])
+        path.reverse()
+        return path
+
     def is_eulerian(self) -> Tuple[bool, str]:
         """
         Comprueba si multigrafo tiene Eulerian trail/circuit.
@@ -1131,131 +2641,180 @@ class MultiGraph:
            Eulerian trail (pero no circuit) si exactamente 0<2 vértices tienen grado impar.
          - EN GRAFO DIRIGIDO: Eulerian circuit si cada nodo indegree == outdegree y cada vértice con aristas pertenece a la misma componente fuertemente conectada (aquí usamos condición débil: check reachable ignoring direction for simplicity).
            Eulerian trail: existe exactamente one start node with out-in = 1 and one end node with in-out = 1 and otros equal; y grafo débilmente conexo en los vértices con aristas.
+        Lineal: grados y conectividad sobre arrays enteros, sin recorrer listas de adyacencia.
         """
-        # ignorar nodos aislados al comprobar conectividad
-        non_iso = [u for u in self.nodes if self.degree(u) > 0]
-        if not non_iso:
-            return True, "circuit"
-        # conectaridad débil (ignorar direcciones)
-        comp_count = 0
-        visited = set()
-        q = deque([non_iso[0]])
-        visited.add(non_iso[0])
-        while q:
-            u = q.popleft()
-            for nei, eid, _, _ in self.adj[u]:
-                if nei not in visited:
-                    visited.add(nei)
-                    q.append(nei)
-        if len(visited) != len(non_iso):
-            return False, ""
-        if not self.directed:
-            odd = [u for u in self.nodes if self.degree(u) % 2 == 1]
-            if len(odd) == 0:
-                return True, "circuit"
-            if len(odd) == 2:
-                return True, "trail"
-            return False, ""
-        else:
-            indeg = {u:0 for u in self.nodes}
-            outdeg = {u:0 for u in self.nodes}
-            for eid, (u,v,w,d) in self.edges.items():
-                outdeg[u] += 1
-                indeg[v] += 1
-            start_nodes = sum(1 for u in self.nodes if outdeg[u] - indeg[u] == 1)
-            end_nodes = sum(1 for u in self.nodes if indeg[u] - outdeg[u] == 1)
-            if all(indeg[u] == outdeg[u] for u in self.nodes):
-                return True, "circuit"
-            if start_nodes == 1 and end_nodes == 1 and all((outdeg[u] - indeg[u] in (0,1) and indeg[u] - outdeg[u] in (0,1)) for u in self.nodes):
-                return True, "trail"
-            return False, ""
+        _, _, _, tails, heads = self._edge_arrays()
+        _, typ = self._euler_start(len(self.nodes), tails, heads)
+        return bool(typ), typ
 
     def eulerian_trail(self) -> Optional[List[int]]:
         """
         Devuelve lista de edge_ids en orden que forma un Eulerian circuit/trail si existe, sino None.
-        Implementa Hierholzer adaptado a multiaristas (trabaja con edge_ids y marca usados).
+        Hierholzer iterativo en O(V + E) sobre arrays de incidencia con puntero por nodo y bitmap de
+        aristas usadas (sin búsquedas por edge_id ni borrados en listas).
         """
-        ok, typ = self.is_eulerian()
-        if not ok:
+        nodes, _, eids, tails, heads = self._edge_arrays()
+        start, typ = self._euler_start(len(nodes), tails, heads)
+        if not typ:
             return None
-        # seleccionar start vertex
-        if not self.directed:
-            # if trail exists with two odd nodes, start at one odd; else start at any non isolated
-            odd = [u for u in self.nodes if self.degree(u) % 2 == 1]
-            start = odd[0] if odd else next(iter([u for u in self.nodes if self.degree(u) > 0]))
-        else:
-            # directed: if trail (start has out-in ==1) else any vertex with outdeg>0
-            indeg = {u:0 for u in self.nodes}
-            outdeg = {u:0 for u in self.nodes}
-            for eid, (u,v,w,d) in self.edges.items():
-                outdeg[u] += 1
-                indeg[v] += 1
-            starts = [u for u in self.nodes if outdeg[u] - indeg[u] == 1]
-            start = starts[0] if starts else next(iter([u for u in self.nodes if outdeg[u] > 0]))
-
-        # prepare adjacency map: node -> stack of (nei, eid)
-        adj_map = {u: [] for u in self.nodes}
-        for eid, (u,v,w,d) in self.edges.items():
-            adj_map[u].append((v, eid))
-            if not self.directed:
-                # in undirected store both directions; but we must avoid duplicate usage so both entries refer same eid
-                adj_map[v].append((u, eid))
-        # used markers
-        used = set()
-        circuit = []
-        stack = [start]
-        edge_iter_idx = {u:0 for u in self.nodes}  # pointer per node
-        while stack:
-            u = stack[-1]
-            while edge_iter_idx[u] < len(adj_map[u]) and adj_map[u][edge_iter_idx[u]][1] in used:
-                edge_iter_idx[u] += 1
-            if edge_iter_idx[u] == len(adj_map[u]):
-                stack.pop()
-                if stack:
-                    # last traveled edge is between stack[-1] and u; we need its eid
-                    # but we don't have direct mapping parent->eid here; instead, we reconstruct by scanning edges used?
-                    # simpler approach: record eids when walking below
-                    pass
-                continue
-            v, eid = adj_map[u][edge_iter_idx[u]]
-            edge_iter_idx[u] += 1
-            if eid in used:
+        if start is None:
+            return []
+        offsets, inc = self._incidence(len(nodes), tails, heads)
+        return [eids[e] for e in self._hierholzer(start, offsets, inc, tails, heads)]
+
+    # -------------------
+    # CHINESE POSTMAN (no dirigido): duplicar aristas mínimas para obtener un circuito
+    # -------------------
+    def _odd_dijkstra(self, src: int, offsets: List[int], inc: List[int], nbr: List[int],
+                      weights: List[float], dist: List[float], is_target: List[bool],
+                      limit: int) -> Tuple[List[Tuple[float, int]], Dict[int, int]]:
+        """
+        Dijkstra desde src que se detiene tras asentar `limit` nodos objetivo (limit <= 0: sin límite).
+        nbr[p] es el otro extremo de la arista inc[p]; dist es un array de trabajo a INF que se deja como estaba.
+        Devuelve ([(dist, objetivo)], pred) con pred: nodo -> posición de la arista por la que se llegó.
+        """
+        pred: Dict[int, int] = {}
+        touched = [src]
+        found: List[Tuple[float, int]] = []
+        dist[src] = 0.0
+        pq = [(0.0, src)]
+        pop, push = heapq.heappop, heapq.heappush
+        while pq:
+            d, u = pop(pq)
+            if d > dist[u]:
                 continue
-            # traverse this edge
-            used.add(eid)
-            stack.append(v)
-            # record travel order of eids (we'll convert Eulerian by reconstructing when backtracking)
-            # store eid in a separate stack
-        # The above attempt is incomplete for collecting eids in order.
-        # Simpler: perform Hierholzer collecting edges on backtrack explicitly:
-
-        # Rebuild with recursive-like stack storing (node, iterator)
-        adj_map2 = {u: list(adj_map[u]) for u in adj_map}  # shallow copy lists
-        path = []
-        st = [start]
-        edge_stack = []  # stack of eids traversed
-        while st:
-            u = st[-1]
-            while adj_map2[u] and adj_map2[u][-1][1] in used:
-                adj_map2[u].pop()
-            if not adj_map2[u]:
-                st.pop()
-                if edge_stack:
-                    path.append(edge_stack.pop())
-            else:
-                v, eid = adj_map2[u].pop()
-                if eid in used:
+            if u != src and is_target[u]:
+                found.append((d, u))
+                if len(found) == limit:
+                    break
+            for p in range(offsets[u], offsets[u + 1]):
+                e = inc[p]
+                v = nbr[p]
+                nd = d + weights[e]
+                if nd < dist[v]:
+                    if v not in pred:
+                        touched.append(v)
+                    dist[v] = nd
+                    pred[v] = e
+                    push(pq, (nd, v))
+        for v in touched:
+            dist[v] = float('inf')
+        return found, pred
+
+    def chinese_postman(self, add_edges: bool = False, exact_limit: int = 16,
+                        candidates: int = 4) -> Tuple[List[int], float]:
+        """
+        Recorrido del cartero chino (solo no dirigido, pesos >= 0): circuito cerrado que recorre cada
+        arista al menos una vez. Empareja los nodos de grado impar por caminos mínimos y duplica las
+        aristas de esos caminos; después aplica el mismo Hierholzer lineal de eulerian_trail.
+        - Con <= exact_limit nodos impares el emparejamiento es óptimo (DP por máscaras, O(2^k k)).
+        - Con más, es voraz: cada impar busca sus `candidates` impares más cercanos con un Dijkstra
+          truncado y se emparejan por distancia creciente; los que queden sueltos, con el impar libre más cercano.
+        Devuelve (edge_ids en orden, coste total). Sin add_edges las repeticiones reutilizan el id de la
+        arista original; con add_edges=True se añaden al grafo como aristas nuevas con
+        data={"duplicate_of": eid} y el recorrido usa sus ids.
+        """
+        if self.directed:
+            raise ValueError("Chinese postman applies only to undirected multigraphs")
+        nodes, _, eids, tails, heads = self._edge_arrays()
+        n, m = len(nodes), len(eids)
+        if not m:
+            return [], 0.0
+        weights = [self.edges[eid][2] for eid in eids]
+        if any(w < 0 for w in weights):
+            raise ValueError("Chinese postman requires non-negative weights")
+        offsets, inc = self._incidence(n, tails, heads)
+        if not self._edges_connected(n, tails, heads):
+            raise ValueError("Edges are not connected: no closed walk covers them all")
+        odd = [u for u in range(n) if (offsets[u + 1] - offsets[u]) % 2]
+        is_odd = [False] * n
+        for u in odd:
+            is_odd[u] = True
+        nbr = [0] * len(inc)
+        for u in range(n):
+            for p in range(offsets[u], offsets[u + 1]):
+                e = inc[p]
+                nbr[p] = heads[e] if tails[e] == u else tails[e]
+        dist = [float('inf')] * n
+
+        pairs: List[Tuple[int, int, Dict[int, int]]] = []  # (src, dst, pred desde src)
+        if len(odd) <= exact_limit:
+            k = len(odd)
+            pos = {u: i for i, u in enumerate(odd)}
+            dmat = [[float('inf')] * k for _ in range(k)]
+            preds = []
+            for i, u in enumerate(odd):
+                found, pred = self._odd_dijkstra(u, offsets, inc, nbr, weights, dist, is_odd, 0)
+                preds.append(pred)
+                for d, v in found:
+                    dmat[i][pos[v]] = d
+            full = (1 << k) - 1
+            best = [float('inf')] * (1 << k)
+            choice = [0] * (1 << k)
+            best[0] = 0.0
+            for mask in range(1, full + 1):
+                if bin(mask).count("1") % 2:
                     continue
-                used.add(eid)
-                edge_stack.append(eid)
-                st.append(v)
-        path.reverse()
-        # path is list of edge_ids in Euler order
-        if len(path) != len(self.edges):
-            # in multigraph removed isolated edges? It should match number of edges with incidence
-            # For safety, if counts mismatch return path anyway
-            pass
-        return path
+                i = (mask & -mask).bit_length() - 1
+                rest = mask ^ (1 << i)
+                row = dmat[i]
+                b, c = float('inf'), 0
+                r = rest
+                while r:
+                    low = r & -r
+                    j = low.bit_length() - 1
+                    cand = row[j] + best[rest ^ low]
+                    if cand < b:
+                        b, c = cand, j
+                    r ^= low
+                best[mask], choice[mask] = b, c
+            mask = full
+            while mask:
+                i = (mask & -mask).bit_length() - 1
+                j = choice[mask]
+                pairs.append((odd[i], odd[j], preds[i]))
+                mask ^= (1 << i) | (1 << j)
+        else:
+            cand_pairs = []
+            preds = {}
+            for u in odd:
+                found, pred = self._odd_dijkstra(u, offsets, inc, nbr, weights, dist, is_odd, candidates)
+                preds[u] = pred
+                cand_pairs.extend((d, u, v) for d, v in found)
+            cand_pairs.sort()
+            free = is_odd[:]
+            for d, u, v in cand_pairs:
+                if free[u] and free[v]:
+                    free[u] = free[v] = False
+                    pairs.append((u, v, preds[u]))
+            for u in odd:
+                if free[u]:
+                    free[u] = False
+                    found, pred = self._odd_dijkstra(u, offsets, inc, nbr, weights, dist, free, 1)
+                    v = found[0][1]
+                    free[v] = False
+                    pairs.append((u, v, pred))
+
+        # duplicar aristas del camino mínimo de cada pareja (posiciones >= m son copias)
+        copy_of: List[int] = []
+        for u, v, pred in pairs:
+            x = v
+            while x != u:
+                e = pred[x]
+                copy_of.append(e)
+                tails.append(tails[e])
+                heads.append(heads[e])
+                x = heads[e] if tails[e] == x else tails[e]
+        if add_edges:
+            for e in copy_of:
+                u, v, w, _ = self.edges[eids[e]]
+                eids.append(self.add_edge(u, v, weight=w, data={"duplicate_of": eids[e]}))
+        else:
+            eids.extend(eids[e] for e in copy_of)
+        weights.extend(weights[e] for e in copy_of)
+        offsets, inc = self._incidence(n, tails, heads)
+        route = self._hierholzer(tails[0], offsets, inc, tails, heads)
+        return [eids[e] for e in route], sum(weights)
 
     # -------------------
     # UTIL
@@ -1300,6 +2859,13 @@ if __name__ == "__main__":
     print("H Eulerian?", ok, typ)
     print("Trail (edge ids):", H.eulerian_trail())
 
+    # Cartero chino: el ciclo 1-2-3-4 con la diagonal 1-3 tiene impares 1 y 3; se duplica la diagonal
+    P = MultiGraph(directed=False)
+    for u, v, w in [(1, 2, 1.0), (2, 3, 1.0), (3, 4, 1.0), (4, 1, 5.0), (1, 3, 2.0)]:
+        P.add_edge(u, v, weight=w)
+    route, cost = P.chinese_postman()
+    print("Cartero chino (edge ids):", route, "coste:", cost)
+
 
 
 
@@ -1313,7 +2879,10 @@ if __name__ == "__main__":
 
 #Grafo bipartito. Código: bipartite_graph.py
 from collections import deque, defaultdict
-from typing import Any, Dict, List, Optional, Set, Tuple
+import heapq
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 class BipartiteGraph:
     """
@@ -1326,10 +2895,13 @@ class BipartiteGraph:
         bfs/dfs/shortest_path (unweighted)
         hopcroft_karp() -> (pair_u, pair_v, matching_size)
         min_vertex_cover() -> set of nodes (size == matching_size) using König's theorem
+        min_cost_assignment() -> (pairs, total_cost) con los pesos de add_edge(u, v, weight)
+    - weights: dict (u, v) -> coste, guardado en ambos sentidos (solo aristas con weight explícito).
     """
 
     def __init__(self):
         self.adj: Dict[Any, Set[Any]] = {}
+        self.weights: Dict[Tuple[Any, Any], float] = {}
 
     # --------------
     # CRUD nodos/aristas
@@ -1346,19 +2918,30 @@ class BipartiteGraph:
             raise KeyError("Node not found")
         for v in list(self.adj[u]):
             self.adj[v].discard(u)
+            self.weights.pop((u, v), None)
+            self.weights.pop((v, u), None)
         del self.adj[u]
 
-    def add_edge(self, u: Any, v: Any) -> None:
-        """Añade arista u-v (no dirigida). Crea nodos si no existen."""
+    def add_edge(self, u: Any, v: Any, weight: Optional[float] = None) -> None:
+        """Añade arista u-v (no dirigida). Crea nodos si no existen. weight: coste para min_cost_assignment."""
         self.add_node(u); self.add_node(v)
         self.adj[u].add(v)
         self.adj[v].add(u)
+        if weight is not None:
+            self.weights[(u, v)] = self.weights[(v, u)] = float(weight)
+
+    def weight(self, u: Any, v: Any, default: float = 1.0) -> float:
+        if u not in self.adj or v not in self.adj[u]:
+            raise KeyError("Edge not found")
+        return self.weights.get((u, v), default)
 
     def remove_edge(self, u: Any, v: Any) -> None:
         if u not in self.adj or v not in self.adj:
             raise KeyError("One or both nodes not found")
         self.adj[u].discard(v)
         self.adj[v].discard(u)
+        self.weights.pop((u, v), None)
+        self.weights.pop((v, u), None)
 
     def get_edges(self) -> List[Tuple[Any, Any]]:
         """Lista de aristas (u,v) sin duplicados u<v lexicográfico por consistencia."""
@@ -1460,71 +3043,224 @@ class BipartiteGraph:
             (left if c == 0 else right).add(node)
         return True, left, right, color
 
+    # --------------
+    # Relabel entero de la bipartición (CSR izquierda -> derecha)
+    # --------------
+    def _sides(self, left: Optional[Iterable[Any]]) -> Tuple[List[Any], List[Any]]:
+        """Lados (left, right) como listas. Si left es None se usa la 2-coloración de is_bipartite."""
+        if left is None:
+            ok, lset, rset, _ = self.is_bipartite()
+            if not ok:
+                raise ValueError("Graph is not bipartite")
+            return list(lset), list(rset)
+        lset = set(left)
+        for u in lset:
+            if u not in self.adj:
+                raise KeyError(f"Node {u!r} not found")
+            if any(v in lset for v in self.adj[u]):
+                raise ValueError("Edge inside the given left side: not a bipartition")
+        return list(lset), [v for v in self.adj if v not in lset]
+
+    def _csr(self, lnodes: List[Any], rnodes: List[Any]) -> Tuple[List[int], List[int]]:
+        """offsets/targets: vecinos (índices de rnodes) del nodo izquierdo i en targets[offsets[i]:offsets[i+1]]."""
+        ridx = {v: j for j, v in enumerate(rnodes)}
+        offsets = [0]
+        targets: List[int] = []
+        for u in lnodes:
+            targets.extend(ridx[v] for v in self.adj[u])
+            offsets.append(len(targets))
+        return offsets, targets
+
     # --------------
     # Hopcroft-Karp (matching máximo)
     # --------------
-    def hopcroft_karp(self) -> Tuple[Dict[Any, Optional[Any]], Dict[Any, Optional[Any]], int]:
+    def hopcroft_karp(self, left: Optional[Iterable[Any]] = None) -> Tuple[Dict[Any, Optional[Any]], Dict[Any, Optional[Any]], int]:
         """
         Devuelve (pair_u, pair_v, matching_size)
         - pair_u: dict para todos los nodos del lado 'left' (si no están en left, se ignoran) mapping u->v or None
         - pair_v: dict para todos los nodos del lado 'right' mapping v->u or None
         Requiere que el grafo sea bipartito; si no lo es lanza ValueError.
+        left: nodos del lado izquierdo (opcional; por defecto la 2-coloración de is_bipartite).
+        Implementación iterativa sobre índices enteros (CSR): matching inicial voraz, BFS por capas y
+        DFS con pila explícita y puntero de arista por nodo, así que caminos alternantes largos no
+        agotan la recursión. O(E sqrt(V)).
         """
-        ok, left, right, _ = self.is_bipartite()
-        if not ok:
-            raise ValueError("Graph is not bipartite")
-
-        # initialize
-        pair_u = {u: None for u in left}
-        pair_v = {v: None for v in right}
-        dist = {}
-
-        INF = 10**9
+        lnodes, rnodes = self._sides(left)
+        offsets, targets = self._csr(lnodes, rnodes)
+        nl = len(lnodes)
+        match_l = [-1] * nl
+        match_r = [-1] * len(rnodes)
+        matching = 0
+        # matching inicial voraz
+        for u in range(nl):
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if match_r[v] == -1:
+                    match_l[u] = v
+                    match_r[v] = u
+                    matching += 1
+                    break
 
-        def bfs() -> bool:
-            q = deque()
-            for u in left:
-                if pair_u[u] is None:
-                    dist[u] = 0
-                    q.append(u)
-                else:
-                    dist[u] = INF
+        INF = nl + 1
+        dist = [INF] * nl
+        while True:
+            # BFS por capas desde los libres de la izquierda
+            q = [u for u in range(nl) if match_l[u] == -1]
+            for u in range(nl):
+                dist[u] = INF
+            for u in q:
+                dist[u] = 0
             found_augment = False
-            while q:
-                u = q.popleft()
-                for v in self.adj[u]:
-                    if v not in pair_v:  # neighbors on right only
-                        continue
-                    pu = pair_v[v]
-                    if pu is None:
+            for u in q:
+                du = dist[u] + 1
+                for k in range(offsets[u], offsets[u + 1]):
+                    w = match_r[targets[k]]
+                    if w == -1:
                         found_augment = True
-                    else:
-                        if dist.get(pu, INF) == INF:
-                            dist[pu] = dist[u] + 1
-                            q.append(pu)
-            return found_augment
-
-        def dfs(u) -> bool:
-            for v in self.adj[u]:
-                if v not in pair_v:
+                    elif dist[w] == INF:
+                        dist[w] = du
+                        q.append(w)
+            if not found_augment:
+                break
+            # DFS iterativa: it[x] = arista actual de x (no se avanza mientras su hijo sigue en la pila)
+            it = offsets[:-1]
+            for root in range(nl):
+                if match_l[root] != -1:
                     continue
-                pu = pair_v[v]
-                if pu is None or (dist.get(pu, INF) == dist[u] + 1 and dfs(pu)):
-                    pair_u[u] = v
-                    pair_v[v] = u
-                    return True
-            dist[u] = INF
-            return False
-
-        matching = 0
-        while bfs():
-            for u in list(left):
-                if pair_u[u] is None:
-                    if dfs(u):
+                stack = [root]
+                while stack:
+                    x = stack[-1]
+                    k = it[x]
+                    if k == offsets[x + 1]:
+                        dist[x] = INF  # callejón sin salida en esta fase
+                        stack.pop()
+                        if stack:
+                            it[stack[-1]] += 1
+                        continue
+                    w = match_r[targets[k]]
+                    if w == -1:
+                        for y in stack:  # aumentar a lo largo de la pila
+                            v = targets[it[y]]
+                            match_l[y] = v
+                            match_r[v] = y
                         matching += 1
+                        break
+                    if dist[w] == dist[x] + 1:
+                        stack.append(w)
+                    else:
+                        it[x] += 1
 
+        pair_u = {u: (rnodes[match_l[i]] if match_l[i] != -1 else None) for i, u in enumerate(lnodes)}
+        pair_v = {v: (lnodes[match_r[j]] if match_r[j] != -1 else None) for j, v in enumerate(rnodes)}
         return pair_u, pair_v, matching
 
+    # --------------
+    # Asignación de coste mínimo (Hungarian con Dijkstra y potenciales, grafo disperso)
+    # --------------
+    def min_cost_assignment(self, left: Optional[Iterable[Any]] = None,
+                            default_weight: float = 1.0) -> Tuple[Dict[Any, Any], float]:
+        """
+        Matching de cardinalidad máxima y, entre ellos, de coste total mínimo (pesos de add_edge;
+        default_weight para aristas sin peso). Devuelve (pairs left->right solo de los emparejados, coste).
+        Hungarian en versión dispersa (Jonker-Volgenant): por cada nodo izquierdo un Dijkstra sobre
+        costes reducidos c - u - v >= 0 hasta la primera columna libre, y actualización de potenciales.
+        Cada nodo izquierdo tiene además una columna ficticia privada de coste BIG (> cualquier
+        diferencia de coste posible), así siempre hay camino y minimizar el total equivale a
+        maximizar primero la cardinalidad y después minimizar el coste real.
+        O(n * (E + V) log V) en el peor caso; con buenos potenciales cada Dijkstra suele ser corto.
+        """
+        lnodes, rnodes = self._sides(left)
+        offsets, targets = self._csr(lnodes, rnodes)
+        weights = self.weights
+        costs = [weights.get((u, rnodes[targets[k]]), default_weight)
+                 for i, u in enumerate(lnodes) for k in range(offsets[i], offsets[i + 1])]
+        nl, nr = len(lnodes), len(rnodes)
+        INF = float('inf')
+        big = 2.0 * nl * max((abs(c) for c in costs), default=1.0) + 1.0
+        # columnas reales 0..nr-1, columna ficticia del nodo izquierdo i: nr + i
+        row_pot = [min(min(costs[offsets[i]:offsets[i + 1]], default=big), big) for i in range(nl)]
+        col_pot = [0.0] * (nr + nl)
+        match_col = [-1] * (nr + nl)   # columna -> fila
+        match_row = [-1] * nl          # fila -> columna
+        dist = [INF] * (nr + nl)
+        pred = [-1] * (nr + nl)        # columna -> fila desde la que se alcanzó
+        done = bytearray(nr + nl)      # columna ya asentada en el Dijkstra de la fila actual
+        # inicialización voraz: cada fila toma una columna libre de coste reducido 0
+        for i in range(nl):
+            for k in range(offsets[i], offsets[i + 1]):
+                if costs[k] == row_pot[i] and match_col[targets[k]] == -1:
+                    match_row[i] = targets[k]
+                    match_col[targets[k]] = i
+                    break
+
+        for root in range(nl):
+            if match_row[root] != -1:
+                continue
+            heap = [(0.0, root, -1)]   # (distancia, fila alcanzada, columna por la que se llegó)
+            touched: List[int] = []
+            settled_cols: List[int] = []
+            row_dist = {root: 0.0}
+            end = -1
+            final = 0.0
+            while heap:
+                d, r, via = heapq.heappop(heap)
+                if via != -1:
+                    if done[via] or dist[via] < d:  # entrada obsoleta
+                        continue
+                    done[via] = 1
+                    settled_cols.append(via)
+                    if match_col[via] == -1:
+                        end, final = via, d
+                        break
+                    r = match_col[via]
+                    row_dist[r] = d
+                ur = row_pot[r]
+                for k in range(offsets[r], offsets[r + 1]):
+                    c = targets[k]
+                    nd = d + costs[k] - ur - col_pot[c]
+                    # con pesos float el redondeo deja costes reducidos de -1e-16: una columna
+                    # asentada no se vuelve a relajar (su pred cerraría un ciclo en el aumento)
+                    if nd < dist[c] and not done[c]:
+                        if dist[c] == INF:
+                            touched.append(c)
+                        dist[c] = nd
+                        pred[c] = r
+                        heapq.heappush(heap, (nd, r, c))
+                c = nr + r
+                nd = d + big - ur - col_pot[c]
+                if nd < dist[c] and not done[c]:
+                    if dist[c] == INF:
+                        touched.append(c)
+                    dist[c] = nd
+                    pred[c] = r
+                    heapq.heappush(heap, (nd, r, c))
+            # potenciales: filas y columnas asentadas se mueven lo justo para seguir con c - u - v >= 0
+            for r, dr in row_dist.items():
+                row_pot[r] += final - dr
+            for c in settled_cols:
+                col_pot[c] -= final - dist[c]
+            # aumentar a lo largo del camino de predecesores
+            c = end
+            while c != -1:
+                r = pred[c]
+                prev = match_row[r]
+                match_row[r] = c
+                match_col[c] = r
+                c = prev if r != root else -1
+            for c in touched:
+                dist[c] = INF
+                done[c] = 0
+
+        pairs: Dict[Any, Any] = {}
+        total = 0.0
+        for i, c in enumerate(match_row):
+            if c < nr:
+                for k in range(offsets[i], offsets[i + 1]):
+                    if targets[k] == c:
+                        total += costs[k]
+                        break
+                pairs[lnodes[i]] = rnodes[c]
+        return pairs, total
 
     # --------------
     # Minimum Vertex Cover from maximum matching (Kőnig)
@@ -1584,6 +3320,32 @@ class BipartiteGraph:
     def __repr__(self) -> str:
         return f"BipartiteGraph(nodes={len(self.adj)}, edges={len(self.get_edges())})"
 
+def random_rides(n: int, candidates: int = 5, seed: int = 3) -> BipartiteGraph:
+    """n riders ("r", i) y n drivers ("d", j): cada rider con candidates drivers al azar, coste entero 1..100."""
+    rng = random.Random(seed)
+    rides = BipartiteGraph()
+    for r in range(n):
+        for d in rng.sample(range(n), candidates):
+            rides.add_edge(("r", r), ("d", d), weight=rng.randint(1, 100))
+    return rides
+
+def benchmark_assignment(n: int = 5_000, candidates: int = 5, seed: int = 3) -> Dict[str, Any]:
+    """
+    Riders -> drivers (random_rides): Hopcroft-Karp y min_cost_assignment sobre el mismo grafo.
+    No lo llama el ejemplo de uso.
+    """
+    rides = random_rides(n, candidates, seed)
+    riders = [("r", r) for r in range(n)]
+    t0 = time.perf_counter()
+    _, _, size = rides.hopcroft_karp(left=riders)
+    t1 = time.perf_counter()
+    pairs, cost = rides.min_cost_assignment(left=riders)
+    t2 = time.perf_counter()
+    print(f"{n} riders x {n} drivers ({candidates} candidatos): Hopcroft-Karp {size} en {t1 - t0:.2f}s | "
+          f"asignación mínima {len(pairs)} parejas, coste {cost:.0f} en {t2 - t1:.2f}s")
+    return {"n": n, "matching": size, "hopcroft_karp_s": t1 - t0, "assigned": len(pairs), "cost": cost,
+            "assignment_s": t2 - t1}
+
 #Ejemplo de uso
 if __name__ == "__main__":
     g = BipartiteGraph()
@@ -1617,6 +3379,31 @@ if __name__ == "__main__":
     # Caminos mínimos (ejemplo)
     print("Shortest path A -> 3:", g.shortest_path("A", 3))
 
+    # Asignación de coste mínimo (pesos = coste de cada pareja)
+    w = BipartiteGraph()
+    for u, v, c in [("A", 1, 4), ("A", 2, 1), ("B", 1, 2), ("B", 3, 5), ("C", 2, 3), ("C", 3, 2)]:
+        w.add_edge(u, v, weight=c)
+    print("Asignación mínima:", w.min_cost_assignment(left=["A", "B", "C"]))
+
+    # Pesos float: el redondeo en los costes reducidos no debe reabrir columnas ya asentadas
+    fw = [(0, 0, 2.243), (0, 1, 1.979), (0, 2, 1.08), (0, 3, -1.554), (1, 0, -1.705), (1, 2, 4.628),
+          (1, 3, -2.767), (2, 1, -3.592), (2, 2, -4.883), (2, 3, 0.364), (3, 3, -0.245), (4, 0, 2.473),
+          (4, 2, 2.716), (4, 3, -3.172), (5, 0, -0.812), (5, 1, -2.361), (5, 2, 1.895), (5, 3, -1.272)]
+    wf, wi = BipartiteGraph(), BipartiteGraph()
+    for u, v, c in fw:
+        wf.add_edge(u, 10 + v, weight=c)
+        wi.add_edge(u, 10 + v, weight=round(c * 1000))
+    pf, cf = wf.min_cost_assignment(left=range(6))
+    pi, ci = wi.min_cost_assignment(left=range(6))
+    print("Asignación con pesos float:", pf, round(cf, 3), "| igual que en enteros x1000:",
+          len(pf) == len(pi) and abs(cf * 1000 - ci) < 1e-6)
+
+    # Riders -> drivers: cada rider con unos pocos drivers al azar (tiempos en benchmark_assignment())
+    rides = random_rides(50)
+    pairs, cost = rides.min_cost_assignment(left=[("r", r) for r in range(50)])
+    print("50 riders x 50 drivers (5 candidatos):", len(pairs), "parejas, coste", cost,
+          "| Hopcroft-Karp:", rides.hopcroft_karp(left=[("r", r) for r in range(50)])[2])
+
 
 
 
@@ -1629,13 +3416,357 @@ if __name__ == "__main__":
 #Planar. Código — planar_graph.py
 from collections import deque
 import heapq
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+class _Interval:
+    """Intervalo [low, high] de aristas de retorno (las dos None si está vacío)."""
+    __slots__ = ("low", "high")
+
+    def __init__(self, low=None, high=None):
+        self.low = low
+        self.high = high
+
+    def empty(self) -> bool:
+        return self.low is None and self.high is None
+
+    def copy(self) -> '_Interval':
+        return _Interval(self.low, self.high)
+
+    def conflicting(self, b, lowpt: Dict) -> bool:
+        return not self.empty() and lowpt[self.high] > lowpt[b]
+
+
+class _ConflictPair:
+    """Par de intervalos (left, right) de aristas de retorno que deben ir en lados opuestos."""
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: Optional[_Interval] = None, right: Optional[_Interval] = None):
+        self.left = left if left is not None else _Interval()
+        self.right = right if right is not None else _Interval()
+
+    def swap(self) -> None:
+        self.left, self.right = self.right, self.left
+
+    def lowest(self, lowpt: Dict):
+        if self.left.empty():
+            return lowpt[self.right.low]
+        if self.right.empty():
+            return lowpt[self.left.low]
+        return min(lowpt[self.left.low], lowpt[self.right.low])
+
+
+class LRPlanarity:
+    """
+    Test de planaridad left-right (de Fraysseix-Rosenstiehl, formulación de Brandes) en O(n + m)
+    sobre nodos 0..n-1 y aristas no dirigidas (u, v) sin lazos; las repetidas se ignoran.
+    Tres DFS iterativos (sin recursión, válidos para grafos de cientos de miles de nodos):
+      1. orientación: árbol DFS, lowpt/lowpt2 y profundidad de anidamiento de cada arista;
+      2. test: pila de pares de conflicto con las restricciones de lado de las aristas de retorno;
+      3. embedding: resuelve el lado absoluto de cada arista y construye el sistema de rotación
+         con listas doblemente enlazadas (cw/ccw) por nodo.
+    run() devuelve la rotación (rot[v] = vecinos de v en orden cíclico horario) o None si no es planar.
+    """
+
+    def __init__(self, n: int, edges: Iterable[Tuple[int, int]]):
+        self.n = n
+        adjs: List[List[int]] = [[] for _ in range(n)]
+        seen = set()
+        m = 0
+        for u, v in edges:
+            if u == v or (u, v) in seen or (v, u) in seen:
+                continue
+            seen.add((u, v))
+            adjs[u].append(v)
+            adjs[v].append(u)
+            m += 1
+        self.m = m
+        self.adjs = adjs
+
+    def run(self) -> Optional[List[List[int]]]:
+        n = self.n
+        if n > 2 and self.m > 3 * n - 6:
+            return None
+        self.height: List[Optional[int]] = [None] * n
+        self.parent_edge: List[Optional[Tuple[int, int]]] = [None] * n
+        self.out: List[List[int]] = [[] for _ in range(n)]
+        self.lowpt: Dict[Tuple[int, int], int] = {}
+        self.lowpt2: Dict[Tuple[int, int], int] = {}
+        self.nesting_depth: Dict[Tuple[int, int], int] = {}
+        roots = []
+        for v in range(n):
+            if self.height[v] is None:
+                self.height[v] = 0
+                roots.append(v)
+                self._orientation(v)
+        self.adjs = None
+        self.lowpt2 = None
+        nd = self.nesting_depth
+        self.ordered = [sorted(self.out[v], key=lambda w, v=v: nd[(v, w)]) for v in range(n)]
+        self.ref: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {}
+        self.side: Dict[Tuple[int, int], int] = {}
+        self.S: List[_ConflictPair] = []
+        self.stack_bottom: Dict[Tuple[int, int], Optional[_ConflictPair]] = {}
+        self.lowpt_edge: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for v in roots:
+            if not self._testing(v):
+                return None
+        # lado absoluto de cada arista -> profundidad con signo y nuevo orden de salida
+        for v in range(n):
+            for w in self.out[v]:
+                e = (v, w)
+                nd[e] *= self._sign(e)
+        self.cw: List[Dict[int, int]] = [{} for _ in range(n)]
+        self.ccw: List[Dict[int, int]] = [{} for _ in range(n)]
+        self.first: List[Optional[int]] = [None] * n
+        for v in range(n):
+            self.ordered[v] = sorted(self.out[v], key=lambda w, v=v: nd[(v, w)])
+            prev = None
+            for w in self.ordered[v]:
+                self._add_cw(v, w, prev)
+                prev = w
+        self.left_ref: List[Optional[int]] = [None] * n
+        self.right_ref: List[Optional[int]] = [None] * n
+        for v in roots:
+            self._embedding(v)
+        rot: List[List[int]] = []
+        for v in range(n):
+            order = []
+            start = self.first[v]
+            if start is not None:
+                w = start
+                while True:
+                    order.append(w)
+                    w = self.cw[v][w]
+                    if w == start:
+                        break
+            rot.append(order)
+        return rot
+
+    # --- fase 1: orientación DFS, lowpoints y anidamiento ---
+    def _orientation(self, root: int) -> None:
+        height, parent_edge, lowpt, lowpt2 = self.height, self.parent_edge, self.lowpt, self.lowpt2
+        nesting_depth, adjs, out = self.nesting_depth, self.adjs, self.out
+        ind = {}
+        skip_init = set()
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            e = parent_edge[v]
+            i = ind.get(v, 0)
+            nbrs = adjs[v]
+            while i < len(nbrs):
+                w = nbrs[i]
+                vw = (v, w)
+                if vw not in skip_init:
+                    if vw in lowpt or (w, v) in lowpt:
+                        i += 1
+                        continue  # ya orientada
+                    out[v].append(w)
+                    lowpt[vw] = height[v]
+                    lowpt2[vw] = height[v]
+                    if height[w] is None:  # arista de árbol: visitar w y volver a v después
+                        parent_edge[w] = vw
+                        height[w] = height[v] + 1
+                        stack.append(v)
+                        stack.append(w)
+                        skip_init.add(vw)
+                        break
+                    lowpt[vw] = height[w]  # arista de retorno
+                # anidamiento y actualización de los lowpoints de la arista padre
+                nesting_depth[vw] = 2 * lowpt[vw] + (1 if lowpt2[vw] < height[v] else 0)
+                if e is not None:
+                    if lowpt[vw] < lowpt[e]:
+                        lowpt2[e] = min(lowpt[e], lowpt2[vw])
+                        lowpt[e] = lowpt[vw]
+                    elif lowpt[vw] > lowpt[e]:
+                        lowpt2[e] = min(lowpt2[e], lowpt[vw])
+                    else:
+                        lowpt2[e] = min(lowpt2[e], lowpt2[vw])
+                i += 1
+            ind[v] = i
+
+    # --- fase 2: test con pares de conflicto ---
+    def _testing(self, root: int) -> bool:
+        parent_edge, lowpt, height, ordered = self.parent_edge, self.lowpt, self.height, self.ordered
+        S, stack_bottom, lowpt_edge = self.S, self.stack_bottom, self.lowpt_edge
+        ind = {}
+        skip_init = set()
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            e = parent_edge[v]
+            descend = False
+            i = ind.get(v, 0)
+            nbrs = ordered[v]
+            while i < len(nbrs):
+                w = nbrs[i]
+                ei = (v, w)
+                if ei not in skip_init:
+                    stack_bottom[ei] = S[-1] if S else None
+                    if ei == parent_edge[w]:  # arista de árbol
+                        stack.append(v)
+                        stack.append(w)
+                        skip_init.add(ei)
+                        descend = True
+                        break
+                    lowpt_edge[ei] = ei  # arista de retorno
+                    S.append(_ConflictPair(right=_Interval(ei, ei)))
+                # integrar las nuevas aristas de retorno
+                if lowpt[ei] < height[v]:
+                    if w == nbrs[0]:
+                        lowpt_edge[e] = lowpt_edge[ei]
+                    elif not self._add_constraints(ei, e):
+                        return False
+                i += 1
+            ind[v] = i
+            if not descend and e is not None:
+                self._remove_back_edges(e)
+        return True
+
+    def _add_constraints(self, ei: Tuple[int, int], e: Tuple[int, int]) -> bool:
+        S, lowpt, ref = self.S, self.lowpt, self.ref
+        P = _ConflictPair()
+        # fusionar las aristas de retorno de ei en P.right
+        while True:
+            Q = S.pop()
+            if not Q.left.empty():
+                Q.swap()
+            if not Q.left.empty():
+                return False
+            if lowpt[Q.right.low] > lowpt[e]:
+                if P.right.empty():
+                    P.right = Q.right.copy()
+                else:
+                    ref[P.right.low] = Q.right.high
+                P.right.low = Q.right.low
+            else:
+                ref[Q.right.low] = self.lowpt_edge[e]
+            if (S[-1] if S else None) is self.stack_bottom[ei]:
+                break
+        # fusionar en P.left las aristas de retorno de e_1..e_{i-1} en conflicto con ei
+        while S and (S[-1].left.conflicting(ei, lowpt) or S[-1].right.conflicting(ei, lowpt)):
+            Q = S.pop()
+            if Q.right.conflicting(ei, lowpt):
+                Q.swap()
+            if Q.right.conflicting(ei, lowpt):
+                return False
+            ref[P.right.low] = Q.right.high
+            if Q.right.low is not None:
+                P.right.low = Q.right.low
+            if P.left.empty():
+                P.left = Q.left.copy()
+            else:
+                ref[P.left.low] = Q.left.high
+            P.left.low = Q.left.low
+        if not (P.left.empty() and P.right.empty()):
+            S.append(P)
+        return True
+
+    def _remove_back_edges(self, e: Tuple[int, int]) -> None:
+        S, lowpt, ref, side = self.S, self.lowpt, self.ref, self.side
+        u = e[0]
+        hu = self.height[u]
+        # descartar los pares cuyas aristas de retorno terminan todas en u
+        while S and S[-1].lowest(lowpt) == hu:
+            P = S.pop()
+            if P.left.low is not None:
+                side[P.left.low] = -1
+        if S:
+            P = S.pop()
+            # recortar el intervalo izquierdo
+            while P.left.high is not None and P.left.high[1] == u:
+                P.left.high = ref.get(P.left.high)
+            if P.left.high is None and P.left.low is not None:
+                ref[P.left.low] = P.right.low
+                side[P.left.low] = -1
+                P.left.low = None
+            # recortar el intervalo derecho
+            while P.right.high is not None and P.right.high[1] == u:
+                P.right.high = ref.get(P.right.high)
+            if P.right.high is None and P.right.low is not None:
+                ref[P.right.low] = P.left.low
+                side[P.right.low] = -1
+                P.right.low = None
+            S.append(P)
+        # el lado de e es el de su arista de retorno más alta
+        if lowpt[e] < hu:
+            hl = S[-1].left.high
+            hr = S[-1].right.high
+            if hl is not None and (hr is None or lowpt[hl] > lowpt[hr]):
+                ref[e] = hl
+            else:
+                ref[e] = hr
+
+    def _sign(self, e: Tuple[int, int]) -> int:
+        """Lado absoluto de e: producto de los lados relativos a lo largo de la cadena ref (iterativo)."""
+        ref, side = self.ref, self.side
+        chain = []
+        while ref.get(e) is not None:
+            chain.append(e)
+            e = ref[e]
+        s = side.get(e, 1)
+        for x in reversed(chain):
+            s *= side.get(x, 1)
+            side[x] = s
+            ref[x] = None
+        return s
+
+    # --- fase 3: sistema de rotación ---
+    def _add_cw(self, v: int, w: int, ref: Optional[int]) -> None:
+        """Inserta w en el orden de v justo después (horario) de ref; ref None solo si v no tiene vecinos."""
+        cw, ccw = self.cw[v], self.ccw[v]
+        if ref is None:
+            cw[w] = ccw[w] = w
+            self.first[v] = w
+            return
+        nxt = cw[ref]
+        cw[ref] = w
+        ccw[w] = ref
+        cw[w] = nxt
+        ccw[nxt] = w
+
+    def _add_ccw(self, v: int, w: int, ref: Optional[int]) -> None:
+        """Inserta w justo antes (antihorario) de ref; si ref era el primero, w pasa a ser el primero."""
+        if ref is None:
+            self._add_cw(v, w, None)
+            return
+        self._add_cw(v, w, self.ccw[v][ref])
+        if ref == self.first[v]:
+            self.first[v] = w
+
+    def _embedding(self, root: int) -> None:
+        parent_edge, side, ordered = self.parent_edge, self.side, self.ordered
+        left_ref, right_ref = self.left_ref, self.right_ref
+        ind = {}
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            i = ind.get(v, 0)
+            nbrs = ordered[v]
+            while i < len(nbrs):
+                w = nbrs[i]
+                i += 1
+                if parent_edge[w] == (v, w):  # arista de árbol
+                    self._add_ccw(w, v, self.first[w])
+                    left_ref[v] = w
+                    right_ref[v] = w
+                    stack.append(v)
+                    stack.append(w)
+                    break
+                if side.get((v, w), 1) == 1:  # arista de retorno a la derecha
+                    self._add_cw(w, v, right_ref[w])
+                else:
+                    self._add_ccw(w, v, left_ref[w])
+                    left_ref[w] = v
+            ind[v] = i
+
 
 class PlanarGraph:
     """
     Clase para trabajar con grafos 'planar-friendly'.
-    Nota: no realiza verificación completa de planaridad.
-    Para funciones que requieren embedding (caras, dual), debes proporcionar
+    is_planar / check_planarity hacen el test exacto (left-right, lineal) y obtienen el embedding;
+    también puedes proporcionarlo a mano con set_embedding.
+    Para funciones que requieren embedding (caras, dual), hace falta
     un embedding: un dict node -> list_of_neighbors_in_cyclic_order.
     """
 
@@ -1808,6 +3939,89 @@ class PlanarGraph:
             return False, f"E={E} > 3V-6 ({3*V-6}) -> not planar (by necessary condition)"
         return True, f"E={E} <= 3V-6 ({3*V-6}) -> passes necessary condition (not sufficient)"
 
+    # -------------------
+    # PLANARIDAD: test left-right O(n + m) con embedding o testigo de Kuratowski
+    # (ignora direcciones y lazos: la planaridad es del grafo no dirigido subyacente)
+    # -------------------
+    def _planarity_input(self) -> Tuple[List[Any], List[Tuple[int, int]]]:
+        nodes = list(self.adj)
+        index = {u: i for i, u in enumerate(nodes)}
+        edges = []
+        for u, nbrs in self.adj.items():
+            iu = index[u]
+            for v in nbrs:
+                iv = index[v]
+                if iu < iv or (self.directed and iu != iv and u not in self.adj[v]):
+                    edges.append((iu, iv))
+        return nodes, edges
+
+    def planar_embedding(self) -> Optional[Dict[Any, List[Any]]]:
+        """
+        Embedding combinatorio (node -> vecinos en orden cíclico horario) si el grafo es planar,
+        None si no. Usa LRPlanarity (lineal, iterativo). No modifica self.embedding.
+        """
+        nodes, edges = self._planarity_input()
+        rot = LRPlanarity(len(nodes), edges).run()
+        if rot is None:
+            return None
+        return {u: [nodes[j] for j in rot[i]] for i, u in enumerate(nodes)}
+
+    def is_planar(self) -> bool:
+        """Test exacto de planaridad en O(V + E) (ver is_planar_heuristic para el filtro por cotas)."""
+        nodes, edges = self._planarity_input()
+        return LRPlanarity(len(nodes), edges).run() is not None
+
+    def check_planarity(self, counterexample: bool = False, store: bool = True) -> Tuple[bool, Any]:
+        """
+        Retorna (True, embedding) si es planar (y con store=True lo guarda en self.embedding, listo
+        para faces_from_embedding / dual_from_embedding), o (False, testigo) si no lo es:
+        el testigo es kuratowski_subgraph() si counterexample=True, o None.
+        """
+        emb = self.planar_embedding()
+        if emb is not None:
+            if store:
+                self.embedding = emb
+            return True, emb
+        return False, (self.kuratowski_subgraph() if counterexample else None)
+
+    def kuratowski_subgraph(self) -> Optional[Tuple[str, List[Tuple[Any, Any]]]]:
+        """
+        Testigo de no planaridad: ("K5" | "K3,3", aristas de una subdivisión de K5 o K3,3 contenida
+        en el grafo). None si el grafo es planar.
+        Se obtiene borrando aristas mientras el resto siga sin ser planar; los borrados se prueban por
+        bloques que se parten a la mitad cuando el bloque entero no se puede quitar, así el número de
+        tests LR es ~ O(k log E) para un testigo de k aristas. Cada test es lineal en lo que queda,
+        pero los primeros son sobre el grafo completo: en mallas grandes cuesta bastante más que
+        is_planar (pensado para depurar, no para el camino caliente).
+        """
+        nodes, edges = self._planarity_input()
+
+        def planar(es) -> bool:
+            # relabel solo de los nodos tocados: los tests se abaratan según se encoge el testigo
+            local: Dict[int, int] = {}
+            pairs = [(local.setdefault(a, len(local)), local.setdefault(b, len(local))) for a, b in es]
+            return LRPlanarity(len(local), pairs).run() is not None
+
+        if planar(edges):
+            return None
+        current = set(edges)
+        pending = [edges]
+        while pending:
+            block = pending.pop()
+            rest = current.difference(block)
+            if not planar(rest):
+                current = rest  # todo el bloque sobra
+            elif len(block) > 1:
+                mid = len(block) // 2
+                pending.append(block[mid:])
+                pending.append(block[:mid])
+        deg: Dict[int, int] = {}
+        for a, b in current:
+            deg[a] = deg.get(a, 0) + 1
+            deg[b] = deg.get(b, 0) + 1
+        kind = "K5" if max(deg.values()) >= 4 else "K3,3"
+        return kind, [(nodes[a], nodes[b]) for a, b in current]
+
     # -------------------
     # CARAS y GRAFO DUAL (requiere embedding)
     # -------------------
@@ -1951,63 +4165,28 @@ class PlanarGraph:
     # -------------------
     # MST (Kruskal) and shortest path (Dijkstra) — general algorithms useful in planar graphs
     # -------------------
-    class _DSU:
-        def __init__(self):
-            self.parent = {}
-            self.rank = {}
-        def make_set(self, x):
-            if x not in self.parent:
-                self.parent[x] = x
-                self.rank[x] = 0
-        def find(self, x):
-            if self.parent[x] != x:
-                self.parent[x] = self.find(self.parent[x])
-            return self.parent[x]
-        def union(self, a, b):
-            ra, rb = self.find(a), self.find(b)
-            if ra == rb:
-                return False
-            if self.rank[ra] < self.rank[rb]:
-                ra, rb = rb, ra
-            self.parent[rb] = ra
-            if self.rank[ra] == self.rank[rb]:
-                self.rank[ra] += 1
-            return True
-
     def kruskal_mst(self) -> Tuple[List[Tuple[Any, Any, float]], float]:
         """Kruskal (works for planar graphs too). Retorna list of edges (u,v,w) and total weight."""
-        edges = self.get_edges()
-        edges_sorted = sorted(edges, key=lambda x: x[2])
-        dsu = PlanarGraph._DSU()
-        for u in self.adj:
-            dsu.make_set(u)
-        mst = []
-        total = 0.0
-        for u, v, w in edges_sorted:
-            if dsu.union(u, v):
-                mst.append((u, v, w))
-                total += w
-            if len(mst) == max(0, len(self.adj)-1):
-                break
+        mst = kruskal_edges(self.adj, self.get_edges())
+        total = sum(w for _, _, w in mst)
         return mst, total
 
-    def dijkstra(self, start: Any) -> Tuple[Dict[Any, float], Dict[Any, Optional[Any]]]:
+    def dijkstra(self, start: Any, queue: Any = None) -> Tuple[Dict[Any, float], Dict[Any, Optional[Any]]]:
         if start not in self.adj:
             raise KeyError("Start node not in graph")
         dist = {u: float('inf') for u in self.adj}
         prev = {u: None for u in self.adj}
         dist[start] = 0
-        pq = [(0, start)]
+        pq = make_queue(queue)
+        pq.push(start, 0)
         while pq:
-            d,u = heapq.heappop(pq)
-            if d > dist[u]:
-                continue
+            d, u = pq.pop()
             for v, w in self.adj[u].items():
                 nd = d + w
                 if nd < dist[v]:
                     dist[v] = nd
                     prev[v] = u
-                    heapq.heappush(pq, (nd, v))
+                    pq.push(v, nd)
         return dist, prev
 
     # -------------------
@@ -2054,10 +4233,23 @@ if __name__ == "__main__":
     }
     G.set_embedding(embedding)
     faces = G.faces_from_embedding()
-    print("Faces (requiere embedding):", faces)
+    print("Faces (embedding manual):", faces)
+
+    # Test exacto: calcula y guarda el embedding sin construirlo a mano
+    ok, emb = G.check_planarity()
+    print("Planar (left-right):", ok, emb)
+    faces = G.faces_from_embedding()
+    print("Faces (embedding calculado):", faces)
     dual = G.dual_from_embedding()
     print("Dual:", dual)
 
+    # K3,3 no es planar: el testigo de Kuratowski son sus 9 aristas
+    K = PlanarGraph(directed=False)
+    for a in ("x", "y", "z"):
+        for b in (1, 2, 3):
+            K.add_edge(a, b)
+    print("K3,3 planar?", K.check_planarity(counterexample=True))
+
 
 
 
@@ -2078,6 +4270,11 @@ from collections import deque
 import math
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa la matriz de listas
+    np = None
+
 INF = float('inf')
 
 class DenseGraph:
@@ -2087,9 +4284,12 @@ class DenseGraph:
     - nodes: lista de nodos (cualquier hashable). Internamente mantenemos mapping node->index.
     - adj: matriz n x n (lista de listas) con peso (float) o math.inf si no hay arista.
     - Si el grafo es no ponderado, usa peso 1.0 por defecto al añadir arista.
+    - use_numpy=True (si NumPy está instalado): adj es una vista n x n de una matriz float64 con capacidad
+      que se duplica al crecer; BFS/Dijkstra/Prim/Floyd–Warshall/cierre transitivo operan por filas vectorizadas.
     """
 
-    def __init__(self, directed: bool = False, weighted: bool = False, default_weight: float = 1.0):
+    def __init__(self, directed: bool = False, weighted: bool = False, default_weight: float = 1.0,
+                 use_numpy: bool = False):
         self.directed = directed
         self.weighted = weighted
         self.default_weight = float(default_weight)
@@ -2097,6 +4297,10 @@ class DenseGraph:
         self.index: Dict[Any, int] = {}
         self.adj: List[List[float]] = []  # pesos; INF si no existe arista
         self._n = 0
+        self.use_numpy = use_numpy and np is not None
+        if self.use_numpy:
+            self._mat = np.full((8, 8), INF)  # buffer con capacidad; self.adj = self._mat[:n, :n]
+            self.adj = self._mat[:0, :0]
 
     # -------------------
     # UTIL INTERNA: (re)construcción de matriz
@@ -2107,6 +4311,17 @@ class DenseGraph:
             return
         self.index[u] = self._n
         self.nodes.append(u)
+        if self.use_numpy:
+            n = self._n
+            if n == self._mat.shape[0]:
+                # duplicar capacidad: coste amortizado O(n) por nodo en vez de O(n^2)
+                grown = np.full((2 * n, 2 * n), INF)
+                grown[:n, :n] = self._mat[:n, :n]
+                self._mat = grown
+            self._mat[n, n] = 0.0
+            self._n = n + 1
+            self.adj = self._mat[:n + 1, :n + 1]
+            return
         self._n += 1
         # expandir matriz por filas y columnas
         for row in self.adj:
@@ -2157,6 +4372,18 @@ class DenseGraph:
         if u not in self.index:
             raise KeyError("Node not found")
         rem_idx = self.index[u]
+        if self.use_numpy:
+            # desplazar filas/columnas posteriores una posición (NumPy gestiona el solapamiento)
+            n, M = self._n, self._mat
+            M[rem_idx:n - 1, :n] = M[rem_idx + 1:n, :n]
+            M[:n - 1, rem_idx:n - 1] = M[:n - 1, rem_idx + 1:n]
+            M[n - 1, :n] = INF
+            M[:n, n - 1] = INF
+            self.nodes.pop(rem_idx)
+            self._n = n - 1
+            self.index = {node: i for i, node in enumerate(self.nodes)}
+            self.adj = M[:n - 1, :n - 1]
+            return
         # construir nueva lista de nodos y nueva matriz copiando todas las entradas excepto rem_idx
         new_nodes = [v for i,v in enumerate(self.nodes) if i != rem_idx]
         new_n = len(new_nodes)
@@ -2215,6 +4442,14 @@ class DenseGraph:
         return self.adj[self.index[u]][self.index[v]] != INF and self.index[u] != self.index[v]
 
     def get_edges(self) -> List[Tuple[Any, Any, float]]:
+        if self.use_numpy:
+            mask = self.adj != INF
+            np.fill_diagonal(mask, False)
+            if not self.directed:
+                mask = np.triu(mask, 1)
+            I, J = np.nonzero(mask)  # orden fila a fila, igual que los bucles
+            W = self.adj[I, J].tolist()
+            return [(self.nodes[i], self.nodes[j], w) for i, j, w in zip(I.tolist(), J.tolist(), W)]
         edges = []
         n = self._n
         for i in range(n):
@@ -2235,13 +4470,26 @@ class DenseGraph:
     # UTILIDADES
     # -------------------
     def adjacency_matrix(self) -> List[List[float]]:
-        """Devuelve copia de la matriz de adyacencia (INF significa sin arista)."""
+        """
+        Devuelve copia de la matriz de adyacencia (INF significa sin arista).
+        En modo NumPy devuelve una vista de solo lectura (sin copia) de la matriz interna.
+        """
+        if self.use_numpy:
+            view = self.adj.view()
+            view.flags.writeable = False
+            return view
         return [row[:] for row in self.adj]
 
     def degree(self, u: Any) -> int:
         if u not in self.index:
             raise KeyError("Node not found")
         i = self.index[u]
+        if self.use_numpy:
+            row, col = self.adj[i], self.adj[:, i]
+            out = int(np.count_nonzero((row != INF) & (row != 0.0)))
+            if self.directed:
+                return out + int(np.count_nonzero((col != INF) & (col != 0.0)))
+            return out
         if self.directed:
             out = sum(1 for x in self.adj[i] if x != INF and x != 0.0)
             indeg = sum(1 for r in range(self._n) if self.adj[r][i] != INF and self.adj[r][i] != 0.0)
@@ -2276,7 +4524,8 @@ class DenseGraph:
             u = q.popleft()
             order.append(u)
             ui = self.index[u]
-            for v_idx in range(n):
+            row_nbrs = np.flatnonzero(self.adj[ui] != INF).tolist() if self.use_numpy else range(n)
+            for v_idx in row_nbrs:
                 if v_idx == ui:
                     continue
                 if self.adj[ui][v_idx] != INF:
@@ -2301,7 +4550,11 @@ class DenseGraph:
             order.append(u)
             ui = self.index[u]
             # push neighbors in deterministic order
-            for v_idx in range(self._n - 1, -1, -1):
+            if self.use_numpy:
+                row_nbrs = np.flatnonzero(self.adj[ui] != INF)[::-1].tolist()
+            else:
+                row_nbrs = range(self._n - 1, -1, -1)
+            for v_idx in row_nbrs:
                 if v_idx == ui:
                     continue
                 if self.adj[ui][v_idx] != INF:
@@ -2328,6 +4581,8 @@ class DenseGraph:
         if source not in self.index:
             raise KeyError("Source not in graph")
         n = self._n
+        if self.use_numpy:
+            return self._dijkstra_n2_numpy(self.index[source])
         dist = {node: INF for node in self.nodes}
         prev = {node: None for node in self.nodes}
         used = [False] * n
@@ -2356,6 +4611,27 @@ class DenseGraph:
                     prev[v_node] = u_node
         return dist, prev
 
+    def _dijkstra_n2_numpy(self, s: int) -> Tuple[Dict[Any,float], Dict[Any, Optional[Any]]]:
+        """Dijkstra O(n^2) con la selección del mínimo y la relajación de cada fila vectorizadas."""
+        n = self._n
+        A = self.adj
+        dist = np.full(n, INF)
+        prev = np.full(n, -1)
+        used = np.zeros(n, dtype=bool)
+        dist[s] = 0.0
+        for _ in range(n):
+            cand = np.where(used, INF, dist)
+            u = int(np.argmin(cand))  # primer mínimo, mismo desempate que el bucle
+            if cand[u] == INF:
+                break
+            used[u] = True
+            nd = dist[u] + A[u]
+            better = nd < dist
+            dist[better] = nd[better]
+            prev[better] = u
+        return ({self.nodes[i]: d for i, d in enumerate(dist.tolist())},
+                {self.nodes[i]: (self.nodes[p] if p >= 0 else None) for i, p in enumerate(prev.tolist())})
+
     # -------------------
     # RECONSTRUIR CAMINO desde prev (Dijkstra)
     # -------------------
@@ -2384,6 +4660,8 @@ class DenseGraph:
         n = self._n
         if n == 0:
             return [], 0.0
+        if self.use_numpy:
+            return self._prim_mst_n2_numpy()
         in_mst = [False] * n
         key = [INF] * n
         parent = [-1] * n
@@ -2412,11 +4690,67 @@ class DenseGraph:
                     parent[v] = u
         return edges, total
 
+    def _prim_mst_n2_numpy(self) -> Tuple[List[Tuple[Any, Any, float]], float]:
+        n = self._n
+        A = self.adj
+        in_mst = np.zeros(n, dtype=bool)
+        key = np.full(n, INF)
+        parent = np.full(n, -1)
+        key[0] = 0.0
+        total = 0.0
+        edges = []
+        for _ in range(n):
+            cand = np.where(in_mst, INF, key)
+            u = int(np.argmin(cand))
+            if cand[u] == INF:
+                break
+            in_mst[u] = True
+            p = int(parent[u])
+            if p != -1:
+                w = float(A[p, u])
+                edges.append((self.nodes[p], self.nodes[u], w))
+                total += w
+            better = ~in_mst & (A[u] < key)
+            key[better] = A[u][better]
+            parent[better] = u
+        return edges, total
+
     # -------------------
     # FLOYD-WARSHALL (APSP) O(n^3) — retorna dist_matrix y next dict para reconstruir caminos
     # -------------------
+    def floyd_warshall_matrix(self, block: int = 512):
+        """
+        Floyd–Warshall vectorizado (solo modo NumPy). Para cada k actualiza la matriz por bloques de
+        `block` filas con dist[i, k] + dist[k, :] (broadcast), acotando la memoria temporal a block x n.
+        Retorna (dist, nxt) como ndarrays: nxt[i, j] = índice del siguiente nodo en el camino i->j, o -1.
+        """
+        if not self.use_numpy:
+            raise ValueError("floyd_warshall_matrix requires use_numpy=True")
+        n = self._n
+        D = np.array(self.adj, dtype=np.float64)
+        np.fill_diagonal(D, 0.0)
+        nxt = np.where(D != INF, np.arange(n)[None, :], -1)
+        for k in range(n):
+            row_k = D[k].copy()
+            col_k = D[:, k].copy()
+            nxt_k = nxt[:, k].copy()
+            for b in range(0, n, block):
+                e = min(n, b + block)
+                cand = col_k[b:e, None] + row_k[None, :]
+                better = cand < D[b:e]
+                np.copyto(D[b:e], cand, where=better)
+                np.copyto(nxt[b:e], nxt_k[b:e, None], where=better)
+        return D, nxt
+
     def floyd_warshall(self) -> Tuple[Dict[Any, Dict[Any, float]], Dict[Any, Dict[Any, Optional[Any]]]]:
         n = self._n
+        if self.use_numpy:
+            D, nxt = self.floyd_warshall_matrix()
+            nodes = self.nodes
+            dist_dict = {nodes[i]: dict(zip(nodes, row)) for i, row in enumerate(D.tolist())}
+            next_dict = {nodes[i]: {nodes[j]: (nodes[x] if x >= 0 else None) for j, x in enumerate(row)}
+                         for i, row in enumerate(nxt.tolist())}
+            return dist_dict, next_dict
         # init dist and next
         dist = [[INF]*n for _ in range(n)]
         nxt = [[None]*n for _ in range(n)]
@@ -2461,33 +4795,65 @@ class DenseGraph:
     # -------------------
     # TRANSITIVE CLOSURE (reachability) via Floyd-Warshall boolean (O(n^3))
     # -------------------
-    def transitive_closure(self) -> Dict[Any, Dict[Any, bool]]:
+    def transitive_closure_bitsets(self) -> List[int]:
+        """
+        Cierre transitivo con bitsets: fila i = entero cuyo bit j indica si j es alcanzable desde i.
+        Para cada k, toda fila que alcanza k hace OR con la fila k (n/64 palabras por operación en vez de n).
+        En modo NumPy las filas se empaquetan con packbits y el OR se aplica a todas las filas a la vez.
+        """
         n = self._n
-        reach = [[False]*n for _ in range(n)]
+        if n == 0:
+            return []
+        if self.use_numpy:
+            A = self.adj != INF
+            np.fill_diagonal(A, True)
+            R = np.packbits(A, axis=1, bitorder='little')
+            for k in range(n):
+                rows = np.flatnonzero(R[:, k >> 3] & (1 << (k & 7)))
+                R[rows] |= R[k]
+            return [int.from_bytes(R[i].tobytes(), 'little') for i in range(n)]
+        reach = []
         for i in range(n):
-            for j in range(n):
-                if self.adj[i][j] != INF and i != j:
-                    reach[i][j] = True
-            reach[i][i] = True
+            bits = 1 << i
+            for j, w in enumerate(self.adj[i]):
+                if w != INF:
+                    bits |= 1 << j
+            reach.append(bits)
         for k in range(n):
+            bit_k = 1 << k
+            row_k = reach[k]
             for i in range(n):
-                if not reach[i][k]:
-                    continue
-                for j in range(n):
-                    if reach[k][j]:
-                        reach[i][j] = True
-        return {self.nodes[i]: {self.nodes[j]: reach[i][j] for j in range(n)} for i in range(n)}
+                if reach[i] & bit_k:
+                    reach[i] |= row_k
+        return reach
+
+    def transitive_closure(self) -> Dict[Any, Dict[Any, bool]]:
+        n = self._n
+        closure = {}
+        for i, bits in enumerate(self.transitive_closure_bitsets()):
+            row = format(bits, 'b').zfill(n)[::-1]  # row[j] == '1' si j alcanzable
+            closure[self.nodes[i]] = {self.nodes[j]: row[j] == '1' for j in range(n)}
+        return closure
 
     # -------------------
     # COMPLEMENTO
     # -------------------
     def complement(self) -> 'DenseGraph':
         """Devuelve el grafo complemento (mismos nodos, aristas invertidas; sin lazos)."""
-        g = DenseGraph(directed=self.directed, weighted=self.weighted, default_weight=self.default_weight)
+        g = DenseGraph(directed=self.directed, weighted=self.weighted, default_weight=self.default_weight,
+                       use_numpy=self.use_numpy)
         # create nodes
         for u in self.nodes:
             g.add_node(u)
         n = self._n
+        if self.use_numpy:
+            M = np.where(self.adj == INF, self.default_weight, INF)
+            np.fill_diagonal(M, 0.0)
+            if not self.directed:
+                low = np.tril_indices(n, -1)
+                M[low] = M.T[low]  # igual que el bucle: el triángulo inferior copia al superior
+            g.adj[:, :] = M
+            return g
         for i in range(n):
             for j in range(n):
                 if i == j:
@@ -2552,6 +4918,16 @@ if __name__ == "__main__":
     comp = G.complement()
     print("Complement edges:", comp.get_edges())
 
+    # Modo NumPy: matriz con capacidad amortizada, Floyd–Warshall vectorizado y cierre con bitsets
+    if np is not None:
+        N = DenseGraph(directed=True, weighted=True, use_numpy=True)
+        for u, v, w in [("A","B",2.0), ("B","C",1.0), ("A","C",5.0), ("C","D",3.0)]:
+            N.add_edge(u, v, w)
+        D, nxt = N.floyd_warshall_matrix()
+        print("FW (NumPy) A->D:", D[N.index["A"], N.index["D"]])
+        print("Reachable D->A? (bitsets)", N.transitive_closure()["D"]["A"])
+        print("Vista de la matriz (sin copia):", N.adjacency_matrix().base is not None)
+
 
 
 
@@ -2560,18 +4936,312 @@ if __name__ == "__main__":
 
 #Disperso. Código — sparse_graph.py
 # sparse_graph.py
+from array import array
 from collections import deque, defaultdict
 import heapq
-from typing import Any, Dict, List, Tuple, Optional, Set
+from itertools import chain, repeat
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Optional, Set
 
 INF = float('inf')
 
+# -------------------------
+# FORMATO BINARIO CSR (.gcsr) CON CARGA POR MMAP
+# Cabecera fija + secciones alineadas a 8 bytes; la tabla de contenidos es un JSON al final del fichero:
+#   offsets (int64, n+1) | targets (int32, m) | weights (float64, m, opcional) | ids | columnas
+# ids: implícitos 0..n-1 (no ocupan nada), tabla int64 o JSON (las tuplas vuelven como tuplas).
+# Columnas de atributos por nodo (filas = ids) o por arista (filas = posiciones de targets):
+# 'q'/'d' si todas las filas tienen un int/float, si no JSON disperso [[fila, valor], ...].
+# -------------------------
+GCSR_MAGIC = b"GCSR"
+GCSR_VERSION = 1
+_GCSR_HEADER = struct.Struct("<4sHHqqqq")  # magic, version, flags, n, m, meta_offset, meta_len
+_GCSR_DIRECTED, _GCSR_WEIGHTED, _GCSR_BIG_ENDIAN = 1, 2, 4
+
+def _gcsr_key(x: Any) -> Any:
+    """JSON convierte tuplas en listas; los ids deben volver hashables."""
+    return tuple(_gcsr_key(y) for y in x) if isinstance(x, list) else x
+
+def _gcsr_blob(code: str, seq: Any) -> Any:
+    if isinstance(seq, array) and seq.typecode == code:
+        return seq
+    if isinstance(seq, memoryview) and seq.format == code:
+        return seq
+    return array(code, seq)
+
+def _gcsr_column(rows: Dict[int, Any], count: int) -> Tuple[str, Any]:
+    """Elige la codificación de una columna: 'q'/'d' densas si todas las filas tienen valor del mismo tipo."""
+    if len(rows) == count and count > 0:
+        kinds = {type(v) for v in rows.values()}
+        if kinds == {int} and all(-2**63 <= v < 2**63 for v in rows.values()):
+            return 'q', array('q', (rows[i] for i in range(count)))
+        if kinds == {float}:
+            return 'd', array('d', (rows[i] for i in range(count)))
+    return 'json', json.dumps(sorted(rows.items())).encode("utf-8")
+
+def column_rows(col: Any) -> Iterable[Tuple[int, Any]]:
+    """(fila, valor) de una columna leída por GraphFile (densa o dispersa)."""
+    return col.items() if isinstance(col, dict) else enumerate(col)
+
+def write_gcsr(path: str, ids: List[Any], offsets: Iterable[int], targets: Iterable[int],
+               weights: Optional[Iterable[float]] = None, directed: bool = True,
+               node_columns: Optional[Dict[str, Dict[int, Any]]] = None,
+               edge_columns: Optional[Dict[str, Dict[int, Any]]] = None,
+               extra: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Escribe un grafo en formato .gcsr. Vecinos de ids[i]: targets[offsets[i]:offsets[i+1]].
+    node_columns / edge_columns: nombre -> {fila: valor}. extra: metadatos JSON de la clase que guarda.
+    Los ids y los atributos no numéricos deben ser serializables en JSON. Devuelve los bytes escritos.
+    """
+    n = len(ids)
+    flags = (_GCSR_DIRECTED if directed else 0) | (_GCSR_BIG_ENDIAN if sys.byteorder == "big" else 0)
+    if weights is not None:
+        flags |= _GCSR_WEIGHTED
+    meta: Dict[str, Any] = {"extra": extra or {}, "node_columns": {}, "edge_columns": {}}
+    with open(path, "wb") as f:
+        f.write(bytes(_GCSR_HEADER.size))
+
+        def put(data: Any) -> List[int]:
+            f.write(bytes(-f.tell() % 8))
+            pos = f.tell()
+            if isinstance(data, array):
+                data.tofile(f)
+            else:
+                f.write(data)
+            return [pos, f.tell() - pos]
+
+        meta["offsets"] = put(_gcsr_blob('q', offsets))
+        tg = _gcsr_blob('i', targets)
+        m = len(tg)
+        meta["targets"] = put(tg)
+        if weights is not None:
+            meta["weights"] = put(_gcsr_blob('d', weights))
+        if isinstance(ids, range) and ids.start == 0 and ids.step == 1:
+            meta["ids"] = {"kind": "range"}
+        elif all(type(u) is int for u in ids):
+            kind = "range" if all(u == i for i, u in enumerate(ids)) else "int"
+            meta["ids"] = {"kind": kind} if kind == "range" else {"kind": "int", "at": put(array('q', ids))}
+        else:
+            meta["ids"] = {"kind": "json", "at": put(json.dumps(list(ids)).encode("utf-8"))}
+        for key, cols, count in (("node_columns", node_columns, n), ("edge_columns", edge_columns, m)):
+            for name, rows in (cols or {}).items():
+                code, data = _gcsr_column(rows, count)
+                meta[key][name] = {"type": code, "at": put(data)}
+        blob = json.dumps(meta).encode("utf-8")
+        meta_offset = f.tell()
+        f.write(blob)
+        size = f.tell()
+        f.seek(0)
+        f.write(_GCSR_HEADER.pack(GCSR_MAGIC, GCSR_VERSION, flags, n, m, meta_offset, len(blob)))
+    return size
+
+class _RangeIndex:
+    """index implícito para ids 0..n-1: evita construir un dict de n entradas al abrir el fichero."""
+    __slots__ = ("n",)
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __contains__(self, u: Any) -> bool:
+        return isinstance(u, int) and 0 <= u < self.n
+
+    def __getitem__(self, u: Any) -> int:
+        if u in self:
+            return u
+        raise KeyError(u)
+
+    def get(self, u: Any, default: Any = None) -> Any:
+        return u if u in self else default
+
+    def __iter__(self):
+        return iter(range(self.n))
+
+class GraphFile:
+    """
+    Lector de ficheros .gcsr. Con use_mmap=True las secciones numéricas son memoryviews sobre el fichero
+    mapeado (copy-on-write: se pueden escribir sin tocar el disco): abrir solo decodifica la cabecera,
+    la tabla de contenidos y la tabla de ids si es JSON, así que el coste no depende del número de aristas.
+    Con use_mmap=False, o si el orden de bytes del fichero no es el de la máquina, se copian a array.
+    Atributos: directed, weighted, n, m, ids, index, offsets, targets, weights (o None),
+    node_columns / edge_columns (nombre -> secuencia densa o dict fila -> valor) y extra.
+    close() (o salir del with) invalida las vistas: copiar lo que se necesite antes.
+    """
+
+    def __init__(self, path: str, use_mmap: bool = True):
+        self._file = open(path, "rb")
+        self._mm: Optional[mmap.mmap] = None
+        self._views: List[memoryview] = []
+        self._index: Any = None
+        try:
+            head = self._file.read(_GCSR_HEADER.size)
+            if len(head) != _GCSR_HEADER.size:
+                raise ValueError("Not a GCSR graph file")
+            magic, version, flags, n, m, meta_offset, meta_len = _GCSR_HEADER.unpack(head)
+            if magic != GCSR_MAGIC:
+                raise ValueError("Not a GCSR graph file")
+            if version > GCSR_VERSION:
+                raise ValueError(f"Unsupported GCSR version {version}")
+            self._file.seek(meta_offset)
+            meta = json.loads(self._file.read(meta_len).decode("utf-8"))
+            self._swap = bool(flags & _GCSR_BIG_ENDIAN) != (sys.byteorder == "big")
+            if use_mmap and not self._swap:
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+            self.directed = bool(flags & _GCSR_DIRECTED)
+            self.weighted = bool(flags & _GCSR_WEIGHTED)
+            self.n, self.m = n, m
+            self.extra: Dict[str, Any] = meta.get("extra", {})
+            self.offsets = self._section('q', meta["offsets"])
+            self.targets = self._section('i', meta["targets"])
+            self.weights = self._section('d', meta["weights"]) if self.weighted else None
+            kind = meta["ids"]["kind"]
+            if kind == "range":
+                self.ids: Any = range(n)
+            elif kind == "int":
+                self.ids = self._section('q', meta["ids"]["at"])
+            else:
+                self.ids = [_gcsr_key(u) for u in json.loads(self._raw(meta["ids"]["at"]).decode("utf-8"))]
+            self.node_columns = {name: self._column(c) for name, c in meta.get("node_columns", {}).items()}
+            self.edge_columns = {name: self._column(c) for name, c in meta.get("edge_columns", {}).items()}
+        except Exception:
+            self.close()
+            raise
+
+    def _raw(self, at: List[int]) -> bytes:
+        self._file.seek(at[0])
+        return self._file.read(at[1])
+
+    def _section(self, code: str, at: List[int]) -> Any:
+        if self._mm is not None:
+            view = memoryview(self._mm)[at[0]:at[0] + at[1]].cast(code)
+            self._views.append(view)
+            return view
+        arr = array(code)
+        arr.frombytes(self._raw(at))
+        if self._swap:
+            arr.byteswap()
+        return arr
+
+    def _column(self, desc: Dict[str, Any]) -> Any:
+        if desc["type"] == "json":
+            return {row: value for row, value in json.loads(self._raw(desc["at"]).decode("utf-8"))}
+        return self._section(desc["type"], desc["at"])
+
+    @property
+    def index(self) -> Any:
+        """node id -> fila (se construye al primer uso; con ids implícitos no ocupa memoria)."""
+        if self._index is None:
+            self._index = _RangeIndex(self.n) if isinstance(self.ids, range) else {u: i for i, u in enumerate(self.ids)}
+        return self._index
+
+    def rows(self) -> Iterable[Tuple[Any, List[Any], Optional[List[float]]]]:
+        """(nodo, vecinos, pesos o None) por fila, ya traducidos a node ids (para reconstruir dicts)."""
+        ids, off, tg, ws = self.ids, self.offsets, self.targets, self.weights
+        for i in range(self.n):
+            a, b = off[i], off[i + 1]
+            nbrs = [ids[t] for t in tg[a:b].tolist()]
+            yield ids[i], nbrs, (ws[a:b].tolist() if ws is not None else None)
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> 'GraphFile':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class CSRAdjacency:
+    """
+    Adyacencia congelada en formato CSR (compressed sparse row):
+      - ids[i] -> node id ; index[node id] -> i
+      - vecinos de i: targets[offsets[i]:offsets[i+1]], pesos en weights[offsets[i]:offsets[i+1]]
+    Conserva el orden de las listas de adyacencia originales (mismos recorridos que con dicts).
+    """
+
+    def __init__(self, adj: Dict[Any, List[Tuple[Any, float]]]):
+        self.ids: List[Any] = list(adj.keys())
+        self.index: Dict[Any, int] = {u: i for i, u in enumerate(self.ids)}
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+        self.weights = array('d')
+        index = self.index
+        for u in self.ids:
+            for v, w in adj[u]:
+                self.targets.append(index[v])
+                self.weights.append(w)
+            self.offsets.append(len(self.targets))
+        self._rev: Optional[Tuple[array, array]] = None
+        self._rev_pos: Optional[array] = None  # posición k (en targets/weights) de cada arista entrante
+
+    @classmethod
+    def from_arrays(cls, ids: Any, index: Any, offsets: Any, targets: Any, weights: Any) -> 'CSRAdjacency':
+        """CSR sobre arrays ya construidos (p. ej. las vistas mmap de un GraphFile), sin copiarlos."""
+        c = cls.__new__(cls)
+        c.ids, c.index = ids, index
+        c.offsets, c.targets, c.weights = offsets, targets, weights
+        c._rev = None
+        c._rev_pos = None
+        return c
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def reverse(self) -> Tuple[array, array]:
+        """(offsets, sources) de las aristas entrantes, en orden de nodo origen. Se calcula una vez (counting sort)."""
+        if self._rev is None:
+            n = len(self.ids)
+            off, tg = self.offsets, self.targets
+            start = [0] * (n + 1)
+            for v in tg:
+                start[v + 1] += 1
+            for i in range(n):
+                start[i + 1] += start[i]
+            fill = start[:-1]
+            src = array('i', [0]) * len(tg)
+            pos = array('i', [0]) * len(tg)
+            for u in range(n):
+                for k in range(off[u], off[u + 1]):
+                    v = tg[k]
+                    src[fill[v]] = u
+                    pos[fill[v]] = k
+                    fill[v] += 1
+            self._rev = (array('i', start), src)
+            self._rev_pos = pos
+        return self._rev
+
+    def reverse_edges(self) -> Tuple[array, array, array]:
+        """(offsets, sources, pos): como reverse() más la posición de cada arista en weights (pesos siempre al día)."""
+        offsets, sources = self.reverse()
+        return offsets, sources, self._rev_pos
+
+    def to_adj(self) -> Dict[Any, List[Tuple[Any, float]]]:
+        ids, off, tg, ws = self.ids, self.offsets, self.targets, self.weights
+        return {ids[i]: [(ids[tg[k]], ws[k]) for k in range(off[i], off[i + 1])] for i in range(len(ids))}
+
 class SparseGraph:
     """
     Grafo disperso con listas de adyacencia.
     - directed: True = grafo dirigido; False = no dirigido.
     - weighted: True si las aristas tienen peso (float). Si weighted=False se usa weight=1 por defecto.
     Representación: adj[node] -> list of (neighbor, weight)
+    freeze() cambia a una representación CSR compacta (CSRAdjacency) sobre la que corren directamente los
+    algoritmos; thaw() vuelve a las listas para seguir mutando. Congelado solo se permite update_edge_weight.
     """
 
     def __init__(self, directed: bool = False, weighted: bool = False):
@@ -2579,23 +5249,124 @@ class SparseGraph:
         self.weighted = weighted
         self.adj: Dict[Any, List[Tuple[Any, float]]] = {}
         self._edge_count = 0
+        self._csr: Optional[CSRAdjacency] = None
+        self._radj: Optional[Dict[Any, List[Tuple[Any, float]]]] = None  # entrantes (dirigido), se invalida al mutar
+
+    # -------------------
+    # FREEZE / THAW (CSR)
+    # -------------------
+    def freeze(self) -> None:
+        """Convierte adj a CSR (array('i') offsets/targets + array('d') weights) y libera los dicts."""
+        if self._csr is None:
+            self._csr = CSRAdjacency(self.adj)
+            self.adj = None
+            self._radj = None
+
+    def thaw(self) -> None:
+        """Reconstruye adj (listas) desde el CSR para permitir mutaciones."""
+        if self._csr is not None:
+            self.adj = self._csr.to_adj()
+            self._csr = None
+
+    def is_frozen(self) -> bool:
+        return self._csr is not None
+
+    # -------------------
+    # CARGA MASIVA (ver iter_edge_chunks / ingest_edges)
+    # -------------------
+    def load_edge_list(self, source: Any, **options: Any) -> Dict[str, Any]:
+        """
+        Cada línea/tupla se añade como en add_edge (las paralelas se conservan y los nodos aparecen en el mismo
+        orden). Por bloque: las aristas se agrupan por origen y cada lista de adyacencia recibe un solo extend.
+        Sin peso: 1.0, o ValueError si weighted=True (el bloque con la arista sin peso no se añade).
+        Retorna el informe de ingest_edges más "nodes".
+        """
+        self._check_mutable()
+        adj, directed, weighted = self.adj, self.directed, self.weighted
+        self._radj = None
+
+        def consume(chunk: Tuple[List[Any], List[Any], Any]) -> int:
+            us, vs, ws = chunk
+            if ws is None or None in ws:
+                if weighted:
+                    raise ValueError("Edge weight required for weighted graph")
+                ws = repeat(1.0) if ws is None else [1.0 if w is None else float(w) for w in ws]
+            else:
+                ws = list(map(float, ws))
+            entries: Iterable[Tuple[Any, Tuple[Any, float]]] = zip(us, zip(vs, ws))
+            if not directed:  # (u, v) y (v, u) intercalados, como add_edge
+                entries = chain.from_iterable(zip(entries, zip(vs, zip(us, ws))))
+            rows: Dict[Any, List[Tuple[Any, float]]] = defaultdict(list)
+            for u, e in entries:
+                rows[u].append(e)
+            for x in dict.fromkeys(chain.from_iterable(zip(us, vs))):
+                if x not in adj:
+                    adj[x] = []
+            for u, row in rows.items():
+                if adj[u]:
+                    adj[u].extend(row)
+                else:
+                    adj[u] = row
+            self._edge_count += len(us)
+            return len(us)
+
+        report = ingest_edges(source, consume, **options)
+        report["nodes"] = len(adj)
+        return report
+
+    # -------------------
+    # SERIALIZACIÓN BINARIA (.gcsr, ver write_gcsr / GraphFile)
+    # -------------------
+    def save(self, path: str) -> int:
+        """Guarda el CSR (el congelado o uno temporal si el grafo no lo está) con pesos en formato .gcsr."""
+        c = self._csr if self._csr is not None else CSRAdjacency(self.adj)
+        return write_gcsr(path, c.ids, c.offsets, c.targets, c.weights, self.directed,
+                          extra={"class": "SparseGraph", "weighted": self.weighted, "edge_count": self._edge_count})
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True) -> 'SparseGraph':
+        """
+        Abre un .gcsr como grafo congelado cuyo CSR son directamente las vistas del fichero mapeado:
+        no se crean dicts ni listas por arista y los algoritmos sobre CSR corren sobre el mapeo.
+        update_edge_weight escribe en la copia en memoria (copy-on-write), nunca en el fichero;
+        thaw() copia a listas. Sin sección de pesos se usa 1.0.
+        """
+        gf = GraphFile(path, use_mmap)
+        g = cls(directed=gf.directed, weighted=gf.extra.get("weighted", gf.weighted))
+        weights = gf.weights if gf.weights is not None else array('d', [1.0]) * gf.m
+        g._csr = CSRAdjacency.from_arrays(gf.ids, gf.index, gf.offsets, gf.targets, weights)
+        g._csr._file = gf  # mantiene vivo el mapeo mientras exista el CSR
+        g.adj = None
+        g._edge_count = gf.extra.get("edge_count", gf.m if gf.directed else gf.m // 2)
+        return g
+
+    def _check_mutable(self) -> None:
+        if self._csr is not None:
+            raise ValueError("Graph is frozen; call thaw() before mutating it")
 
     # -------------------
     # CRUD NODOS
     # -------------------
     def add_node(self, u: Any) -> None:
+        self._check_mutable()
         if u not in self.adj:
             self.adj[u] = []
+            self._radj = None
 
     def get_nodes(self) -> List[Any]:
+        if self._csr is not None:
+            return list(self._csr.ids)
         return list(self.adj.keys())
 
     def remove_node(self, u: Any) -> None:
+        self._check_mutable()
         if u not in self.adj:
             raise KeyError("Node not found")
-        # eliminar aristas incidentes
-        del self.adj[u]
-        for v in list(self.adj.keys()):
+        self._radj = None
+        # eliminar aristas incidentes: en no dirigido basta con reescribir las listas de los vecinos
+        nbrs = self.adj.pop(u)
+        touched = list(self.adj.keys()) if self.directed else {v for v, _ in nbrs if v != u}
+        for v in touched:
             # filtrar aristas hacia u
             new_list = [(nei,w) for (nei,w) in self.adj[v] if nei != u]
             self.adj[v] = new_list
@@ -2610,6 +5381,7 @@ class SparseGraph:
         Añade arista u->v (o u-v si no dirigido). Si weight es None y weighted==False se usa 1.0.
         Si weighted==True y weight is None -> lanza ValueError.
         """
+        self._check_mutable()
         if weight is None:
             if self.weighted:
                 raise ValueError("Edge weight required for weighted graph")
@@ -2617,6 +5389,7 @@ class SparseGraph:
         else:
             w = float(weight)
         self.add_node(u); self.add_node(v)
+        self._radj = None
         self.adj[u].append((v, w))
         if not self.directed:
             self.adj[v].append((u, w))
@@ -2626,8 +5399,9 @@ class SparseGraph:
         """Devuelve lista (u, v, w). En no dirigido habrá duplicados en adj; filtramos para mostrar cada par una vez."""
         edges = []
         seen = set()
-        for u in self.adj:
-            for v, w in self.adj[u]:
+        adj = self._csr.to_adj() if self._csr is not None else self.adj
+        for u in adj:
+            for v, w in adj[u]:
                 if self.directed:
                     edges.append((u, v, w))
                 else:
@@ -2639,8 +5413,10 @@ class SparseGraph:
         return edges
 
     def remove_edge(self, u: Any, v: Any) -> None:
+        self._check_mutable()
         if u not in self.adj or v not in self.adj:
             raise KeyError("One or both nodes not found")
+        self._radj = None
         before_u = len(self.adj[u])
         self.adj[u] = [(nei,w) for (nei,w) in self.adj[u] if nei != v]
         if not self.directed:
@@ -2650,6 +5426,16 @@ class SparseGraph:
             self._edge_count -= 1
 
     def update_edge_weight(self, u: Any, v: Any, new_weight: float) -> None:
+        if self._csr is not None:
+            # congelado: se reescribe el peso en el array sin descongelar
+            c = self._csr
+            if u not in c.index:
+                raise KeyError("Node not found")
+            if not self._set_csr_weight(c.index[u], c.index.get(v, -1), new_weight):
+                raise KeyError("Edge not found")
+            if not self.directed:
+                self._set_csr_weight(c.index[v], c.index[u], new_weight)
+            return
         if u not in self.adj:
             raise KeyError("Node not found")
         found = False
@@ -2660,6 +5446,7 @@ class SparseGraph:
                 break
         if not found:
             raise KeyError("Edge not found")
+        self._radj = None
         if not self.directed:
             # actualizar espejo
             for i,(nei,w) in enumerate(self.adj[v]):
@@ -2667,6 +5454,14 @@ class SparseGraph:
                     self.adj[v][i] = (nei, float(new_weight))
                     break
 
+    def _set_csr_weight(self, i: int, j: int, w: float) -> bool:
+        c = self._csr
+        for k in range(c.offsets[i], c.offsets[i + 1]):
+            if c.targets[k] == j:
+                c.weights[k] = float(w)
+                return True
+        return False
+
     def _recompute_edge_count(self) -> None:
         if self.directed:
             self._edge_count = sum(len(lst) for lst in self.adj.values())
@@ -2677,6 +5472,8 @@ class SparseGraph:
     # BÁSICOS: BFS / DFS / connected components
     # -------------------
     def bfs(self, start: Any) -> Tuple[List[Any], Dict[Any,int], Dict[Any, Optional[Any]]]:
+        if self._csr is not None:
+            return self._bfs_csr(start)
         if start not in self.adj:
             raise KeyError("Start node not in graph")
         dist = {u: -1 for u in self.adj}
@@ -2695,6 +5492,8 @@ class SparseGraph:
         return order, dist, prev
 
     def dfs(self, start: Any) -> List[Any]:
+        if self._csr is not None:
+            return self._dfs_csr(start)
         if start not in self.adj:
             raise KeyError("Start node not in graph")
         visited = set()
@@ -2713,6 +5512,8 @@ class SparseGraph:
 
     def connected_components(self) -> List[List[Any]]:
         """Para grafos no dirigidos devuelve componentes conectadas; si dirigido devuelve componentes débilmente conectadas."""
+        if self._csr is not None:
+            return self._connected_components_csr()
         visited = set()
         comps = []
         for node in self.adj:
@@ -2740,41 +5541,126 @@ class SparseGraph:
         return comps
 
     def is_connected(self) -> bool:
-        if not self.adj:
+        nodes = self.get_nodes()
+        if not nodes:
             return True
         if self.directed:
             # weak connectivity check
             return len(self.connected_components()) == 1
-        start = next(iter(self.adj))
+        start = nodes[0]
         _, dist, _ = self.bfs(start)
         return all(d != -1 for d in dist.values())
 
     # -------------------
     # DIJKSTRA (heap) - O(E log V)
     # -------------------
-    def dijkstra(self, source: Any) -> Tuple[Dict[Any,float], Dict[Any, Optional[Any]]]:
+    def dijkstra(self, source: Any, queue: Any = None) -> Tuple[Dict[Any,float], Dict[Any, Optional[Any]]]:
+        if self._csr is not None:
+            return self._dijkstra_csr(source, queue)
         if source not in self.adj:
             raise KeyError("Source not in graph")
         dist = {u: INF for u in self.adj}
         prev = {u: None for u in self.adj}
         dist[source] = 0.0
-        pq = [(0.0, source)]
+        pq = make_queue(queue)
+        pq.push(source, 0.0)
         while pq:
-            d,u = heapq.heappop(pq)
-            if d > dist[u]:
-                continue
+            d, u = pq.pop()
             for v,w in self.adj[u]:
                 nd = d + (w if self.weighted else 1.0)
                 if nd < dist[v]:
                     dist[v] = nd
                     prev[v] = u
-                    heapq.heappush(pq, (nd, v))
+                    pq.push(v, nd)
         return dist, prev
 
+    # -------------------
+    # CONSULTAS PUNTO A PUNTO (start -> goal): Dijkstra con parada temprana, bidireccional y A*
+    # Retornan (dist, path, settled): path=None si goal no es alcanzable; settled = nodos extraídos
+    # del heap, para comparar cuánto trabajo hace cada variante.
+    # -------------------
+    def dijkstra_to(self, source: Any, target: Any, queue: Any = None) -> Tuple[float, Optional[List[Any]], int]:
+        """
+        Dijkstra desde source que se detiene en cuanto target queda asentado.
+        queue: cola de prioridad (None = heapq; ver make_queue).
+        """
+        return self.astar(source, target, queue=queue)
+
+    def astar(self, source: Any, target: Any,
+              heuristic: Optional[Callable[[Any, Any], float]] = None, queue: Any = None) -> Tuple[float, Optional[List[Any]], int]:
+        """
+        A*: heuristic(u, target) (sobre node ids) debe ser una cota inferior de la distancia u->target
+        para garantizar el óptimo. Sin heurística equivale a dijkstra_to. Funciona también congelado.
+        queue: cola de prioridad (None = heapq; ver make_queue).
+        """
+        s, t, out, _, ids = self._query_access(source, target, backward=False)
+        if heuristic is None:
+            h = lambda u: 0.0
+        elif ids is None:
+            h = lambda u: heuristic(u, target)
+        else:
+            h = lambda i: heuristic(ids[i], target)
+        return self._map_query(astar_search(out, s, t, h, queue), ids)
+
+    def bidirectional_dijkstra(self, source: Any, target: Any, queue: Any = None) -> Tuple[float, Optional[List[Any]], int]:
+        """
+        Dijkstra bidireccional: desde source sobre las aristas salientes y desde target sobre las entrantes
+        (congelado usa CSRAdjacency.reverse_edges(); con listas, una adyacencia inversa cacheada).
+        queue: cola de prioridad (None = heapq; ver make_queue).
+        """
+        s, t, out, inc, ids = self._query_access(source, target, backward=True)
+        return self._map_query(bidirectional_search(out, inc, s, t, queue), ids)
+
+    def _query_access(self, source: Any, target: Any, backward: bool):
+        """(s, t, out, inc, ids): extremos y funciones vecino -> (v, w), sobre node ids o índices CSR (ids != None)."""
+        weighted = self.weighted
+        c = self._csr
+        if c is None:
+            if source not in self.adj or target not in self.adj:
+                raise KeyError("Source or target not in graph")
+            adj = self.adj
+            out = adj.__getitem__ if weighted else (lambda u: ((v, 1.0) for v, _ in adj[u]))
+            inc = out
+            if backward and self.directed:
+                radj = self._reverse_adj()
+                inc = radj.__getitem__ if weighted else (lambda u: ((v, 1.0) for v, _ in radj[u]))
+            return source, target, out, inc, None
+        s = self._source_index(source, "Source or target not in graph")
+        t = self._source_index(target, "Source or target not in graph")
+        off, tg, ws = c.offsets, c.targets, c.weights
+        if weighted:
+            out = lambda i: zip(tg[off[i]:off[i + 1]], ws[off[i]:off[i + 1]])
+        else:
+            out = lambda i: ((v, 1.0) for v in tg[off[i]:off[i + 1]])
+        inc = out
+        if backward and self.directed:
+            roff, src, pos = c.reverse_edges()
+            inc = lambda i: ((src[r], ws[pos[r]] if weighted else 1.0) for r in range(roff[i], roff[i + 1]))
+        return s, t, out, inc, c.ids
+
+    @staticmethod
+    def _map_query(result: Tuple[float, Optional[List[Any]], int], ids: Optional[List[Any]]):
+        d, path, settled = result
+        if ids is not None and path is not None:
+            path = [ids[i] for i in path]
+        return d, path, settled
+
+    def _reverse_adj(self) -> Dict[Any, List[Tuple[Any, float]]]:
+        """v -> [(u, w)] para cada arista u->v (grafo dirigido sin congelar); se cachea hasta mutar."""
+        if self._radj is None:
+            radj: Dict[Any, List[Tuple[Any, float]]] = {u: [] for u in self.adj}
+            for u in self.adj:
+                for v, w in self.adj[u]:
+                    radj[v].append((u, w))
+            self._radj = radj
+        return self._radj
+
     # -------------------
     # BELL-MANFORD - O(V*E)
     # -------------------
     def bellman_ford(self, source: Any) -> Tuple[Dict[Any,float], Dict[Any, Optional[Any]]]:
+        if self._csr is not None:
+            return self._bellman_ford_csr(source)
         if source not in self.adj:
             raise KeyError("Source not in graph")
         dist = {u: INF for u in self.adj}
@@ -2803,74 +5689,49 @@ class SparseGraph:
     # -------------------
     # KRUSKAL (MST) con DSU - para no dirigido
     # -------------------
-    class _DSU:
-        def __init__(self):
-            self.parent = {}
-            self.rank = {}
-        def make_set(self, x):
-            if x not in self.parent:
-                self.parent[x] = x
-                self.rank[x] = 0
-        def find(self, x):
-            if self.parent[x] != x:
-                self.parent[x] = self.find(self.parent[x])
-            return self.parent[x]
-        def union(self, a, b):
-            ra, rb = self.find(a), self.find(b)
-            if ra == rb:
-                return False
-            if self.rank[ra] < self.rank[rb]:
-                ra, rb = rb, ra
-            self.parent[rb] = ra
-            if self.rank[ra] == self.rank[rb]:
-                self.rank[ra] += 1
-            return True
-
     def kruskal_mst(self) -> Tuple[List[Tuple[Any, Any, float]], float]:
         if self.directed:
             raise ValueError("Kruskal MST only for undirected graphs")
-        edges = self.get_edges()
-        # ensure weights exist
-        sorted_edges = sorted(edges, key=lambda x: x[2] if self.weighted else 1.0)
-        dsu = SparseGraph._DSU()
-        for u in self.adj:
-            dsu.make_set(u)
-        mst = []
-        total = 0.0
-        for u,v,w in sorted_edges:
-            if dsu.union(u, v):
-                mst.append((u, v, w))
-                total += (w if self.weighted else 1.0)
-            if len(mst) == len(self.adj) - 1:
-                break
+        if self._csr is not None:
+            return self._kruskal_csr()
+        # sin pesos todas cuestan 1.0: el orden de get_edges ya sirve (presorted)
+        mst = kruskal_edges(self.adj, self.get_edges(), presorted=not self.weighted)
+        total = sum(w for _, _, w in mst) if self.weighted else float(len(mst))
         return mst, total
 
     # -------------------
-    # PRIM con heap (sparse-friendly) - O(E log V)
+    # PRIM con cola de prioridad (sparse-friendly) - O(E log V)
+    # Una entrada por vértice fuera del árbol: su arista más barata hacia él (push baja la clave si mejora).
     # -------------------
-    def prim_mst(self) -> Tuple[List[Tuple[Any, Any, float]], float]:
+    def prim_mst(self, queue: Any = None) -> Tuple[List[Tuple[Any, Any, float]], float]:
+        """
+        MST de la componente del primer nodo; aristas (u, v, w) con u ya en el árbol.
+        queue: cola de prioridad (None = heapq; ver make_queue). "radix" no vale: las claves no son monótonas.
+        Entre pesos iguales desempata la cola, no (w, u, v) como antes: con empates el orden de la lista
+        (o el MST elegido, si hay varios) puede cambiar; el peso total no.
+        """
         if self.directed:
             raise ValueError("Prim only for undirected graphs")
+        if self._csr is not None:
+            return self._prim_csr(queue)
         if not self.adj:
             return [], 0.0
         start = next(iter(self.adj))
         visited = set()
-        pq = []
-        for v,w in self.adj[start]:
-            heapq.heappush(pq, (w if self.weighted else 1.0, start, v))
-        visited.add(start)
+        parent: Dict[Any, Any] = {start: None}
+        pq = make_queue(queue)
+        pq.push(start, 0.0)
         mst = []
         total = 0.0
-        while pq and len(visited) < len(self.adj):
-            w,u,v = heapq.heappop(pq)
-            if v in visited:
-                continue
+        while pq:
+            w, v = pq.pop()
             visited.add(v)
-            mst.append((u, v, w))
-            total += w
+            if parent[v] is not None:
+                mst.append((parent[v], v, w))
+                total += w
             for to, wt in self.adj[v]:
-                if to not in visited:
-                    heapq.heappush(pq, ((wt if self.weighted else 1.0), v, to))
+                if to not in visited and pq.push(to, wt if self.weighted else 1.0):
+                    parent[to] = v
         return mst, total
 
     # -------------------
@@ -2879,6 +5740,8 @@ class SparseGraph:
     def topological_sort_kahn(self) -> List[Any]:
         if not self.directed:
             raise ValueError("Topological sort applies only to directed graphs")
+        if self._csr is not None:
+            return self._kahn_csr()
         indeg = {u:0 for u in self.adj}
         for u in self.adj:
             for v,_ in self.adj[u]:
@@ -2900,38 +5763,13 @@ class SparseGraph:
     # KOSARAJU - SCC (directed)
     # -------------------
     def kosaraju_scc(self) -> List[List[Any]]:
+        """SCC iterativas (Pearce, sin transpuesto); mismo orden de componentes que Kosaraju."""
         if not self.directed:
             raise ValueError("Kosaraju applies to directed graphs")
-        visited = set()
-        order = []
-        def dfs1(u):
-            visited.add(u)
-            for v,_ in self.adj[u]:
-                if v not in visited:
-                    dfs1(v)
-            order.append(u)
-        for u in self.adj:
-            if u not in visited:
-                dfs1(u)
-        # build reversed graph
-        radj = {u: [] for u in self.adj}
-        for u in self.adj:
-            for v,w in self.adj[u]:
-                radj[v].append((u,w))
-        visited.clear()
-        comps = []
-        def dfs2(u, comp):
-            visited.add(u)
-            comp.append(u)
-            for v,_ in radj[u]:
-                if v not in visited:
-                    dfs2(v, comp)
-        for u in reversed(order):
-            if u not in visited:
-                comp = []
-                dfs2(u, comp)
-                comps.append(comp)
-        return comps
+        if self._csr is not None:
+            return self._scc_csr()
+        adj = self.adj
+        return scc_pearce(adj, lambda u: [v for v, _ in adj[u]])
 
     # -------------------
     # ALL-PAIRS SHORTEST PATHS (opción): Dijkstra desde cada nodo (si no hay pesos negativos)
@@ -2940,12 +5778,11 @@ class SparseGraph:
         # verify no negatives if weighted:
         if self.weighted:
             # quick check: if any negative weight exists, user should call Bellman-Ford per source
-            for u in self.adj:
-                for v,w in self.adj[u]:
-                    if w < 0:
-                        raise ValueError("Negative weight detected; use bellman-ford per source instead")
+            weights = self._csr.weights if self._csr is not None else (w for u in self.adj for _, w in self.adj[u])
+            if any(w < 0 for w in weights):
+                raise ValueError("Negative weight detected; use bellman-ford per source instead")
         apsp = {}
-        for u in self.adj:
+        for u in self.get_nodes():
             dist, _ = self.dijkstra(u)
             apsp[u] = dist
         return apsp
@@ -2968,6 +5805,16 @@ class SparseGraph:
         return path
 
     def degree(self, u: Any) -> int:
+        if self._csr is not None:
+            c = self._csr
+            if u not in c.index:
+                raise KeyError("Node not found")
+            i = c.index[u]
+            deg = c.offsets[i + 1] - c.offsets[i]
+            if self.directed:
+                roff, src = c.reverse()
+                return len(set(src[roff[i]:roff[i + 1]])) + deg
+            return deg
         if u not in self.adj:
             raise KeyError("Node not found")
         deg = len(self.adj[u])
@@ -2976,8 +5823,267 @@ class SparseGraph:
             return indeg + deg
         return deg
 
+    # -------------------
+    # ALGORITMOS SOBRE CSR (grafo congelado): enteros y arrays, resultados traducidos a node ids
+    # -------------------
+    def _source_index(self, u: Any, msg: str) -> int:
+        i = self._csr.index.get(u)
+        if i is None:
+            raise KeyError(msg)
+        return i
+
+    def _to_dicts(self, dist: List, prev: List[int]) -> Tuple[Dict[Any, Any], Dict[Any, Optional[Any]]]:
+        ids = self._csr.ids
+        return ({ids[i]: d for i, d in enumerate(dist)},
+                {ids[i]: (ids[p] if p >= 0 else None) for i, p in enumerate(prev)})
+
+    def _bfs_csr(self, start: Any) -> Tuple[List[Any], Dict[Any,int], Dict[Any, Optional[Any]]]:
+        c = self._csr
+        s = self._source_index(start, "Start node not in graph")
+        off, tg = c.offsets, c.targets
+        dist = [-1] * len(c); prev = [-1] * len(c)
+        dist[s] = 0
+        order = [s]
+        for u in order:  # la lista crece mientras se recorre: cola FIFO sin deque
+            du = dist[u] + 1
+            for v in tg[off[u]:off[u + 1]]:
+                if dist[v] == -1:
+                    dist[v] = du
+                    prev[v] = u
+                    order.append(v)
+        d, p = self._to_dicts(dist, prev)
+        return [c.ids[u] for u in order], d, p
+
+    def _dfs_csr(self, start: Any) -> List[Any]:
+        c = self._csr
+        s = self._source_index(start, "Start node not in graph")
+        off, tg = c.offsets, c.targets
+        visited = bytearray(len(c))
+        stack = [s]
+        order = []
+        while stack:
+            u = stack.pop()
+            if visited[u]:
+                continue
+            visited[u] = 1
+            order.append(c.ids[u])
+            for k in range(off[u + 1] - 1, off[u] - 1, -1):
+                if not visited[tg[k]]:
+                    stack.append(tg[k])
+        return order
+
+    def _connected_components_csr(self) -> List[List[Any]]:
+        c = self._csr
+        off, tg = c.offsets, c.targets
+        roff, src = c.reverse() if self.directed else (None, None)
+        visited = bytearray(len(c))
+        comps = []
+        for r in range(len(c)):
+            if visited[r]:
+                continue
+            visited[r] = 1
+            comp = [r]
+            for u in comp:
+                for v in tg[off[u]:off[u + 1]]:
+                    if not visited[v]:
+                        visited[v] = 1
+                        comp.append(v)
+                if self.directed:  # conectividad débil: también aristas entrantes
+                    for x in src[roff[u]:roff[u + 1]]:
+                        if not visited[x]:
+                            visited[x] = 1
+                            comp.append(x)
+            comps.append([c.ids[u] for u in comp])
+        return comps
+
+    def _dijkstra_csr(self, source: Any, queue: Any = None) -> Tuple[Dict[Any,float], Dict[Any, Optional[Any]]]:
+        c = self._csr
+        s = self._source_index(source, "Source not in graph")
+        off, tg, ws = c.offsets, c.targets, c.weights
+        weighted = self.weighted
+        dist = [INF] * len(c); prev = [-1] * len(c)
+        dist[s] = 0.0
+        pq = make_queue(queue)
+        pq.push(s, 0.0)
+        while pq:
+            d, u = pq.pop()
+            for k in range(off[u], off[u + 1]):
+                v = tg[k]
+                nd = d + (ws[k] if weighted else 1.0)
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    pq.push(v, nd)
+        return self._to_dicts(dist, prev)
+
+    def _bellman_ford_csr(self, source: Any) -> Tuple[Dict[Any,float], Dict[Any, Optional[Any]]]:
+        c = self._csr
+        s = self._source_index(source, "Source not in graph")
+        n = len(c)
+        off, tg = c.offsets, c.targets
+        ws = c.weights if self.weighted else array('d', [1.0]) * len(tg)
+        dist = [INF] * n; prev = [-1] * n
+        dist[s] = 0.0
+        for _ in range(n - 1):
+            updated = False
+            for u in range(n):
+                du = dist[u]
+                if du == INF:
+                    continue
+                for k in range(off[u], off[u + 1]):
+                    v = tg[k]
+                    if du + ws[k] < dist[v]:
+                        dist[v] = du + ws[k]
+                        prev[v] = u
+                        updated = True
+            if not updated:
+                break
+        for u in range(n):
+            if dist[u] == INF:
+                continue
+            for k in range(off[u], off[u + 1]):
+                if dist[u] + ws[k] < dist[tg[k]]:
+                    raise ValueError("Graph contains a negative-weight cycle reachable from source")
+        return self._to_dicts(dist, prev)
+
+    def _kruskal_csr(self) -> Tuple[List[Tuple[Any, Any, float]], float]:
+        c = self._csr
+        off, tg, ws = c.offsets, c.targets, c.weights
+        weighted = self.weighted
+        # cada par no dirigido una vez (primera aparición, como get_edges), en arrays paralelos
+        seen = set()
+        us: List[int] = []
+        vs: List[int] = []
+        wk: List[float] = []
+        for u in range(len(c)):
+            for k in range(off[u], off[u + 1]):
+                v = tg[k]
+                key = (u, v) if u <= v else (v, u)
+                if key in seen:
+                    continue
+                seen.add(key)
+                us.append(u)
+                vs.append(v)
+                wk.append(ws[k])
+        picked = kruskal_arrays(len(c), us, vs, wk, presorted=not weighted)
+        mst = []
+        for i in picked:
+            a, b = sorted((c.ids[us[i]], c.ids[vs[i]]), key=lambda x: str(x))
+            mst.append((a, b, wk[i]))
+        total = sum(wk[i] for i in picked) if weighted else float(len(picked))
+        return mst, total
+
+    def _prim_csr(self, queue: Any = None) -> Tuple[List[Tuple[Any, Any, float]], float]:
+        c = self._csr
+        n = len(c)
+        if n == 0:
+            return [], 0.0
+        off, tg, ws = c.offsets, c.targets, c.weights
+        weighted = self.weighted
+        visited = bytearray(n)
+        parent = [-1] * n
+        pq = make_queue(queue)
+        pq.push(0, 0.0)
+        mst = []
+        total = 0.0
+        while pq:
+            w, v = pq.pop()
+            visited[v] = 1
+            if parent[v] >= 0:
+                mst.append((c.ids[parent[v]], c.ids[v], w))
+                total += w
+            for k in range(off[v], off[v + 1]):
+                to = tg[k]
+                if not visited[to] and pq.push(to, ws[k] if weighted else 1.0):
+                    parent[to] = v
+        return mst, total
+
+    def _kahn_csr(self) -> List[Any]:
+        c = self._csr
+        n = len(c)
+        off, tg = c.offsets, c.targets
+        indeg = [0] * n
+        for v in tg:
+            indeg[v] += 1
+        topo = [u for u in range(n) if indeg[u] == 0]
+        for u in topo:
+            for v in tg[off[u]:off[u + 1]]:
+                indeg[v] -= 1
+                if indeg[v] == 0:
+                    topo.append(v)
+        if len(topo) != n:
+            raise ValueError("Graph has at least one cycle; topological sort not possible")
+        return [c.ids[u] for u in topo]
+
+    def _scc_csr(self) -> List[List[Any]]:
+        """Pearce sobre índices del CSR: los vecinos son cortes de targets, sin construir el transpuesto."""
+        c = self._csr
+        off, tg, ids = c.offsets, c.targets, c.ids
+        comps = scc_pearce(range(len(c)), lambda u: tg[off[u]:off[u + 1]])
+        return [[ids[u] for u in comp] for comp in comps]
+
     def __repr__(self) -> str:
-        return f"SparseGraph(directed={self.directed}, weighted={self.weighted}, V={len(self.adj)}, E={self._edge_count})"
+        n = len(self._csr) if self._csr is not None else len(self.adj)
+        return f"SparseGraph(directed={self.directed}, weighted={self.weighted}, V={n}, E={self._edge_count})"
+
+def benchmark_gcsr(n: int = 200_000, out_degree: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """
+    SparseGraph dirigido aleatorio de n nodos y n * out_degree aristas ponderadas: mide save(), load()
+    (mmap: abrir no depende del tamaño) y Dijkstra / SCC sobre el CSR mapeado frente al congelado en memoria.
+    Comprueba que Dijkstra da lo mismo en ambos. No lo llama el ejemplo de uso (tarda varios segundos).
+    """
+    rng = random.Random(seed)
+    G = SparseGraph(directed=True, weighted=True)
+    for u in range(n):
+        for _ in range(out_degree):
+            G.add_edge(u, rng.randrange(n), rng.uniform(1.0, 10.0))
+    G.freeze()
+    row: Dict[str, Any] = {"n": n, "m": n * out_degree}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.gcsr")
+        t0 = time.perf_counter()
+        row["bytes"] = G.save(path)
+        t1 = time.perf_counter()
+        M = SparseGraph.load(path)
+        t2 = time.perf_counter()
+        row["save_s"], row["load_ms"] = t1 - t0, (t2 - t1) * 1e3
+        assert M.dijkstra(0)[0] == G.dijkstra(0)[0]
+        t3 = time.perf_counter()
+        row["sccs"] = len(M.kosaraju_scc())
+        row["scc_mmap_s"] = time.perf_counter() - t3
+        del M
+    print("load .gcsr (%.1f MB): save %.2fs, load %.2f ms, SCCs %d en %.2fs sobre el mapeo"
+          % (row["bytes"] / 1e6, row["save_s"], row["load_ms"], row["sccs"], row["scc_mmap_s"]))
+    return row
+
+def benchmark_edge_list(n: int = 200_000, out_degree: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """
+    Escribe un TSV (u, v, peso) de n * out_degree líneas y lo carga con load_edge_list y con un bucle
+    línea a línea + add_edge. En CPython la diferencia es pequeña: el coste lo dominan las tuplas y listas
+    de la adyacencia, no el troceado del texto. No lo llama el ejemplo de uso.
+    """
+    rng = random.Random(seed)
+    row: Dict[str, Any] = {"n": n, "m": n * out_degree}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "edges.tsv")
+        with open(path, "w") as f:
+            f.writelines("%d\t%d\t%r\n" % (u, rng.randrange(n), rng.uniform(1.0, 10.0))
+                         for u in range(n) for _ in range(out_degree))
+        T = SparseGraph(directed=True, weighted=True)
+        report = T.load_edge_list(path)
+        row["load_edge_list_s"] = report["seconds"]
+        row["peak_mb"] = SparseGraph(directed=True, weighted=True).load_edge_list(path, measure_memory=True)["peak_mb"]
+        t0 = time.perf_counter()
+        T2 = SparseGraph(directed=True, weighted=True)
+        with open(path) as f:
+            for line in f:
+                a, b, w = line.split("\t")
+                T2.add_edge(int(a), int(b), float(w))
+        row["add_edge_s"] = time.perf_counter() - t0
+        assert T2.adj == T.adj
+    print("TSV de %d líneas: load_edge_list %.2fs (pico %.1f MB), línea a línea + add_edge %.2fs"
+          % (row["m"], row["load_edge_list_s"], row["peak_mb"], row["add_edge_s"]))
+    return row
 
 #Ejemplo de uso
 if __name__ == "__main__":
@@ -2998,10 +6104,13 @@ if __name__ == "__main__":
     dist, prev = G.dijkstra("A")
     print("Dijkstra dist desde A:", dist)
     print("Camino A -> D:", SparseGraph.reconstruct_path(prev, "A", "D"))
+    # misma consulta con un heap indexado 4-ario (decrease-key en vez de entradas duplicadas)
+    print("Dijkstra A con queue=\"4ary\" igual que heapq:", G.dijkstra("A", queue="4ary")[0] == dist)
 
     # Prim MST
     mst, total = G.prim_mst()
     print("MST (Prim):", mst, "peso total:", total)
+    print("Prim con queue=\"fibonacci\":", G.prim_mst(queue="fibonacci")[1])
 
     # Kruskal MST
     mst2, total2 = G.kruskal_mst()
@@ -3026,3 +6135,43 @@ if __name__ == "__main__":
     D2.add_edge("1","2"); D2.add_edge("2","3"); D2.add_edge("3","1"); D2.add_edge("3","4")
     print("SCCs:", D2.kosaraju_scc())
 
+    # Congelar a CSR para consultas rápidas y descongelar para volver a mutar
+    G.freeze()
+    print("Congelado:", G, "Dijkstra A (CSR):", G.dijkstra("A")[0])
+    print("Kruskal (CSR):", G.kruskal_mst())
+    print("A -> D bidireccional (CSR):", G.bidirectional_dijkstra("A", "D"))
+    G.thaw()
+    G.add_edge("D", "E", 1.5)
+    print("Descongelado y mutado:", G)
+
+
+    # Formato binario .gcsr: save() / load() (CSR mapeado con mmap, sin dicts); tiempos en benchmark_gcsr()
+    rng = random.Random(0)
+    Small = SparseGraph(directed=True, weighted=True)
+    for u in range(100):
+        for _ in range(3):
+            Small.add_edge(u, rng.randrange(100), float(rng.randint(1, 9)))
+    Small.freeze()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "small.gcsr")
+        size = Small.save(path)
+        M = SparseGraph.load(path)
+        print(f"save/load .gcsr ({size} bytes):", M, "Dijkstra igual:", M.dijkstra(0)[0] == Small.dijkstra(0)[0],
+              "SCCs:", len(M.kosaraju_scc()))
+        del M
+
+    # Carga masiva desde un TSV (u, v, peso) frente a add_edge línea a línea; tiempos en benchmark_edge_list()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "edges.tsv")
+        with open(path, "w") as f:
+            f.writelines("%d\t%d\t%r\n" % (u, rng.randrange(200), float(rng.randint(1, 9)))
+                         for u in range(200) for _ in range(2))
+        T = SparseGraph(directed=True, weighted=True)
+        report = T.load_edge_list(path, measure_memory=True)
+        T2 = SparseGraph(directed=True, weighted=True)
+        with open(path) as f:
+            for line in f:
+                a, b, w = line.split("\t")
+                T2.add_edge(int(a), int(b), float(w))
+        print("load_edge_list TSV:", report["edges_read"], "aristas,", report["nodes"], "nodos, pico %.2f MB," % report["peak_mb"],
+              "mismo grafo:", T2.adj == T.adj)